@@ -1,18 +1,48 @@
 # app.py
-from flask import Flask, request, session, redirect, url_for, jsonify
+import atexit
+from flask import Flask, request, session, redirect, url_for, jsonify, has_request_context
 from data_layer.database.database import db
+from data_layer.models.auditoria import get_audit_log
 from data_layer.database.seed_data import seed_users, seed_convocatorias, seed_solicitudes
 from presentation.routes.auth_routes import auth_bp
 from presentation.routes.dashboard_routes import dashboard_bp
 from presentation.routes.convocatorias_routes import convocatoria_bp
+from presentation.routes.busqueda_routes import busqueda_bp
+from presentation.routes.solicitudes_routes import solicitud_bp
+from business_logic.utils.current_user import load_current_user, get_current_user
+from business_logic.utils.render_cache import get_render_cache
+from business_logic.utils.static_assets import init_static_assets
+from business_logic.utils.compression import init_compression
 
 app = Flask(__name__)
 app.secret_key = "cambia_esta_clave_en_produccion"
 
+# Estáticos con hash y precomprimidos (python -m scripts.build_assets)
+init_static_assets(app)
+# gzip/brotli de JSON y HTML según Accept-Encoding
+init_compression(app)
+
+# Vaciar escrituras pendientes (write-behind / journal) al salir
+atexit.register(db.close)
+
+# Auditoría de convocatorias y solicitudes (se cierra antes que la base:
+# atexit ejecuta en orden inverso)
+def _audit_actor():
+    return session.get("user_id") if has_request_context() else None
+
+audit_log = get_audit_log()
+audit_log.attach(db, actor=_audit_actor)
+atexit.register(audit_log.close)
+
+# HTML renderizado: versiones de la base y borrado al cambiar los datos
+get_render_cache().attach(db)
+
 # Registrar blueprints
 app.register_blueprint(auth_bp)
 app.register_blueprint(dashboard_bp)
 app.register_blueprint(convocatoria_bp)
+app.register_blueprint(busqueda_bp)
+app.register_blueprint(solicitud_bp)
 
 # Rutas públicas para ejemplo
 PUBLIC_ENDPOINTS = {
@@ -35,15 +65,16 @@ def require_login():
         if "application/json" in accept:
             return jsonify({"ok": False, "msg": "autenticación requerida"}), 401
         return redirect(url_for("auth.login_page"))
+    # Usuario actual de la request (g.current_user), cargado una sola vez
+    load_current_user()
 
 # Ruta protegida de ejemplo
 @app.get("/")
 def protected_index():
-    user_id = session.get("user_id")
-    if not user_id:
+    user = get_current_user()
+    if user is None or user.record is None:
         return redirect(url_for("auth.login_page"))
-    user = db.get_user_by_id(user_id)
-    return f"<h3>Bienvenido {user.get('full_name', user.get('username'))}</h3><p>Role: {user.get('role')}</p><a href='/auth/logout'>Logout</a>"
+    return f"<h3>Bienvenido {user.full_name}</h3><p>Role: {user.role}</p><a href='/auth/logout'>Logout</a>"
 
 
 
@@ -57,27 +88,27 @@ def initialize_data_once(persist_to_disk: bool = False, force: bool = False):
     if db.users and not force:
         return
 
-    # Semillas
-    for u in seed_users():
-        db.add_user(u)
+    # Semillas (altas masivas: una sola escritura a disco por colección)
+    users = db.add_users(seed_users())
 
     # Convocatorias
-    for c in seed_convocatorias():
-        db.add_convocatoria(c)
+    convocatorias = db.add_convocatorias(seed_convocatorias())
 
     # Solicitudes: si deseas asociar user_id/convocatoria_id válidos
     # aqui hacemos un mapeo simple (asignamos user_id aleatorio entre docentes)
     import random
-    docentes = [u for u in db.users if u.get("role") == "docente"]
-    convocatoria_ids = [c["id"] for c in db.convocatorias] or [None]
+    docentes = [u for u in users if u.get("role") == "docente"]
+    convocatoria_ids = [c["id"] for c in convocatorias] or [None]
+    solicitudes = []
     for s in seed_solicitudes():
         # asignar user_id aleatorio si hay docentes
         if docentes:
             s["user_id"] = random.choice(docentes)["id"]
         else:
-            s["user_id"] = db.users[0]["id"] if db.users else None
+            s["user_id"] = users[0]["id"] if users else None
         s["convocatoria_id"] = random.choice(convocatoria_ids) if convocatoria_ids else None
-        db.add_solicitud(s)
+        solicitudes.append(s)
+    db.add_solicitudes(solicitudes)
 
 if __name__ == "__main__":
     # Opcional: persist_to_disk True si quieres guardar en data/
@@ -113,3 +113,27 @@ class SessionExpiredError(AuthException):
         super().__init__("Sesión expirada", details)
         self.code = "SESSION_EXPIRED"
 
+
+
+class AuthServiceBusyError(AuthException):
+    """Demasiados logins en curso: la verificación de contraseñas está saturada"""
+    
+    def __init__(self, retry_after=1, details=None):
+        details = details or {}
+        details['retry_after'] = retry_after
+        
+        super().__init__("Servicio de autenticación ocupado, intente nuevamente", details)
+        self.code = "AUTH_BUSY"
+        self.retry_after = retry_after
+
+
+class LoginThrottledError(AuthException):
+    """Demasiados intentos fallidos recientes para el usuario o la IP"""
+    
+    def __init__(self, retry_after=1, details=None):
+        details = details or {}
+        details['retry_after'] = retry_after
+        
+        super().__init__("Demasiados intentos fallidos, intente más tarde", details)
+        self.code = "AUTH_THROTTLED"
+        self.retry_after = retry_after
@@ -0,0 +1,23 @@
+"""
+Excepciones de validación de datos de entrada
+"""
+
+class ValidationError(Exception):
+    """Datos de entrada inválidos"""
+    
+    def __init__(self, message="Datos inválidos", field=None, details=None):
+        self.message = message
+        self.details = details or {}
+        if field:
+            self.details['field'] = field
+        self.code = "VALIDATION_ERROR"
+        super().__init__(self.message)
+    
+    def to_dict(self):
+        """Convierte la excepción a diccionario para respuestas API"""
+        return {
+            'success': False,
+            'error': self.code,
+            'message': self.message,
+            'details': self.details
+        }
@@ -1,5 +1,5 @@
 from data_layer.repositories.user_repository import UserRepository
-from business_logic.utils.password_utils import verify_password
+from business_logic.utils.password_utils import hash_password, needs_rehash, verify_password
 from business_logic.exceptions.auth_exceptions import (
     UserNotFoundError,
     InvalidPasswordError,
@@ -21,17 +21,21 @@ class AuthService:
             raise UserNotFoundError("Usuario no encontrado")
         
         # 2. Verificar si está activo
-        if not user.is_active:
+        if not user.is_active():
             raise UserInactiveError("Usuario inactivo")
         
         # 3. Verificar contraseña
         if not verify_password(password, user.password_hash):
             raise InvalidPasswordError("Contraseña incorrecta")
         
-        # 4. Registrar intento de login
+        # 4. Re-hashear si el costo no es el configurado
+        if needs_rehash(user.password_hash):
+            self.user_repo.update_password_hash(user.id, hash_password(password))
+        
+        # 5. Registrar intento de login
         self.user_repo.update_last_login(user.id)
         
-        # 5. Retornar usuario (sin password)
+        # 6. Retornar usuario (sin password)
         return {
             'id': user.id,
             'username': user.username,
@@ -0,0 +1,150 @@
+# business_logic/services/convocatorias_service.py
+"""
+Listado de convocatorias con filtros y paginación por cursor (keyset).
+
+Los filtros año/tipo/estado van a los índices hash de la base y el orden al
+índice ordenado del campo; el texto libre se resuelve con el índice de
+texto completo (sin tildes, por prefijo) y se cruza con los candidatos.
+Cada página cuesta lo mismo sin importar cuántas convocatorias se acumulen.
+"""
+
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from data_layer.database.database import db
+from business_logic.exceptions.validation_exceptions import ValidationError
+from business_logic.utils.pagination import decode_cursor, encode_cursor
+
+# campo de orden -> tipo de su valor (el del cursor debe coincidir)
+SORT_FIELDS = {"fecha_inicio": str, "fecha_fin": str, "id": int}
+DEFAULT_SORT = "-fecha_inicio"
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+TIPOS = ("normal", "extraordinaria")
+ESTADOS = ("planificada", "registro", "prevalidacion", "validacion", "finalizada")
+TRIMESTRES = (1, 2, 3, 4)
+
+# campos enviados al listado (el detalle devuelve el registro completo)
+LIST_FIELDS = (
+    "id", "nombre", "tipo", "ano", "trimestre", "fecha_inicio", "fecha_fin",
+    "estado", "descripcion",
+)
+
+
+def validar_campos(data: Dict) -> Dict:
+    """
+    tipo, estado y trimestre presentes en 'data', validados contra los
+    valores permitidos; trimestre se normaliza a entero ("T2" -> 2).
+    """
+    campos: Dict[str, Any] = {}
+    if "tipo" in data:
+        if data["tipo"] not in TIPOS:
+            raise ValidationError(f"Tipo no soportado: {data['tipo']}", field="tipo")
+        campos["tipo"] = data["tipo"]
+    if "estado" in data:
+        if data["estado"] not in ESTADOS:
+            raise ValidationError(f"Estado no soportado: {data['estado']}", field="estado")
+        campos["estado"] = data["estado"]
+    if "trimestre" in data:
+        trimestre = data["trimestre"]
+        if trimestre in (None, ""):
+            campos["trimestre"] = None
+        else:
+            try:
+                trimestre = int(str(trimestre).upper().lstrip("T"))
+            except ValueError:
+                trimestre = None
+            if trimestre not in TRIMESTRES:
+                raise ValidationError("Trimestre inválido", field="trimestre")
+            campos["trimestre"] = trimestre
+    return campos
+
+
+def _NO_MATCH(conv: Dict) -> bool:
+    """Predicado de texto sin coincidencias: resultado vacío sin consultar"""
+    return False
+
+
+class ConvocatoriasService:
+    def __init__(self):
+        self.db = db
+
+    def listar(
+        self,
+        ano: Optional[Any] = None,
+        tipo: Optional[str] = None,
+        estado: Optional[str] = None,
+        texto: Optional[str] = None,
+        orden: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limite: Optional[Any] = None,
+    ) -> Dict:
+        """Devuelve {"items": [...], "next_cursor": str | None}"""
+        orden = orden or DEFAULT_SORT
+        descending = orden.startswith("-")
+        order_by = orden.lstrip("-")
+        if order_by not in SORT_FIELDS:
+            raise ValidationError(f"Orden no soportado: {orden}", field="orden")
+
+        try:
+            limit = min(MAX_LIMIT, max(1, int(limite or DEFAULT_LIMIT)))
+        except (TypeError, ValueError):
+            raise ValidationError("Límite inválido", field="limite") from None
+
+        query, predicate = self._filtros(ano, tipo, estado, texto)
+        if predicate is _NO_MATCH:
+            return {"items": [], "next_cursor": None}
+
+        after = decode_cursor(cursor, SORT_FIELDS[order_by]) if cursor else None
+        # un registro de más para saber si hay página siguiente
+        page = self.db.search_page(
+            "convocatorias", query, order_by=order_by, descending=descending,
+            after=after, limit=limit + 1, predicate=predicate,
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+        return {
+            "items": [{f: conv.get(f) for f in LIST_FIELDS} for conv in page],
+            "next_cursor": encode_cursor(page[-1], order_by) if has_more else None,
+        }
+
+    def exportar(
+        self,
+        ano: Optional[Any] = None,
+        tipo: Optional[str] = None,
+        estado: Optional[str] = None,
+        texto: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Todas las convocatorias que cumplen los filtros, en orden de id, como
+        iterador (para respuestas en streaming). Los filtros se validan al
+        llamar, no al recorrer.
+        """
+        query, predicate = self._filtros(ano, tipo, estado, texto)
+        if predicate is _NO_MATCH:
+            return iter(())
+        return self.db.iter_search("convocatorias", query, predicate=predicate)
+
+    def _filtros(self, ano, tipo, estado, texto) -> Tuple[Dict[str, Any], Optional[Callable[[Dict], bool]]]:
+        """(query para los índices, predicado de texto libre)"""
+        query: Dict[str, Any] = {}
+        if ano not in (None, "", "all"):
+            try:
+                query["ano"] = int(ano)
+            except (TypeError, ValueError):
+                raise ValidationError("Año inválido", field="ano") from None
+        if tipo not in (None, "", "all"):
+            query["tipo"] = tipo
+        if estado not in (None, "", "all"):
+            query["estado"] = estado
+
+        texto = (texto or "").strip()
+        if not texto:
+            return query, None
+        matching = self.db.text_match_ids("convocatorias", texto)
+        if not matching:
+            return query, _NO_MATCH
+        return query, lambda conv: conv["id"] in matching
+
+    def anos_disponibles(self):
+        return sorted(self.db.distinct("convocatorias", "ano"), reverse=True)
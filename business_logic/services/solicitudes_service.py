@@ -0,0 +1,127 @@
+# business_logic/services/solicitudes_service.py
+"""
+Listados de solicitudes paginados por cursor (keyset).
+
+Tres vistas, cada una servida por un índice de la base:
+    mías                 user_id
+    de una convocatoria  convocatoria_id (+ user_id si no puede ver todas)
+    todas                estado / tipo, o el índice ordenado de created_at
+
+El orden es siempre created_at descendente (más nuevas primero); el cursor
+es la clave del último registro de la página.
+"""
+
+from typing import Any, Dict, Optional
+
+from data_layer.database.database import db
+from data_layer.repositories.solicitud_repository import SolicitudRepository, ORDER_BY
+from business_logic.exceptions.validation_exceptions import ValidationError
+from business_logic.utils.pagination import decode_cursor, encode_cursor
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+ESTADOS = ("borrador", "enviada", "en_revision", "observada", "aprobada", "rechazada")
+TIPOS = ("patente", "marca", "derecho_autor", "modelo_utilidad", "diseño_industrial")
+
+# campos enviados al listado (el detalle devuelve el registro completo)
+LIST_FIELDS = (
+    "id", "codigo", "titulo", "tipo", "estado", "convocatoria_id", "user_id", "created_at",
+)
+
+
+def _choice(value: Optional[str], allowed: tuple, field: str) -> Optional[str]:
+    if value in (None, "", "all"):
+        return None
+    if value not in allowed:
+        raise ValidationError(f"Valor no soportado: {value}", field=field)
+    return value
+
+
+def _limit(limite: Optional[Any]) -> int:
+    try:
+        return min(MAX_LIMIT, max(1, int(limite or DEFAULT_LIMIT)))
+    except (TypeError, ValueError):
+        raise ValidationError("Límite inválido", field="limite") from None
+
+
+class SolicitudesService:
+    def __init__(self):
+        self.db = db
+        self.repo = SolicitudRepository()
+
+    def _pagina(self, fetch, cursor: Optional[str], limite: Optional[Any]) -> Dict:
+        limit = _limit(limite)
+        # created_at es una fecha ISO: el valor del cursor tiene que ser str
+        after = decode_cursor(cursor, str) if cursor else None
+        # un registro de más para saber si hay página siguiente
+        page = fetch(after=after, limit=limit + 1)
+        has_more = len(page) > limit
+        page = page[:limit]
+        return {
+            "items": [{f: sol.get(f) for f in LIST_FIELDS} for sol in page],
+            "next_cursor": encode_cursor(page[-1], ORDER_BY) if has_more else None,
+        }
+
+    def listar_mias(self, user_id: int, estado: Optional[str] = None,
+                    cursor: Optional[str] = None, limite: Optional[Any] = None) -> Dict:
+        """Devuelve {"items": [...], "next_cursor": str | None}"""
+        estado = _choice(estado, ESTADOS, "estado")
+        return self._pagina(
+            lambda **kw: self.repo.page_by_user(user_id, estado=estado, **kw), cursor, limite
+        )
+
+    def listar_por_convocatoria(self, convocatoria_id: int, user_id: Optional[int] = None,
+                                estado: Optional[str] = None, cursor: Optional[str] = None,
+                                limite: Optional[Any] = None) -> Dict:
+        """user_id restringe a las del usuario (quien no puede ver todas)"""
+        estado = _choice(estado, ESTADOS, "estado")
+        return self._pagina(
+            lambda **kw: self.repo.page_by_convocatoria(
+                convocatoria_id, estado=estado, user_id=user_id, **kw
+            ),
+            cursor, limite,
+        )
+
+    def listar_todas(self, estado: Optional[str] = None, tipo: Optional[str] = None,
+                     cursor: Optional[str] = None, limite: Optional[Any] = None) -> Dict:
+        estado = _choice(estado, ESTADOS, "estado")
+        tipo = _choice(tipo, TIPOS, "tipo")
+        return self._pagina(
+            lambda **kw: self.repo.page_all(estado=estado, tipo=tipo, **kw), cursor, limite
+        )
+
+    def detalle(self, solicitud_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
+        """Registro completo; con user_id, solo si es del usuario"""
+        sol = self.repo.find_by_id(solicitud_id)
+        if sol is None or (user_id is not None and sol.get("user_id") != user_id):
+            return None
+        return sol
+
+    def crear(self, user_id: int, data: Dict) -> Dict:
+        """Alta en borrador para el usuario; la base asigna id y código"""
+        titulo = (data.get("titulo") or "").strip()
+        if not titulo:
+            raise ValidationError("El título es obligatorio", field="titulo")
+        tipo = _choice(data.get("tipo"), TIPOS, "tipo")
+        if tipo is None:
+            raise ValidationError("El tipo es obligatorio", field="tipo")
+        convocatoria_id = data.get("convocatoria_id")
+        if convocatoria_id not in (None, ""):
+            try:
+                convocatoria_id = int(convocatoria_id)
+            except (TypeError, ValueError):
+                raise ValidationError("Convocatoria inválida", field="convocatoria_id") from None
+            if self.db.get_convocatoria_by_id(convocatoria_id) is None:
+                raise ValidationError("Convocatoria no encontrada", field="convocatoria_id")
+        else:
+            convocatoria_id = None
+
+        return self.repo.create({
+            "tipo": tipo,
+            "titulo": titulo,
+            "descripcion": data.get("descripcion", ""),
+            "user_id": user_id,
+            "convocatoria_id": convocatoria_id,
+            "estado": "borrador",
+        })
@@ -0,0 +1,133 @@
+# business_logic/utils/compression.py
+"""
+Compresión gzip/brotli de las respuestas dinámicas (JSON, HTML, NDJSON).
+
+Se negocia con Accept-Encoding (brotli si el cliente lo acepta y el módulo
+está instalado; si no, gzip). No se comprime:
+  - lo que ya trae Content-Encoding (estáticos precomprimidos) o es un
+    archivo (send_file)
+  - tipos que no son texto (imágenes, zip, pdf)
+  - cuerpos menores que min_size
+  - respuestas sin cuerpo (204, 304) o con Cache-Control: no-transform
+
+Respuestas en streaming: se comprime cada fragmento al pasar, con flush,
+para que el cliente los reciba a medida que se generan.
+
+El ETag de la variante comprimida lleva un sufijo (-gz / -br), como pide
+HTTP para representaciones distintas; http_cache lo reconoce en
+If-None-Match.
+"""
+
+from typing import Iterable, Iterator, Optional
+import zlib
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+})
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+def _compressible(mimetype: Optional[str]) -> bool:
+    return bool(mimetype) and (mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES)
+
+
+class ResponseCompressor:
+    def __init__(self, level: int = 6, brotli_quality: int = 4, min_size: int = 500):
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.min_size = min_size
+
+    def _encoding(self) -> Optional[str]:
+        accepted = request.accept_encodings
+        if brotli is not None and accepted.quality("br") > 0:
+            return "br"
+        if accepted.quality("gzip") > 0:
+            return "gzip"
+        return None
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)     # 31: formato gzip
+
+    def _compress(self, encoding: str, data: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = self._compressor(encoding)
+        return compressor.compress(data) + compressor.flush()
+
+    def _stream(self, encoding: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = self._compressor(encoding)
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if encoding == "br":
+                    data = compressor.process(chunk) + compressor.flush()
+                else:
+                    data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                if data:
+                    yield data
+            yield compressor.finish() if encoding == "br" else compressor.flush()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def __call__(self, response: Response) -> Response:
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or not _compressible(response.mimetype)
+            or "no-transform" in response.headers.get("Cache-Control", "")
+            or request.method == "HEAD"
+        ):
+            return response
+        # el cuerpo depende de Accept-Encoding aunque esta vez no se comprima
+        response.vary.add("Accept-Encoding")
+        encoding = self._encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(encoding, response.response)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self._compress(encoding, data))
+
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + ETAG_SUFFIXES[encoding], weak=weak)
+        return response
+
+
+def init_compression(app: Flask) -> Optional[ResponseCompressor]:
+    from config import settings
+    if not settings.COMPRESSION_ENABLED:
+        return None
+    compressor = ResponseCompressor(
+        level=settings.COMPRESSION_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        min_size=settings.COMPRESSION_MIN_SIZE,
+    )
+    app.after_request(compressor)
+    return compressor
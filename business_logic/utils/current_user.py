@@ -0,0 +1,64 @@
+# business_logic/utils/current_user.py
+"""
+Usuario actual de la request.
+
+require_login lo carga una vez por request en flask.g a partir de la sesión.
+id, username y role salen de la sesión sin tocar la base; el registro y el
+modelo User se resuelven recién cuando un handler los pide, y el modelo sale
+del LRU de UserRepository.
+"""
+
+from flask import g, session
+
+from data_layer.database.database import db
+from data_layer.repositories.user_repository import UserRepository
+
+_MISSING = object()
+
+
+class CurrentUser:
+    def __init__(self, user_id, username=None, role=None):
+        self.id = user_id
+        self.username = username
+        self.role = role
+        self._record = _MISSING
+        self._model = _MISSING
+
+    @property
+    def record(self):
+        """Registro dict de la base (None si el usuario ya no existe)"""
+        if self._record is _MISSING:
+            self._record = db.get_user_by_id(self.id)
+        return self._record
+
+    @property
+    def model(self):
+        """Modelo User completo (compartido: solo lectura)"""
+        if self._model is _MISSING:
+            self._model = UserRepository().find_by_id(self.id)
+        return self._model
+
+    @property
+    def full_name(self):
+        record = self.record or {}
+        return record.get("full_name") or record.get("username") or self.username
+
+    def has_role(self, *roles):
+        return self.role in roles
+
+
+def load_current_user():
+    """Carga el usuario de la sesión en g.current_user (None si no hay sesión)"""
+    user_id = session.get("user_id")
+    if user_id is None:
+        g.current_user = None
+    else:
+        g.current_user = CurrentUser(user_id, session.get("username"), session.get("role"))
+    return g.current_user
+
+
+def get_current_user():
+    """Usuario de la request actual; lo carga si require_login no lo hizo"""
+    if "current_user" not in g:
+        return load_current_user()
+    return g.current_user
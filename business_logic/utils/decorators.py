@@ -1,5 +1,7 @@
 from functools import wraps
-from flask import session, redirect, url_for, flash
+from flask import session, redirect, url_for, flash, request, jsonify
+from data_layer.models.user import permission_mask
+from business_logic.utils.permissions import has_permissions, session_permission_mask
 
 def login_required(f):
     """Decorador para requerir autenticación"""
@@ -29,6 +31,35 @@ def roles_required(*required_roles):
         return decorated_function
     return decorator
 
+def permission_required(*permissions, any_of=False):
+    """
+    Decorador para requerir permisos (todos, o alguno con any_of=True).
+    La máscara requerida se compila al decorar; la comprobación usa la
+    máscara guardada en la sesión, sin consultar la base.
+    """
+    required = permission_mask(*permissions)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            wants_json = "application/json" in request.headers.get("Accept", "")
+            if 'user_id' not in session:
+                if wants_json:
+                    return jsonify({"ok": False, "msg": "autenticación requerida"}), 401
+                flash('Por favor inicie sesión')
+                return redirect(url_for('auth.login_page'))
+
+            if not has_permissions(session_permission_mask(), required, any_of):
+                if wants_json:
+                    return jsonify({"ok": False, "msg": "permiso denegado"}), 403
+                flash('No tiene permisos para acceder a esta página')
+                return redirect(url_for('dashboard.dashboard_home'))
+
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
 # Uso en las rutas:
 # @login_required
-# @roles_required('administrador', 'gestor')
\ No newline at end of file
+# @roles_required('administrador', 'gestor')
+# @permission_required('puede_crear_convocatorias')
\ No newline at end of file
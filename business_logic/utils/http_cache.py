@@ -0,0 +1,69 @@
+# business_logic/utils/http_cache.py
+"""
+Respuestas condicionales (ETag / Last-Modified) a partir de las versiones de
+la base (Database.collection_version / record_version).
+
+conditional() compara los encabezados de la request antes de armar la
+respuesta: si el cliente ya tiene la versión actual devuelve 304 sin llamar
+a build(), es decir, sin consultar ni serializar nada.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+import zlib
+
+from flask import Response, make_response, request
+
+from business_logic.utils.compression import ETAG_SUFFIXES
+
+
+def make_etag(*parts) -> str:
+    """ETag fuerte a partir de la versión y lo que cambie el cuerpo (filtros, usuario)"""
+    return "-".join(str(p) for p in parts)
+
+
+def args_digest(args: Iterable) -> str:
+    """Huella corta y estable de los parámetros de la URL"""
+    canonical = "&".join(f"{k}={v}" for k, v in sorted(args))
+    return format(zlib.crc32(canonical.encode("utf-8")), "08x")
+
+
+def _not_modified(etag: str, last_modified: float) -> bool:
+    # If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        # también la variante comprimida del mismo contenido (compression.py)
+        return any(
+            request.if_none_match.contains(etag + suffix)
+            for suffix in ("",) + tuple(ETAG_SUFFIXES.values())
+        )
+    since = request.if_modified_since
+    if since is not None:
+        # Last-Modified tiene resolución de segundos
+        return int(last_modified) <= since.timestamp()
+    return False
+
+
+def conditional(
+    etag: str,
+    last_modified: float,
+    build: Callable[[], Response],
+    per_user: bool = False,
+) -> Response:
+    """
+    304 si el cliente tiene la versión actual; si no, build(). per_user=True
+    cuando el cuerpo depende de la sesión (se agrega Vary: Cookie).
+    """
+    if _not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            # errores: sin validadores
+            return response
+    response.set_etag(etag)
+    response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    # datos de usuarios autenticados: solo caché del navegador, revalidando siempre
+    response.headers["Cache-Control"] = "private, no-cache"
+    if per_user:
+        response.vary.add("Cookie")
+    return response
@@ -0,0 +1,240 @@
+# business_logic/utils/login_attempts.py
+"""
+Registro acotado de intentos de login y limitación por ventana deslizante.
+
+- Por usuario: los últimos N intentos en un buffer circular, como tuplas
+  (timestamp, ip, éxito, motivo). No se guardan objetos ni uuids.
+- Por IP: contadores agregados (intentos, fallos, éxitos).
+- Fallos recientes: por usuario y por IP se guardan solo los timestamps de
+  los últimos max_failures fallos. Si el más viejo está dentro de la
+  ventana, el siguiente intento se rechaza antes de cualquier bcrypt.
+- Intentos en curso: check() reserva el intento bajo el lock y cuenta como
+  fallo hasta que se resuelve (LoginAttempt.record) o se descarta (al salir
+  del with sin resultado). Así una ráfaga de intentos concurrentes no pasa
+  entera el control antes de que se registre el primer fallo.
+
+Usuarios e IPs seguidos se limitan con LRU (max_keys), así la memoria no
+crece con credential stuffing (muchos usuarios o IPs distintos).
+"""
+
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+import threading
+import time
+
+from business_logic.exceptions.auth_exceptions import LoginThrottledError
+
+
+class _UserEntry:
+    __slots__ = ("history", "failures", "pending")
+
+    def __init__(self, history_size: int, max_failures: int):
+        self.history: Deque[Tuple[float, Optional[str], bool, Optional[str]]] = deque(maxlen=history_size)
+        self.failures: Deque[float] = deque(maxlen=max_failures)
+        self.pending = 0
+
+
+class _IPEntry:
+    __slots__ = ("attempts", "failed", "succeeded", "failures", "pending")
+
+    def __init__(self, max_failures: int):
+        self.attempts = 0
+        self.failed = 0
+        self.succeeded = 0
+        self.failures: Deque[float] = deque(maxlen=max_failures)
+        self.pending = 0
+
+
+class LoginAttempt:
+    """
+    Intento reservado por LoginAttemptStore.check(). Se resuelve una vez con
+    record(); si el bloque with termina sin resultado (p. ej. el pool de
+    bcrypt estaba saturado) la reserva se libera sin contar.
+    """
+
+    __slots__ = ("_store", "username", "ip", "_open")
+
+    def __init__(self, store: "LoginAttemptStore", username: str, ip: Optional[str]):
+        self._store = store
+        self.username = username
+        self.ip = ip
+        self._open = True
+
+    def record(self, success: bool, reason: Optional[str] = None) -> None:
+        if self._open:
+            self._open = False
+            self._store._settle(self.username, self.ip, (success, reason))
+
+    def release(self) -> None:
+        if self._open:
+            self._open = False
+            self._store._settle(self.username, self.ip, None)
+
+    def __enter__(self) -> "LoginAttempt":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class LoginAttemptStore:
+    def __init__(
+        self,
+        history_size: int = 20,
+        max_failures: int = 5,
+        ip_max_failures: int = 50,
+        window: float = 300.0,
+        max_keys: int = 10000,
+    ):
+        self.history_size = history_size
+        self.max_failures = max_failures
+        self.ip_max_failures = ip_max_failures
+        self.window = window
+        self.max_keys = max_keys
+        self._users: "OrderedDict[str, _UserEntry]" = OrderedDict()
+        self._ips: "OrderedDict[str, _IPEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._throttled = 0
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return username.strip().lower()
+
+    def _entry(self, table: OrderedDict, key: str, factory):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = factory()
+            if len(table) > self.max_keys:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return entry
+
+    def _retry_after(self, failures: Deque[float], pending: int, limit: int, now: float) -> float:
+        # bloqueado si los fallos dentro de la ventana más los intentos en
+        # curso llegan a 'limit'
+        if limit <= 0:
+            return 0.0
+        recent = sum(1 for ts in failures if ts > now - self.window)
+        if recent + pending < limit:
+            return 0.0
+        if recent >= limit:
+            return max(0.0, failures[0] + self.window - now)
+        # el bloqueo depende de intentos aún sin resultado: reintentar pronto
+        return 1.0
+
+    def check(self, username: str, ip: Optional[str] = None) -> LoginAttempt:
+        """
+        Reserva un intento para el usuario y la IP, o lanza LoginThrottledError
+        si superaron el límite. Usar el resultado como context manager:
+
+            with store.check(username, ip) as attempt:
+                ...
+                attempt.record(False, "password_incorrecto")
+        """
+        now = time.time()
+        key = self._key(username)
+        with self._lock:
+            wait = 0.0
+            user = self._users.get(key)
+            if user is not None:
+                wait = self._retry_after(user.failures, user.pending, self.max_failures, now)
+            entry = self._ips.get(ip) if ip else None
+            if entry is not None:
+                wait = max(wait, self._retry_after(
+                    entry.failures, entry.pending, self.ip_max_failures, now
+                ))
+            if wait > 0:
+                self._throttled += 1
+            else:
+                self._user_entry(key).pending += 1
+                if ip:
+                    self._ip_entry(ip).pending += 1
+        if wait > 0:
+            raise LoginThrottledError(retry_after=int(wait) + 1)
+        return LoginAttempt(self, username, ip)
+
+    def _user_entry(self, key: str) -> _UserEntry:
+        return self._entry(self._users, key, lambda: _UserEntry(self.history_size, self.max_failures))
+
+    def _ip_entry(self, ip: str) -> _IPEntry:
+        return self._entry(self._ips, ip, lambda: _IPEntry(self.ip_max_failures))
+
+    def _settle(self, username: str, ip: Optional[str], outcome: Optional[Tuple[bool, Optional[str]]]) -> None:
+        """Cierra una reserva de check(): registra el resultado, si lo hay"""
+        with self._lock:
+            # la entrada pudo salir del LRU mientras tanto
+            user = self._users.get(self._key(username))
+            if user is not None and user.pending:
+                user.pending -= 1
+            entry = self._ips.get(ip) if ip else None
+            if entry is not None and entry.pending:
+                entry.pending -= 1
+            if outcome is not None:
+                self._record(username, ip, *outcome)
+
+    def record(self, username: str, ip: Optional[str], success: bool, reason: Optional[str] = None) -> None:
+        """Registra un intento sin reserva previa"""
+        with self._lock:
+            self._record(username, ip, success, reason)
+
+    def _record(self, username: str, ip: Optional[str], success: bool, reason: Optional[str]) -> None:
+        now = time.time()
+        user = self._user_entry(self._key(username))
+        user.history.append((now, ip, success, reason))
+        if success:
+            user.failures.clear()
+        else:
+            user.failures.append(now)
+        if ip:
+            entry = self._ip_entry(ip)
+            entry.attempts += 1
+            if success:
+                entry.succeeded += 1
+            else:
+                entry.failed += 1
+                entry.failures.append(now)
+
+    def history(self, username: str) -> List[Dict]:
+        """Últimos intentos del usuario, del más reciente al más viejo"""
+        with self._lock:
+            user = self._users.get(self._key(username))
+            rows = list(user.history) if user is not None else []
+        return [
+            {"timestamp": ts, "ip_address": ip, "success": ok, "failure_reason": reason}
+            for ts, ip, ok, reason in reversed(rows)
+        ]
+
+    def ip_stats(self, ip: str) -> Dict:
+        with self._lock:
+            entry = self._ips.get(ip)
+            if entry is None:
+                return {"attempts": 0, "failed": 0, "succeeded": 0}
+            return {"attempts": entry.attempts, "failed": entry.failed, "succeeded": entry.succeeded}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tracked_users": len(self._users),
+                "tracked_ips": len(self._ips),
+                "throttled": self._throttled,
+            }
+
+
+_store: Optional[LoginAttemptStore] = None
+_store_lock = threading.Lock()
+
+def get_login_attempts() -> LoginAttemptStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from config import settings
+                _store = LoginAttemptStore(
+                    history_size=settings.LOGIN_HISTORY_SIZE,
+                    max_failures=settings.LOGIN_MAX_FAILURES,
+                    ip_max_failures=settings.LOGIN_IP_MAX_FAILURES,
+                    window=settings.LOGIN_FAILURE_WINDOW,
+                    max_keys=settings.LOGIN_TRACKED_KEYS,
+                )
+    return _store
@@ -0,0 +1,37 @@
+# business_logic/utils/pagination.py
+"""
+Cursores opacos para la paginación por keyset (Database.search_page).
+
+El cursor es la clave (valor de order_by, id) del último registro de la
+página, en JSON y base64 url-safe. El cliente lo devuelve tal cual, pero
+puede venir alterado: decode_cursor comprueba el tipo del valor para que no
+llegue al índice ordenado algo que no se pueda comparar con sus claves.
+"""
+
+from typing import Dict, Optional
+import base64
+import json
+
+from business_logic.exceptions.validation_exceptions import ValidationError
+
+
+def encode_cursor(record: Dict, order_by: str) -> str:
+    key = [record.get(order_by), record["id"]]
+    raw = json.dumps(key, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, value_type: Optional[type] = None) -> tuple:
+    """(valor, id); value_type es el tipo de los valores de order_by"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, record_id = json.loads(raw.decode("utf-8"))
+        if isinstance(record_id, bool) or not isinstance(record_id, int):
+            raise TypeError(record_id)
+        if value_type is not None and (
+            isinstance(value, bool) or not isinstance(value, value_type)
+        ):
+            raise TypeError(value)
+        return value, record_id
+    except (ValueError, TypeError):
+        raise ValidationError("Cursor inválido", field="cursor") from None
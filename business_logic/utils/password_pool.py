@@ -0,0 +1,162 @@
+# business_logic/utils/password_pool.py
+"""
+Pool acotado para verificar contraseñas (bcrypt) fuera del hilo de la request.
+
+Con muchos logins simultáneos, como al abrir una convocatoria, cada hilo del
+servidor quedaría ocupado hasheando. El pool limita cuántas verificaciones
+corren a la vez y cuántas pueden esperar. Si la cola está llena, verify()
+falla al instante con AuthServiceBusyError y la ruta responde 503 con
+Retry-After.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+import os
+import threading
+import time
+
+from business_logic.exceptions.auth_exceptions import AuthServiceBusyError
+from business_logic.utils.password_utils import hash_password, verify_password
+
+
+class PasswordVerifier:
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        timeout: float = 10.0,
+        retry_after: int = 2,
+    ):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sgpi-bcrypt"
+        )
+        # cupos = trabajos en ejecución + en espera
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=1024)   # verificación (bcrypt) en ms
+        self._waits = deque(maxlen=1024)       # espera en cola en ms
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise AuthServiceBusyError(retry_after=self.retry_after)
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self._submitted += 1
+        try:
+            future = self._executor.submit(self._run, password, hashed_password, enqueued)
+        except BaseException:
+            self._release(started=False)
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # el trabajo sigue y libera su cupo al terminar
+            raise AuthServiceBusyError(retry_after=self.retry_after)
+
+    def rehash_async(self, password: str, on_done: Callable[[str], None]) -> bool:
+        """
+        Calcula un hash nuevo en el pool sin esperar el resultado y se lo pasa
+        a on_done. Si no hay cupo no hace nada (se reintenta en otro login).
+        """
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._pending += 1
+        enqueued = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._pending -= 1
+                self._running += 1
+                self._waits.append((started - enqueued) * 1000)
+            try:
+                on_done(hash_password(password))
+            finally:
+                self._release(started=True)
+
+        try:
+            self._executor.submit(job)
+        except BaseException:
+            self._release(started=False)
+            raise
+        return True
+
+    def _run(self, password: str, hashed_password: str, enqueued: float) -> bool:
+        started = time.perf_counter()
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            self._waits.append((started - enqueued) * 1000)
+        try:
+            return verify_password(password, hashed_password)
+        finally:
+            with self._lock:
+                self._latencies.append((time.perf_counter() - started) * 1000)
+            self._release(started=True)
+
+    def _release(self, started: bool) -> None:
+        with self._lock:
+            if started:
+                self._running -= 1
+            else:
+                self._pending -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = sorted(self._waits)
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._pending,
+                "running": self._running,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "verify_ms": _summary(latencies),
+                "queue_wait_ms": _summary(waits),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def _summary(samples) -> Dict:
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "p50": round(samples[len(samples) // 2], 2),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        "max": round(samples[-1], 2),
+    }
+
+
+_verifier: Optional[PasswordVerifier] = None
+_verifier_lock = threading.Lock()
+
+def get_password_verifier() -> PasswordVerifier:
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                from config import settings
+                _verifier = PasswordVerifier(
+                    max_workers=settings.LOGIN_VERIFY_WORKERS,
+                    max_queue=settings.LOGIN_VERIFY_QUEUE,
+                    retry_after=settings.LOGIN_RETRY_AFTER,
+                )
+    return _verifier
@@ -1,13 +1,49 @@
 # business_logic/utils/password_utils.py
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+import os
 import bcrypt
 
-def hash_password(password: str) -> str:
+from config import settings
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hashea con el costo indicado o, por defecto, settings.BCRYPT_ROUNDS"""
     if password is None:
         raise ValueError("password is required")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """Costo de un hash bcrypt ("$2b$12$..." -> 12); None si no es bcrypt"""
+    parts = (hashed_password or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """True si el hash no usa el costo objetivo (sirve para subirlo o bajarlo)"""
+    current = get_hash_rounds(hashed_password)
+    return current is not None and current != (rounds or settings.BCRYPT_ROUNDS)
+
+def hash_passwords(
+    passwords: Iterable[str],
+    rounds: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Hashea varias contraseñas en paralelo y devuelve {password: hash}.
+    bcrypt libera el GIL mientras calcula, así que un pool de hilos usa
+    todos los núcleos sin el costo de levantar procesos.
+    """
+    unique = list(dict.fromkeys(passwords))
+    if len(unique) <= 1:
+        return {p: hash_password(p, rounds) for p in unique}
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+        hashes = pool.map(lambda p: hash_password(p, rounds), unique)
+        return dict(zip(unique, hashes))
+
 def verify_password(password: str, hashed_password: str) -> bool:
     if not password or not hashed_password:
         return False
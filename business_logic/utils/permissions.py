@@ -0,0 +1,51 @@
+# business_logic/utils/permissions.py
+"""
+Motor de permisos por máscara de bits.
+
+Al iniciar sesión se guarda en la sesión la máscara efectiva del usuario
+(rol + permisos concedidos/quitados en su registro, campo "permissions").
+Autorizar una request es entonces un AND entre enteros, sin tocar la base.
+Las sesiones anteriores a este cambio no tienen máscara: se usa la del rol.
+"""
+
+from flask import session
+
+from data_layer.models.user import (
+    MODULE_PERMISSIONS,
+    ROLE_PERMISSION_MASKS,
+    compile_permissions,
+    permission_mask,
+)
+
+SESSION_KEY = "perms"
+
+
+def user_permission_mask(user: dict) -> int:
+    """Máscara efectiva de un registro de usuario"""
+    return compile_permissions(user.get("role"), user.get("permissions"))
+
+
+def store_session_permissions(user: dict) -> None:
+    session[SESSION_KEY] = user_permission_mask(user)
+
+
+def session_permission_mask() -> int:
+    mask = session.get(SESSION_KEY)
+    if mask is None:
+        mask = ROLE_PERMISSION_MASKS.get(session.get("role"), 0)
+    return mask
+
+
+def has_permissions(mask: int, required: int, any_of: bool = False) -> bool:
+    if any_of:
+        return bool(mask & required)
+    return mask & required == required
+
+
+def session_has_permission(*names: str, any_of: bool = False) -> bool:
+    return has_permissions(session_permission_mask(), permission_mask(*names), any_of)
+
+
+def session_can_access_module(module_name: str) -> bool:
+    name = MODULE_PERMISSIONS.get(module_name)
+    return name is not None and session_has_permission(name)
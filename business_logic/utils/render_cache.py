@@ -0,0 +1,196 @@
+# business_logic/utils/render_cache.py
+"""
+Caché de HTML renderizado (páginas completas o fragmentos).
+
+Clave: (nombre de plantilla o fragmento, rol, versiones de las colecciones de
+las que depende, clave extra). Como la versión es parte de la clave, una
+entrada nunca se sirve después de un cambio, aunque el cambio lo haya hecho
+otro proceso (motor sqlite). Con attach(db) además se borran en el momento
+las entradas de una colección que cambia, para no ocupar memoria con HTML
+que ya no se va a pedir.
+
+Límites: cantidad de entradas y bytes totales (LRU). Un fragmento más grande
+que max_bytes no se guarda.
+
+Varias requests que piden la misma entrada a la vez (el dashboard a las 9am)
+renderizan una sola vez: las demás esperan ese resultado.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import threading
+
+from flask import render_template, session
+
+_Key = Tuple[str, Optional[str], Tuple, Hashable]
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024,
+                 enabled: bool = True, wait_timeout: float = 5.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.wait_timeout = wait_timeout
+        self._entries: "OrderedDict[_Key, Tuple[str, int, Tuple[str, ...]]]" = OrderedDict()
+        # colección -> claves que dependen de ella
+        self._dependents: Dict[str, Set[_Key]] = {}
+        self._pending: Dict[_Key, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._detach: List[Callable[[], None]] = []
+
+    # ----------------- DEPENDENCIAS -----------------
+    def attach(self, db) -> None:
+        """Usa la base para las versiones y borra entradas cuando cambia"""
+        self._db = db
+
+        def listener(name: str, op: str, record: Dict) -> None:
+            self.invalidate(name)
+
+        db.add_listener(listener)
+        self._detach.append(lambda: db.remove_listener(listener))
+
+    def detach(self) -> None:
+        for detach in self._detach:
+            detach()
+        self._detach = []
+
+    def _versions(self, collections: Tuple[str, ...]) -> Tuple:
+        if self._db is None:
+            return ()
+        return tuple(self._db.collection_version(c)[0] for c in collections)
+
+    # ----------------- CONSULTA -----------------
+    def get_or_render(
+        self,
+        name: str,
+        build: Callable[[], str],
+        collections: Iterable[str] = (),
+        key: Hashable = None,
+        role: Optional[str] = None,
+    ) -> str:
+        """
+        HTML de 'name' para el rol y las versiones actuales; build() solo se
+        llama si no está en caché. 'key' distingue variantes (filtros, año).
+        """
+        if not self.enabled:
+            return build()
+        collections = tuple(collections)
+        versions = self._versions(collections)
+        cache_key = (name, role, versions, key)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry is not None:
+                    self._entries.move_to_end(cache_key)
+                    self._hits += 1
+                    return entry[0]
+                waiting = self._pending.get(cache_key)
+                if waiting is None:
+                    self._misses += 1
+                    event = self._pending[cache_key] = threading.Event()
+                    break
+            # otra request ya la está renderizando
+            if not waiting.wait(self.wait_timeout):
+                return build()
+
+        try:
+            html = build()
+            # si la base cambió mientras se renderizaba, no guardar
+            if self._versions(collections) == versions:
+                self._store(cache_key, html, collections)
+        finally:
+            with self._lock:
+                self._pending.pop(cache_key, None)
+            event.set()
+        return html
+
+    def render(self, template: str, collections: Iterable[str] = (),
+               key: Hashable = None, **context) -> str:
+        """render_template cacheado por plantilla, rol de la sesión y versiones"""
+        return self.get_or_render(
+            template,
+            lambda: render_template(template, **context),
+            collections=collections,
+            key=key,
+            role=session.get("role"),
+        )
+
+    # ----------------- MANTENIMIENTO -----------------
+    def _store(self, cache_key: _Key, html: str, collections: Tuple[str, ...]) -> None:
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if cache_key in self._entries:
+                return
+            self._entries[cache_key] = (html, size, collections)
+            self._bytes += size
+            for name in collections:
+                self._dependents.setdefault(name, set()).add(cache_key)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _drop(self, cache_key: _Key) -> None:
+        # con el lock tomado
+        _, size, collections = self._entries.pop(cache_key)
+        self._bytes -= size
+        for name in collections:
+            keys = self._dependents.get(name)
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self._dependents[name]
+
+    def invalidate(self, collection: Optional[str] = None) -> int:
+        """Borra las entradas de una colección (o todas); devuelve cuántas"""
+        with self._lock:
+            if collection is None:
+                keys = list(self._entries)
+            else:
+                keys = list(self._dependents.get(collection, ()))
+            for cache_key in keys:
+                self._drop(cache_key)
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+def get_render_cache() -> RenderCache:
+    global _render_cache
+    if _render_cache is None:
+        with _render_cache_lock:
+            if _render_cache is None:
+                from config import settings
+                _render_cache = RenderCache(
+                    max_entries=settings.RENDER_CACHE_ENTRIES,
+                    max_bytes=settings.RENDER_CACHE_MAX_BYTES,
+                    enabled=settings.RENDER_CACHE_ENABLED,
+                )
+    return _render_cache
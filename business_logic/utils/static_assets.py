@@ -0,0 +1,95 @@
+# business_logic/utils/static_assets.py
+"""
+Archivos estáticos con hash en el nombre (generados por scripts/build_assets.py).
+
+init_static_assets(app):
+  - url_for('static', filename='css/login.css') pasa a devolver
+    /static/dist/css/login.3f2a9c1b.css si el archivo está en el manifiesto
+  - la vista 'static' sirve esos archivos con Cache-Control inmutable de un
+    año y elige la variante según la request:
+        Accept: image/webp        -> .webp en lugar de .png/.jpg
+        Accept-Encoding: br, gzip -> .br o .gz precomprimido
+    (con Vary para que los proxies no mezclen variantes)
+
+El HTML no depende de la request (la negociación es al servir el archivo),
+así que se puede cachear por rol (render_cache).
+Sin manifiesto, o con archivos fuera de él, todo se sirve como antes.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import mimetypes
+
+from flask import Flask, request, send_from_directory
+
+DIST_PREFIX = "dist/"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class StaticAssets:
+    def __init__(self, static_dir: Path, manifest_path: Optional[Path] = None):
+        self.static_dir = Path(static_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.static_dir / "dist" / "manifest.json"
+        # nombre lógico -> entrada; archivo con hash -> entrada
+        self.manifest: Dict[str, Dict] = {}
+        self._built: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+        self.manifest = manifest
+        self._built = {entry["file"]: entry for entry in manifest.values()}
+
+    def url_filename(self, filename: str) -> str:
+        """Nombre a usar en la URL: el archivo con hash si existe"""
+        entry = self.manifest.get(filename)
+        return DIST_PREFIX + entry["file"] if entry else filename
+
+    def serve(self, filename: str):
+        """Vista 'static': variantes negociadas para los archivos con hash"""
+        entry = self._built.get(filename[len(DIST_PREFIX):]) if filename.startswith(DIST_PREFIX) else None
+        if entry is None:
+            return send_from_directory(self.static_dir, filename)
+
+        dist = self.static_dir / "dist"
+        name = entry["file"]
+        mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        vary = []
+        encoding = None
+        if "webp" in entry:
+            vary.append("Accept")
+            if request.accept_mimetypes.quality("image/webp") > 0:
+                name, mimetype = entry["webp"], "image/webp"
+        encodings = entry.get("encodings") or ()
+        if encodings:
+            vary.append("Accept-Encoding")
+            for candidate in encodings:       # en orden de preferencia (br primero)
+                if request.accept_encodings.quality(candidate) > 0:
+                    encoding = candidate
+                    break
+
+        path = name + {"br": ".br", "gzip": ".gz", None: ""}[encoding]
+        response = send_from_directory(dist, path, mimetype=mimetype, max_age=31536000)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        for header in vary:
+            response.vary.add(header)
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+
+def init_static_assets(app: Flask) -> StaticAssets:
+    assets = StaticAssets(Path(app.static_folder))
+    app.extensions["static_assets"] = assets
+
+    @app.url_defaults
+    def _fingerprinted_static(endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = assets.url_filename(values["filename"])
+
+    app.view_functions["static"] = assets.serve
+    return assets
@@ -0,0 +1,87 @@
+# business_logic/utils/streaming.py
+"""
+Respuestas JSON en streaming para colecciones grandes.
+
+jsonify arma todo el cuerpo en memoria antes de enviar el primer byte. Aquí
+los registros se serializan a medida que el generador los entrega (por
+ejemplo Database.iter_search) y se envían en tandas de batch_size, así que la
+memoria no depende del tamaño del resultado y el primer byte sale enseguida.
+
+Formatos:
+    stream_json    {"ok": true, ..., "data": [ {...}, {...} ]}
+    stream_ndjson  un registro JSON por línea (application/x-ndjson)
+    stream_records elige según ?formato=ndjson o Accept: application/x-ndjson
+
+El código de estado ya salió cuando se serializa: un error a mitad de camino
+corta la conexión y el cliente recibe un JSON incompleto (inválido). Validar
+todo lo que pueda fallar antes de crear la respuesta.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+import json
+
+from flask import Response, request
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+DEFAULT_BATCH = 100
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _batches(records: Iterable[Any], transform: Optional[Callable[[Any], Any]],
+             batch_size: int) -> Iterator[list]:
+    batch = []
+    for record in records:
+        batch.append(_encoder.encode(transform(record) if transform else record))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def json_array_chunks(records: Iterable[Any], transform: Optional[Callable[[Any], Any]] = None,
+                      key: str = "data", envelope: Optional[Dict] = None,
+                      batch_size: int = DEFAULT_BATCH) -> Iterator[str]:
+    """Fragmentos de {**envelope, key: [registros]}"""
+    head = _encoder.encode(envelope or {})[:-1]
+    yield f'{head}{"," if envelope else ""}{_encoder.encode(key)}:['
+    first = True
+    for batch in _batches(records, transform, batch_size):
+        yield ("" if first else ",") + ",".join(batch)
+        first = False
+    yield "]}"
+
+
+def ndjson_chunks(records: Iterable[Any], transform: Optional[Callable[[Any], Any]] = None,
+                  batch_size: int = DEFAULT_BATCH) -> Iterator[str]:
+    for batch in _batches(records, transform, batch_size):
+        yield "\n".join(batch) + "\n"
+
+
+def stream_json(records: Iterable[Any], transform: Optional[Callable[[Any], Any]] = None,
+                key: str = "data", batch_size: int = DEFAULT_BATCH, **envelope) -> Response:
+    return Response(
+        json_array_chunks(records, transform, key, envelope, batch_size),
+        mimetype="application/json",
+    )
+
+
+def stream_ndjson(records: Iterable[Any], transform: Optional[Callable[[Any], Any]] = None,
+                  batch_size: int = DEFAULT_BATCH) -> Response:
+    return Response(ndjson_chunks(records, transform, batch_size), mimetype=NDJSON_MIMETYPE)
+
+
+def wants_ndjson() -> bool:
+    if request.args.get("formato") == "ndjson":
+        return True
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def stream_records(records: Iterable[Any], transform: Optional[Callable[[Any], Any]] = None,
+                   batch_size: int = DEFAULT_BATCH, **envelope) -> Response:
+    """JSON o NDJSON según lo que pida el cliente (el sobre solo va en JSON)"""
+    if wants_ndjson():
+        return stream_ndjson(records, transform, batch_size)
+    return stream_json(records, transform, batch_size=batch_size, **envelope)
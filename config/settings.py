@@ -0,0 +1,63 @@
+# config/settings.py
+"""
+Configuración general, leída de variables de entorno
+"""
+
+import os
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, "1" if default else "0").lower() in ("1", "true", "yes", "si")
+
+
+# ----------------- BASE DE DATOS -----------------
+# "memory" (un solo proceso) o "sqlite" (varios workers comparten el archivo)
+DB_ENGINE = os.getenv("SGPI_DB_ENGINE", "memory")
+DB_DATA_DIR = os.getenv("SGPI_DATA_DIR", "data")
+# Solo motor "memory"
+DB_PERSIST_TO_DISK = _env_bool("SGPI_DB_PERSIST")
+DB_STORAGE = os.getenv("SGPI_DB_STORAGE", "json")    # "json" | "journal"
+DB_WRITE_BEHIND = _env_bool("SGPI_DB_WRITE_BEHIND")
+DB_BINARY_SNAPSHOT = _env_bool("SGPI_DB_BINARY_SNAPSHOT")
+
+# ----------------- LOGIN -----------------
+# Costo de bcrypt para hashes nuevos; los existentes se re-hashean al
+# siguiente login exitoso (ver scripts/bench_bcrypt.py para elegirlo)
+BCRYPT_ROUNDS = int(os.getenv("SGPI_BCRYPT_ROUNDS", "12"))
+# Verificación de contraseñas: hilos dedicados (0 = la mitad de los núcleos),
+# cupo de espera y segundos sugeridos en Retry-After al rechazar
+LOGIN_VERIFY_WORKERS = int(os.getenv("SGPI_LOGIN_VERIFY_WORKERS", "0")) or None
+LOGIN_VERIFY_QUEUE = int(os.getenv("SGPI_LOGIN_VERIFY_QUEUE", "32"))
+LOGIN_RETRY_AFTER = int(os.getenv("SGPI_LOGIN_RETRY_AFTER", "2"))
+# Intentos de login: últimos N por usuario, fallos permitidos por usuario y
+# por IP dentro de la ventana (segundos) y máximo de usuarios/IPs seguidos
+LOGIN_HISTORY_SIZE = int(os.getenv("SGPI_LOGIN_HISTORY_SIZE", "20"))
+LOGIN_MAX_FAILURES = int(os.getenv("SGPI_LOGIN_MAX_FAILURES", "5"))
+LOGIN_IP_MAX_FAILURES = int(os.getenv("SGPI_LOGIN_IP_MAX_FAILURES", "50"))
+LOGIN_FAILURE_WINDOW = int(os.getenv("SGPI_LOGIN_FAILURE_WINDOW", "300"))
+LOGIN_TRACKED_KEYS = int(os.getenv("SGPI_LOGIN_TRACKED_KEYS", "10000"))
+
+# ----------------- AUDITORÍA -----------------
+# Por defecto se escribe a disco si la base persiste
+AUDIT_PERSIST = _env_bool("SGPI_AUDIT_PERSIST", DB_PERSIST_TO_DISK)
+AUDIT_DIR = os.getenv("SGPI_AUDIT_DIR", os.path.join(DB_DATA_DIR, "auditoria"))
+AUDIT_QUEUE_SIZE = int(os.getenv("SGPI_AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("SGPI_AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("SGPI_AUDIT_FLUSH_INTERVAL_MS", "200"))
+AUDIT_MAX_BYTES = int(os.getenv("SGPI_AUDIT_MAX_BYTES", str(10 * 1024 * 1024)))
+AUDIT_BACKUPS = int(os.getenv("SGPI_AUDIT_BACKUPS", "5"))
+AUDIT_OVERFLOW = os.getenv("SGPI_AUDIT_OVERFLOW", "drop")   # "drop" | "block"
+
+# ----------------- CACHÉ DE PLANTILLAS -----------------
+# HTML renderizado por plantilla, rol y versión de los datos (LRU acotado)
+RENDER_CACHE_ENABLED = _env_bool("SGPI_RENDER_CACHE", True)
+RENDER_CACHE_ENTRIES = int(os.getenv("SGPI_RENDER_CACHE_ENTRIES", "256"))
+RENDER_CACHE_MAX_BYTES = int(os.getenv("SGPI_RENDER_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# ----------------- COMPRESIÓN -----------------
+# gzip (nivel 1-9) o brotli (calidad 0-11) para respuestas de al menos
+# COMPRESSION_MIN_SIZE bytes; brotli solo si el módulo está instalado
+COMPRESSION_ENABLED = _env_bool("SGPI_COMPRESSION", True)
+COMPRESSION_LEVEL = int(os.getenv("SGPI_COMPRESSION_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("SGPI_COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_MIN_SIZE = int(os.getenv("SGPI_COMPRESSION_MIN_SIZE", "500"))
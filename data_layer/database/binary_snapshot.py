@@ -0,0 +1,179 @@
+# data_layer/database/binary_snapshot.py
+"""
+Snapshot binario de la base de datos para arranques rápidos.
+
+Formato (snapshot.sgpi):
+    b"SGPIBIN1" | largo del encabezado (uint32 LE) | encabezado JSON | secciones
+
+El encabezado guarda las secuencias y, por colección, [offset, largo, total].
+Cada sección es la lista de registros serializada con marshal, que carga
+listas de dicts varias veces más rápido que json.load y no ejecuta código
+al deserializar. El archivo se abre con mmap y cada colección se
+deserializa recién cuando se pide.
+
+marshal depende de la versión de Python: un snapshot generado con otra
+versión se considera incompatible y se vuelve a cargar desde JSON.
+
+Conversión desde los JSON existentes:
+    python -m data_layer.database.binary_snapshot data/
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"SGPIBIN1"
+FILE_NAME = "snapshot.sgpi"
+JSON_FILES = ("users.json", "convocatorias.json", "solicitudes.json", "sequences.json")
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _runtime_tag() -> str:
+    return f"{sys.version_info[0]}.{sys.version_info[1]}/{marshal.version}"
+
+
+def _dump_rows(rows: List[Dict]) -> bytes:
+    try:
+        return marshal.dumps(rows)
+    except ValueError:
+        # valores no serializables por marshal (p. ej. datetime): pasar por JSON
+        return marshal.dumps(json.loads(json.dumps(rows, default=str)))
+
+
+def write_snapshot(path: Path, collections: Dict[str, List[Dict]], sequences: Dict[str, int]) -> None:
+    """Escribe el snapshot de forma atómica (archivo temporal + os.replace)"""
+    path = Path(path)
+    sections = {name: _dump_rows(rows) for name, rows in collections.items()}
+    counts = {name: len(rows) for name, rows in collections.items()}
+
+    # el encabezado incluye los offsets, que dependen de su propio largo:
+    # se calcula con offsets provisorios y se ajusta una vez
+    def header_bytes(base: int) -> bytes:
+        offset, index = base, {}
+        for name, blob in sections.items():
+            index[name] = [offset, len(blob), counts[name]]
+            offset += len(blob)
+        return json.dumps({
+            "runtime": _runtime_tag(),
+            "sequences": sequences,
+            "sections": index,
+        }).encode("utf-8")
+
+    prefix = len(MAGIC) + _HEADER_LEN.size
+    header = header_bytes(0)
+    while True:
+        candidate = header_bytes(prefix + len(header))
+        if len(candidate) == len(header):
+            header = candidate
+            break
+        header = candidate
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(_HEADER_LEN.pack(len(header)))
+        fh.write(header)
+        for blob in sections.values():
+            fh.write(blob)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class IncompatibleSnapshot(Exception):
+    """El snapshot no existe, está dañado o se generó con otra versión de Python"""
+
+
+class BinarySnapshot:
+    """Lector perezoso: cada colección se deserializa en el primer load()"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            self._fh = open(self.path, "rb")
+        except OSError as exc:
+            raise IncompatibleSnapshot(str(exc)) from exc
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm[:len(MAGIC)] != MAGIC:
+                raise IncompatibleSnapshot("formato desconocido")
+            start = len(MAGIC) + _HEADER_LEN.size
+            (size,) = _HEADER_LEN.unpack(self._mm[len(MAGIC):start])
+            header = json.loads(self._mm[start:start + size].decode("utf-8"))
+            if header.get("runtime") != _runtime_tag():
+                raise IncompatibleSnapshot("generado con otra versión de Python")
+        except IncompatibleSnapshot:
+            self.close()
+            raise
+        except (ValueError, KeyError, struct.error) as exc:
+            # vacío, truncado o encabezado ilegible: se carga desde JSON
+            self.close()
+            raise IncompatibleSnapshot(f"snapshot dañado: {exc}") from exc
+        self.sequences: Dict[str, int] = header["sequences"]
+        self._sections: Dict[str, List[int]] = header["sections"]
+
+    def collections(self) -> List[str]:
+        return list(self._sections)
+
+    def count(self, name: str) -> int:
+        return self._sections[name][2] if name in self._sections else 0
+
+    def load(self, name: str) -> List[Dict]:
+        if name not in self._sections:
+            return []
+        offset, length, _ = self._sections[name]
+        return marshal.loads(self._mm[offset:offset + length])
+
+    def close(self) -> None:
+        mm, self._mm = getattr(self, "_mm", None), None
+        if mm is not None:
+            mm.close()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def is_fresh(data_dir: Path) -> bool:
+    """True si el snapshot existe y no es más viejo que ningún archivo JSON"""
+    data_dir = Path(data_dir)
+    snap = data_dir / FILE_NAME
+    if not snap.exists():
+        return False
+    mtime = snap.stat().st_mtime
+    return all(
+        (data_dir / f).stat().st_mtime <= mtime
+        for f in JSON_FILES if (data_dir / f).exists()
+    )
+
+
+def convert_json_dir(data_dir: Path, collections: Optional[List[str]] = None) -> Path:
+    """Genera snapshot.sgpi a partir de los archivos JSON de data_dir"""
+    data_dir = Path(data_dir)
+    names = collections or ["users", "convocatorias", "solicitudes"]
+    data: Dict[str, List[Dict]] = {}
+    for name in names:
+        f = data_dir / f"{name}.json"
+        data[name] = json.loads(f.read_text(encoding="utf-8")) if f.exists() else []
+
+    sequences = {name: 0 for name in names}
+    seq_file = data_dir / "sequences.json"
+    if seq_file.exists():
+        stored = json.loads(seq_file.read_text(encoding="utf-8"))
+        sequences.update({k: int(v) for k, v in stored.items() if k in sequences})
+    for name, rows in data.items():
+        sequences[name] = max(sequences[name], max((r["id"] for r in rows), default=0))
+
+    path = data_dir / FILE_NAME
+    write_snapshot(path, data, sequences)
+    return path
+
+
+if __name__ == "__main__":
+    target = Path(sys.argv[1] if len(sys.argv) > 1 else "data")
+    out = convert_json_dir(target)
+    print(f"Snapshot generado: {out} ({out.stat().st_size} bytes)")
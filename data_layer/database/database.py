@@ -6,110 +6,522 @@ Soporta: users, convocatorias, solicitudes
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 import json
+import os
+import threading
+import time
+
+from config import settings
+from data_layer.database import binary_snapshot
+from data_layer.database.fulltext import FullTextIndex
+from data_layer.database.indexes import INDEX_TYPES, ListingIndex, is_operator_condition, matches
+from data_layer.database.journal import Journal
+from data_layer.database.locks import RWLock
+
+# Campos únicos indexados por colección (además de "id")
+UNIQUE_FIELDS: Dict[str, tuple] = {
+    "users": ("username", "email"),
+    "convocatorias": (),
+    "solicitudes": ("codigo",),
+}
+
+# Índices secundarios declarados por defecto: (campo, tipo)
+DEFAULT_INDEXES: Dict[str, List[tuple]] = {
+    "users": [("role", "hash"), ("department", "hash"), ("status", "hash")],
+    "convocatorias": [
+        ("estado", "hash"), ("tipo", "hash"), ("ano", "hash"),
+        ("fecha_inicio", "sorted"), ("fecha_fin", "sorted"),
+    ],
+    "solicitudes": [
+        ("estado", "hash"), ("tipo", "hash"), ("user_id", "hash"),
+        ("convocatoria_id", "hash"), ("created_at", "sorted"),
+    ],
+}
+
+# Índices compuestos (filtro por igualdad, orden) para listados paginados:
+# la página sale de la partición del valor, ya ordenada
+LISTING_INDEXES: Dict[str, List[tuple]] = {
+    "solicitudes": [
+        ("user_id", "created_at"), ("convocatoria_id", "created_at"), ("estado", "created_at"),
+    ],
+}
+
+# Campos de texto libre (con su peso en el ranking) por colección
+FULLTEXT_FIELDS: Dict[str, Dict[str, float]] = {
+    "convocatorias": {"nombre": 3.0, "descripcion": 1.0},
+    "solicitudes": {"codigo": 5.0, "titulo": 3.0, "descripcion": 1.0},
+}
+
 
 class Database:
-    def __init__(self, persist_to_disk: bool = False, data_dir: str = "data"):
+    def __init__(
+        self,
+        persist_to_disk: bool = False,
+        data_dir: str = "data",
+        storage: str = "json",
+        fsync: str = "always",
+        write_behind: bool = False,
+        flush_interval_ms: int = 200,
+        flush_every: int = 500,
+        use_binary_snapshot: bool = False,
+    ):
+        """
+        storage="json" reescribe el archivo de la colección en cada cambio;
+        storage="journal" agrega cada mutación a un log append-only
+        (fsync: "always" | "interval" | "never") y compacta en segundo plano.
+
+        write_behind=True (solo storage="json") marca las colecciones como
+        sucias y un hilo de fondo las escribe cada flush_interval_ms o cada
+        flush_every mutaciones; flush()/close() fuerzan la escritura.
+
+        use_binary_snapshot=True (solo storage="json") arranca desde
+        data/snapshot.sgpi si está al día con los JSON, deserializando cada
+        colección recién en su primer uso; close() lo regenera si quedó viejo.
+        """
+        if storage not in ("json", "journal"):
+            raise ValueError(f"Modo de almacenamiento desconocido: {storage}")
         self.persist_to_disk = persist_to_disk
+        self.storage = storage
         self.data_dir = Path(data_dir)
         if persist_to_disk:
             self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Colecciones
-        self.users: List[Dict] = []
-        self.convocatorias: List[Dict] = []
-        self.solicitudes: List[Dict] = []
+        # Concurrencia: muchos lectores o un escritor. Los registros publicados
+        # no se modifican en sitio (copy-on-write), así que una copia de las
+        # listas es una foto consistente (ver snapshot()).
+        self._lock = RWLock()
+
+        # Colecciones (ver las propiedades users/convocatorias/solicitudes)
+        self._data: Dict[str, List[Dict]] = {name: [] for name in UNIQUE_FIELDS}
+        # Colecciones aún sin deserializar del snapshot binario
+        self.use_binary_snapshot = use_binary_snapshot and storage == "json"
+        self._pending: set = set()
+        self._snapshot_reader: Optional[binary_snapshot.BinarySnapshot] = None
+        self._lazy_lock = threading.RLock()
+
+        # Posición de cada id en la lista de su colección
+        self._positions: Dict[str, Dict[int, int]] = {name: {} for name in UNIQUE_FIELDS}
+        # Índices hash: id -> registro y campo único -> valor -> registro
+        self._by_id: Dict[str, Dict[int, Dict]] = {name: {} for name in UNIQUE_FIELDS}
+        self._unique: Dict[str, Dict[str, Dict]] = {
+            name: {f: {} for f in fields} for name, fields in UNIQUE_FIELDS.items()
+        }
+        # Índices secundarios: colección -> campo -> índice
+        self._secondary: Dict[str, Dict[str, object]] = {name: {} for name in UNIQUE_FIELDS}
+        for name, specs in DEFAULT_INDEXES.items():
+            for field, kind in specs:
+                self._secondary[name][field] = INDEX_TYPES[kind](field)
+        # Índices de listado: colección -> [índice (campo, orden)]
+        self._listing: Dict[str, List[ListingIndex]] = {
+            name: [ListingIndex(f, o) for f, o in LISTING_INDEXES.get(name, ())]
+            for name in UNIQUE_FIELDS
+        }
+        # Índices de texto libre (ver text_search)
+        self._fulltext: Dict[str, FullTextIndex] = {
+            name: FullTextIndex(fields) for name, fields in FULLTEXT_FIELDS.items()
+        }
+
+        # Funciones notificadas en cada mutación: fn(colección, op, registro)
+        self._listeners: List[Callable[[str, str, Dict], None]] = []
+
+        # Versiones para ETag/Last-Modified: un contador global creciente; cada
+        # colección y cada registro guardan (versión, instante) de su último
+        # cambio. La época distingue procesos: tras reiniciar, los ETag viejos
+        # dejan de coincidir.
+        self._epoch = os.urandom(4).hex()
+        self._version = 0
+        started = time.time()
+        self._collection_versions: Dict[str, Tuple[int, float]] = {
+            name: (0, started) for name in UNIQUE_FIELDS
+        }
+        self._record_versions: Dict[str, Dict[int, Tuple[int, float]]] = {
+            name: {} for name in UNIQUE_FIELDS
+        }
+        self._started = started
+
+        # Secuencias de IDs por colección (último id asignado)
+        self._sequences: Dict[str, int] = {name: 0 for name in UNIQUE_FIELDS}
+        self._seq_lock = threading.Lock()
+
+        self._journal: Optional[Journal] = None
+        if persist_to_disk and storage == "journal":
+            self._journal = Journal(self.data_dir, list(UNIQUE_FIELDS), fsync=fsync)
+
+        # Write-behind: colecciones pendientes de escribir a disco
+        self.write_behind = write_behind and persist_to_disk and storage == "json"
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_every = flush_every
+        self._dirty: set = set()
+        self._dirty_count = 0
+        self._dirty_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_wakeup = threading.Event()
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
 
         # Cargar desde disco si corresponde
         if self.persist_to_disk:
             self._load_all()
+            if self._journal:
+                self._journal.start_background(self.compact)
+            if self.write_behind:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="sgpi-write-behind", daemon=True
+                )
+                self._flusher.start()
         else:
             # no seed automático aquí: lo hará seed_data + init desde app.py
             pass
 
-    # ----------------- USERS -----------------
-    def _next_id(self, collection: List[Dict]) -> int:
-        return max([item.get("id", 0) for item in collection], default=0) + 1
+    # ----------------- COLECCIONES -----------------
+    def _ensure_loaded(self, name: str) -> None:
+        if name not in self._pending:
+            return
+        with self._lazy_lock:
+            if name not in self._pending:
+                return
+            self._data[name] = self._snapshot_reader.load(name)
+            self._rebuild_indexes(name)
+            # se quita al final: quien ve la colección fuera de _pending ya
+            # encuentra los índices construidos
+            self._pending.discard(name)
+            if not self._pending:
+                self._snapshot_reader.close()
+                self._snapshot_reader = None
 
-    def add_user(self, user_data: Dict) -> Dict:
+    def _set_collection(self, name: str, rows: List[Dict]) -> None:
+        self._data[name] = rows
+
+    def _get_collection(self, name: str) -> List[Dict]:
+        self._ensure_loaded(name)
+        return self._data[name]
+
+    users = property(
+        lambda self: self._get_collection("users"),
+        lambda self, rows: self._set_collection("users", rows),
+    )
+    convocatorias = property(
+        lambda self: self._get_collection("convocatorias"),
+        lambda self, rows: self._set_collection("convocatorias", rows),
+    )
+    solicitudes = property(
+        lambda self: self._get_collection("solicitudes"),
+        lambda self, rows: self._set_collection("solicitudes", rows),
+    )
+
+    # ----------------- NOTIFICACIONES -----------------
+    def add_listener(self, fn: Callable[[str, str, Dict], None]) -> None:
+        """
+        Registra fn(colección, op, registro), op = "insert" | "update" | "delete".
+        Se invoca dentro del lock de escritura, en el mismo orden que las
+        mutaciones: debe ser rápida y no escribir en la base.
+        """
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn: Callable[[str, str, Dict], None]) -> None:
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _notify(self, name: str, op: str, record: Dict) -> None:
+        # siempre bajo el lock de escritura: primero la versión, luego los listeners
+        self._version += 1
+        stamp = (self._version, time.time())
+        self._collection_versions[name] = stamp
+        if op == "delete":
+            self._record_versions[name].pop(record["id"], None)
+        else:
+            self._record_versions[name][record["id"]] = stamp
+        for fn in self._listeners:
+            fn(name, op, record)
+
+    # ----------------- VERSIONES -----------------
+    def collection_version(self, name: str) -> Tuple[str, float]:
+        """(etiqueta de versión, timestamp del último cambio) de la colección"""
+        version, modified = self._collection_versions[name]
+        return f"{self._epoch}.{version}", modified
+
+    def record_version(self, name: str, record_id: int) -> Optional[Tuple[str, float]]:
+        """Igual que collection_version para un registro; None si no existe"""
+        stamp = self._record_versions[name].get(record_id)
+        if stamp is None:
+            self._ensure_loaded(name)
+            if record_id not in self._by_id[name]:
+                return None
+            # sin cambios desde el arranque
+            stamp = (0, self._started)
+        return f"{self._epoch}.{stamp[0]}", stamp[1]
+
+    # ----------------- ÍNDICES -----------------
+    def _index_record(self, name: str, record: Dict, text: bool = True) -> None:
+        self._by_id[name][record["id"]] = record
+        for f, idx in self._unique[name].items():
+            value = record.get(f)
+            if value is not None:
+                idx[value] = record
+        for idx in self._secondary[name].values():
+            idx.add(record)
+        for idx in self._listing[name]:
+            idx.add(record)
+        if text and name in self._fulltext:
+            self._fulltext[name].add(record)
+
+    def _unindex_record(self, name: str, record: Dict, text: bool = True) -> None:
+        self._by_id[name].pop(record["id"], None)
+        for f, idx in self._unique[name].items():
+            value = record.get(f)
+            # solo quitar si la entrada apunta a este mismo registro
+            if value is not None and idx.get(value) is record:
+                del idx[value]
+        for idx in self._secondary[name].values():
+            idx.remove(record)
+        for idx in self._listing[name]:
+            idx.remove(record)
+        if text and name in self._fulltext:
+            self._fulltext[name].remove(record)
+
+    def _reindex_record(self, name: str, old: Dict, new: Dict) -> None:
+        """
+        Reemplaza old por new en los índices. Las entradas se sobrescriben en
+        sitio y solo se mueven las de los campos que cambiaron: una lectura
+        sin lock (get_user_by_id, find_user_by_username) ve old o new, nunca
+        un hueco.
+        """
+        self._by_id[name][new["id"]] = new
+        for f, idx in self._unique[name].items():
+            before, after = old.get(f), new.get(f)
+            if after is not None:
+                idx[after] = new
+            if before is not None and before != after and idx.get(before) is old:
+                del idx[before]
+        for idx in self._secondary[name].values():
+            if old.get(idx.field) != new.get(idx.field):
+                idx.add(new)
+                idx.remove(old)
+        for idx in self._listing[name]:
+            if (old.get(idx.field) != new.get(idx.field)
+                    or old.get(idx.order_by) != new.get(idx.order_by)):
+                idx.add(new)
+                idx.remove(old)
+
+    def _insert_record(self, name: str, record: Dict) -> None:
+        col = getattr(self, name)
+        self._positions[name][record["id"]] = len(col)
+        col.append(record)
+        self._index_record(name, record)
+
+    def _remove_record(self, name: str, record: Dict) -> None:
+        # O(1): el último registro ocupa el lugar del borrado. La lista solo
+        # se recorre bajo el lock (o copiada por snapshot()), y el orden de
+        # la lista no es el de los resultados: search() ordena por id.
+        col = getattr(self, name)
+        positions = self._positions[name]
+        pos = positions.pop(record["id"])
+        last = col.pop()
+        if last["id"] != record["id"]:
+            col[pos] = last
+            positions[last["id"]] = pos
+        self._unindex_record(name, record)
+
+    def _rebuild_indexes(self, name: str) -> None:
+        self._positions[name] = {r["id"]: i for i, r in enumerate(self._data[name])}
+        self._by_id[name] = {}
+        self._unique[name] = {f: {} for f in UNIQUE_FIELDS[name]}
+        rows = self._data[name]
+        by_id = self._by_id[name]
+        for record in rows:
+            by_id[record["id"]] = record
+        for f, idx in self._unique[name].items():
+            for record in rows:
+                value = record.get(f)
+                if value is not None:
+                    idx[value] = record
+        for idx in self._secondary[name].values():
+            idx.rebuild(rows)
+        for idx in self._listing[name]:
+            idx.rebuild(rows)
+        if name in self._fulltext:
+            self._fulltext[name].rebuild(rows)
+        self._recover_sequence(name)
+
+    def create_index(self, collection_name: str, field: str, kind: str = "hash") -> None:
+        """Declara un índice secundario ("hash" o "sorted") y lo construye"""
+        if collection_name not in self._secondary:
+            raise ValueError(f"Colección desconocida: {collection_name}")
+        if kind not in INDEX_TYPES:
+            raise ValueError(f"Tipo de índice desconocido: {kind}")
+        idx = INDEX_TYPES[kind](field)
+        with self._lock.write():
+            for record in getattr(self, collection_name):
+                idx.add(record)
+            self._secondary[collection_name][field] = idx
+
+    def drop_index(self, collection_name: str, field: str) -> bool:
+        with self._lock.write():
+            return self._secondary.get(collection_name, {}).pop(field, None) is not None
+
+    def list_indexes(self, collection_name: str) -> Dict[str, str]:
+        indexes = {"id": "primary"}
+        indexes.update({f: "unique" for f in UNIQUE_FIELDS.get(collection_name, ())})
+        indexes.update({f: idx.kind for f, idx in self._secondary.get(collection_name, {}).items()})
+        indexes.update({f"{f}+{o}": "listing" for f, o in LISTING_INDEXES.get(collection_name, ())})
+        return indexes
+
+    def _apply_updates(self, name: str, record: Dict, updates: Dict) -> Dict:
+        """Publica una copia actualizada del registro (copy-on-write) y reindexa"""
+        new = dict(record)
+        for k, v in updates.items():
+            if k not in ("id", "created_at"):
+                new[k] = v
+        new["updated_at"] = datetime.now().isoformat()
+        getattr(self, name)[self._positions[name][record["id"]]] = new
+        self._reindex_record(name, record, new)
+        if name in self._fulltext:
+            # la mayoría de las modificaciones no tocan los campos de texto
+            self._fulltext[name].replace(record, new)
+        return new
+
+    # ----------------- SECUENCIAS -----------------
+    def _next_id(self, name: str) -> int:
+        """Asigna el siguiente id de la colección en O(1)"""
+        with self._seq_lock:
+            self._sequences[name] += 1
+            return self._sequences[name]
+
+    def _reserve_ids(self, name: str, count: int) -> int:
+        """Reserva 'count' ids consecutivos y devuelve el primero"""
+        with self._seq_lock:
+            first = self._sequences[name] + 1
+            self._sequences[name] += count
+            return first
+
+    def _recover_sequence(self, name: str) -> None:
+        # nunca retroceder: respeta ids ya emitidos aunque se hayan borrado
+        max_id = max(self._by_id[name], default=0)
+        with self._seq_lock:
+            self._sequences[name] = max(self._sequences[name], max_id)
+
+    # ----------------- USERS -----------------
+    def _new_user(self, user_data: Dict, user_id: int, now: str) -> Dict:
         user = dict(user_data)  # copia para no mutar entrada
-        user["id"] = self._next_id(self.users)
-        now = datetime.now().isoformat()
-        user.setdefault("created_at", now)
-        user.setdefault("updated_at", now)
-        user.setdefault("status", "activo")
+        user["id"] = user_id
         # normalize boolean key names
         if "is_active" in user and "status" not in user:
             user["status"] = "activo" if user["is_active"] else "inactivo"
-        self.users.append(user)
-        if self.persist_to_disk:
-            self._save_users()
+        user.setdefault("created_at", now)
+        user.setdefault("updated_at", now)
+        user.setdefault("status", "activo")
         return user
 
+    def add_user(self, user_data: Dict) -> Dict:
+        user = self._new_user(user_data, self._next_id("users"), datetime.now().isoformat())
+        with self._lock.write():
+            self._insert_record("users", user)
+            self._persist_put("users", user)
+            self._notify("users", "insert", user)
+        return user
+
+    def add_users(self, users: Iterable[Dict]) -> List[Dict]:
+        return self._add_many("users", users, self._new_user)
+
+    # Las búsquedas por clave son un único dict.get (atómico) sobre registros
+    # inmutables: no necesitan tomar el lock. Las escrituras nunca sacan una
+    # entrada vigente de estos índices (ver _reindex_record).
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
-        return next((u for u in self.users if u["id"] == user_id), None)
+        self._ensure_loaded("users")
+        return self._by_id["users"].get(user_id)
 
     def find_user_by_username(self, username: str) -> Optional[Dict]:
-        return next((u for u in self.users if u.get("username") == username), None)
+        self._ensure_loaded("users")
+        return self._unique["users"]["username"].get(username)
 
-    def update_user(self, user_id: int, updates: Dict) -> Optional[Dict]:
-        user = self.get_user_by_id(user_id)
-        if not user:
-            return None
-        for k, v in updates.items():
-            if k not in ("id", "created_at"):
-                user[k] = v
-        user["updated_at"] = datetime.now().isoformat()
-        if self.persist_to_disk:
-            self._save_users()
+    def find_user_by_email(self, email: str) -> Optional[Dict]:
+        self._ensure_loaded("users")
+        return self._unique["users"]["email"].get(email)
+
+    def update_user(self, user_id: int, updates: Dict, expected: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        expected: solo se actualiza si el usuario todavía tiene esos valores
+        (comparar y escribir bajo el mismo lock); si no, devuelve None.
+        """
+        with self._lock.write():
+            user = self.get_user_by_id(user_id)
+            if not user:
+                return None
+            if expected and any(user.get(k) != v for k, v in expected.items()):
+                return None
+            user = self._apply_updates("users", user, updates)
+            self._persist_put("users", user)
+            self._notify("users", "update", user)
         return user
 
     def delete_user(self, user_id: int, soft_delete: bool = True) -> bool:
-        user = self.get_user_by_id(user_id)
-        if not user:
-            return False
-        if soft_delete:
-            user["status"] = "inactivo"
-            user["updated_at"] = datetime.now().isoformat()
-        else:
-            self.users = [u for u in self.users if u["id"] != user_id]
-        if self.persist_to_disk:
-            self._save_users()
+        with self._lock.write():
+            user = self.get_user_by_id(user_id)
+            if not user:
+                return False
+            if soft_delete:
+                user = self._apply_updates("users", user, {"status": "inactivo"})
+                self._persist_put("users", user)
+                self._notify("users", "update", user)
+            else:
+                self._remove_record("users", user)
+                self._persist_delete("users", user_id)
+                self._notify("users", "delete", user)
         return True
 
     # ----------------- CONVOCATORIAS -----------------
-    def add_convocatoria(self, conv_data: Dict) -> Dict:
+    def _new_convocatoria(self, conv_data: Dict, conv_id: int, now: str) -> Dict:
         conv = dict(conv_data)
-        conv["id"] = self._next_id(self.convocatorias)
-        now = datetime.now().isoformat()
+        conv["id"] = conv_id
         conv.setdefault("created_at", now)
         conv.setdefault("updated_at", now)
-        self.convocatorias.append(conv)
-        if self.persist_to_disk:
-            self._save_convocatorias()
         return conv
 
+    def add_convocatoria(self, conv_data: Dict) -> Dict:
+        conv = self._new_convocatoria(
+            conv_data, self._next_id("convocatorias"), datetime.now().isoformat()
+        )
+        with self._lock.write():
+            self._insert_record("convocatorias", conv)
+            self._persist_put("convocatorias", conv)
+            self._notify("convocatorias", "insert", conv)
+        return conv
+
+    def add_convocatorias(self, convocatorias: Iterable[Dict]) -> List[Dict]:
+        return self._add_many("convocatorias", convocatorias, self._new_convocatoria)
+
     def get_convocatoria_by_id(self, conv_id: int) -> Optional[Dict]:
-        return next((c for c in self.convocatorias if c["id"] == conv_id), None)
+        self._ensure_loaded("convocatorias")
+        return self._by_id["convocatorias"].get(conv_id)
+
+    # alias usado por las rutas
+    get_convocatoria = get_convocatoria_by_id
     
     def update_convocatoria(self, id, updates):
-        c = self.get_convocatoria(id)
-        if not c:
-            return None
-        c.update(updates)
+        with self._lock.write():
+            c = self.get_convocatoria_by_id(id)
+            if not c:
+                return None
+            c = self._apply_updates("convocatorias", c, updates)
+            self._persist_put("convocatorias", c)
+            self._notify("convocatorias", "update", c)
         return c
     
     def delete_convocatoria(self, id):
-        before = len(self.convocatorias)
-        self.convocatorias = [c for c in self.convocatorias if c["id"] != id]
-        return len(self.convocatorias) < before
+        with self._lock.write():
+            c = self.get_convocatoria_by_id(id)
+            if not c:
+                return False
+            self._remove_record("convocatorias", c)
+            self._persist_delete("convocatorias", id)
+            self._notify("convocatorias", "delete", c)
+        return True
 
     # ----------------- SOLICITUDES -----------------
-    def add_solicitud(self, sol_data: Dict) -> Dict:
+    def _new_solicitud(self, sol_data: Dict, sol_id: int, now: str) -> Dict:
         sol = dict(sol_data)
-        sol["id"] = self._next_id(self.solicitudes)
-        now = datetime.now().isoformat()
+        sol["id"] = sol_id
         sol.setdefault("created_at", now)
         sol.setdefault("updated_at", now)
         # generar codigo simple si no existe
@@ -117,43 +529,489 @@ class Database:
             tipo = (sol.get("tipo") or "XX").upper()[:2]
             year = datetime.now().year
             sol["codigo"] = f"{tipo}-{year}-{sol['id']:04d}"
-        self.solicitudes.append(sol)
-        if self.persist_to_disk:
-            self._save_solicitudes()
         return sol
 
+    def add_solicitud(self, sol_data: Dict) -> Dict:
+        sol = self._new_solicitud(sol_data, self._next_id("solicitudes"), datetime.now().isoformat())
+        with self._lock.write():
+            self._insert_record("solicitudes", sol)
+            self._persist_put("solicitudes", sol)
+            self._notify("solicitudes", "insert", sol)
+        return sol
+
+    def add_solicitudes(self, solicitudes: Iterable[Dict]) -> List[Dict]:
+        return self._add_many("solicitudes", solicitudes, self._new_solicitud)
+
     def get_solicitud_by_id(self, sol_id: int) -> Optional[Dict]:
-        return next((s for s in self.solicitudes if s["id"] == sol_id), None)
+        self._ensure_loaded("solicitudes")
+        return self._by_id["solicitudes"].get(sol_id)
+
+    def find_solicitud_by_codigo(self, codigo: str) -> Optional[Dict]:
+        self._ensure_loaded("solicitudes")
+        return self._unique["solicitudes"]["codigo"].get(codigo)
+
+    def update_solicitud(self, sol_id: int, updates: Dict) -> Optional[Dict]:
+        with self._lock.write():
+            sol = self.get_solicitud_by_id(sol_id)
+            if not sol:
+                return None
+            sol = self._apply_updates("solicitudes", sol, updates)
+            self._persist_put("solicitudes", sol)
+            self._notify("solicitudes", "update", sol)
+        return sol
+
+    def delete_solicitud(self, sol_id: int) -> bool:
+        with self._lock.write():
+            sol = self.get_solicitud_by_id(sol_id)
+            if not sol:
+                return False
+            self._remove_record("solicitudes", sol)
+            self._persist_delete("solicitudes", sol_id)
+            self._notify("solicitudes", "delete", sol)
+        return True
+
+    # ----------------- ALTAS MASIVAS -----------------
+    def _add_many(
+        self, name: str, items: Iterable[Dict], build: Callable[[Dict, int, str], Dict]
+    ) -> List[Dict]:
+        """
+        Alta masiva: reserva los ids en un solo paso, inserta e indexa bajo
+        un único lock de escritura y persiste una sola vez.
+        """
+        items = list(items)
+        if not items:
+            return []
+        first = self._reserve_ids(name, len(items))
+        now = datetime.now().isoformat()
+        records = [build(data, first + i, now) for i, data in enumerate(items)]
+        with self._lock.write():
+            for record in records:
+                self._insert_record(name, record)
+            self._persist_many(name, records)
+            for record in records:
+                self._notify(name, "insert", record)
+        return records
 
     # ----------------- STATS & SEARCH -----------------
     def get_stats(self) -> Dict:
-        return {
-            "total_users": len(self.users),
-            "total_convocatorias": len(self.convocatorias),
-            "total_solicitudes": len(self.solicitudes),
-            "last_updated": datetime.now().isoformat()
-        }
+        with self._lock.read():
+            return {
+                "total_users": len(self.users),
+                "total_convocatorias": len(self.convocatorias),
+                "total_solicitudes": len(self.solicitudes),
+                "last_updated": datetime.now().isoformat()
+            }
+
+    def snapshot(self) -> "DatabaseSnapshot":
+        """
+        Foto consistente (solo lectura) para lectores largos: reportes,
+        exportaciones. Copiar las listas es O(n) en punteros; después no se
+        retiene ningún lock, así que los escritores siguen trabajando.
+        """
+        with self._lock.read():
+            return DatabaseSnapshot(
+                {name: list(getattr(self, name)) for name in UNIQUE_FIELDS}
+            )
 
     def search(self, collection_name: str, query: Dict) -> List[Dict]:
-        col = getattr(self, collection_name, None)
-        if not isinstance(col, list):
+        """
+        Busca registros que cumplan todas las condiciones de 'query'.
+        Usa los índices disponibles y recorre la colección solo si ninguno aplica.
+        Ver explain() para conocer el plan elegido.
+        """
+        if collection_name not in UNIQUE_FIELDS:
+            return []
+        with self._lock.read():
+            plan = self._plan(collection_name, query)
+            if plan["strategy"] == "scan":
+                results = [item for item in getattr(self, collection_name) if matches(item, query)]
+                results.sort(key=lambda r: r["id"])
+                return results
+            by_id = self._by_id[collection_name]
+            results = []
+            for record_id in sorted(plan["candidates"]):
+                item = by_id.get(record_id)
+                if item is not None and matches(item, query):
+                    results.append(item)
+            return results
+
+    def search_page(
+        self,
+        collection_name: str,
+        query: Dict,
+        order_by: str = "id",
+        descending: bool = False,
+        after: Optional[tuple] = None,
+        limit: int = 50,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Dict]:
+        """
+        Una página de 'search' ordenada por (order_by, id).
+
+        Paginación por cursor: 'after' es la clave (valor, id) del último
+        registro de la página anterior. 'predicate' filtra además en Python
+        (p. ej. texto libre). Con un índice de listado (campo, order_by) y
+        igualdad en el campo se recorre solo esa partición; si order_by tiene
+        índice ordenado y los filtros dejan muchos candidatos, se recorre el
+        índice en orden; en ambos casos se corta al completar la página. Si
+        no, se ordenan solo los candidatos. Los registros sin valor en
+        order_by no aparecen.
+        """
+        if collection_name not in UNIQUE_FIELDS or limit <= 0:
+            return []
+        with self._lock.read():
+            self._ensure_loaded(collection_name)
+            by_id = self._by_id[collection_name]
+
+            def accept(record: Optional[Dict]) -> bool:
+                return (record is not None and matches(record, query)
+                        and (predicate is None or predicate(record)))
+
+            # recorrido en orden (valor, id): partición de un índice de
+            # listado, o el índice ordenado completo
+            walk = None
+            candidates = None
+            index = self._secondary[collection_name].get(order_by)
+            listing = self._listing_for(collection_name, query, order_by)
+            if listing is not None:
+                walk = listing[0].iter_from(listing[1], after, descending)
+            elif index is not None and index.kind == "sorted":
+                # con muchos candidatos no se arma el conjunto: se recorre el
+                # índice ordenado filtrando con el conjunto del índice hash
+                estimate, candidates = self._estimate(collection_name, query)
+                if estimate is None or estimate > 8 * limit:
+                    walk = index.iter_from(after, descending)
+            if walk is None:
+                candidates = self._plan(collection_name, query)["candidates"]
+            results: List[Dict] = []
+            if walk is not None:
+                for _, record_id in walk:
+                    if candidates is not None and record_id not in candidates:
+                        continue
+                    record = by_id.get(record_id)
+                    if accept(record):
+                        results.append(record)
+                        if len(results) >= limit:
+                            break
+                return results
+
+            pool = candidates if candidates is not None else by_id
+            if order_by == "id":
+                keyed = [((i, i), by_id.get(i)) for i in pool]
+            else:
+                keyed = []
+                for i in pool:
+                    record = by_id.get(i)
+                    if record is not None and record.get(order_by) is not None:
+                        keyed.append(((record[order_by], i), record))
+            keyed.sort(key=lambda kr: kr[0], reverse=descending)
+            for key, record in keyed:
+                if after is not None and (key <= tuple(after) if not descending else key >= tuple(after)):
+                    continue
+                if accept(record):
+                    results.append(record)
+                    if len(results) >= limit:
+                        break
+            return results
+
+    def iter_search(
+        self,
+        collection_name: str,
+        query: Optional[Dict] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Dict]:
+        """
+        Resultados de 'search' en orden de id, sin armar la lista de
+        registros (exportaciones, respuestas en streaming). Bajo el lock de
+        lectura solo se toman los ids candidatos; los registros se leen al
+        consumir el iterador. Un registro borrado mientras tanto no aparece y
+        uno modificado aparece en su versión nueva. batch_size solo lo usa
+        el motor sqlite (filas por consulta).
+        """
+        if collection_name not in UNIQUE_FIELDS:
+            return
+        query = query or {}
+        with self._lock.read():
+            candidates = self._plan(collection_name, query)["candidates"]
+            by_id = self._by_id[collection_name]
+            ids = sorted(candidates if candidates is not None else by_id)
+        for record_id in ids:
+            record = by_id.get(record_id)
+            if record is None or not matches(record, query):
+                continue
+            if predicate is None or predicate(record):
+                yield record
+
+    def text_search(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int = 20,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Búsqueda de texto libre (sin tildes, con stemming y prefijos) sobre
+        FULLTEXT_FIELDS. Devuelve [(registro, puntaje)] del más relevante al
+        menos; 'predicate' filtra antes de elegir los mejores.
+        """
+        index = self._fulltext.get(collection_name)
+        if index is None or limit <= 0:
             return []
-        results = []
-        for item in col:
-            ok = True
-            for k, v in query.items():
-                if item.get(k) != v:
-                    ok = False
-                    break
-            if ok:
-                results.append(item)
-        return results
-
-    # ----------------- PERSISTENCIA SIMPLE -----------------
+        self._ensure_loaded(collection_name)
+        with self._lock.read():
+            by_id = self._by_id[collection_name]
+            accept = None
+            if predicate is not None:
+                def accept(record_id: int) -> bool:
+                    record = by_id.get(record_id)
+                    return record is not None and predicate(record)
+            return [(by_id[i], score) for i, score in index.search(text, limit, accept) if i in by_id]
+
+    def text_match_ids(self, collection_name: str, text: str) -> set:
+        """ids de los registros que contienen todos los términos de 'text'"""
+        index = self._fulltext.get(collection_name)
+        if index is None:
+            return set()
+        self._ensure_loaded(collection_name)
+        with self._lock.read():
+            return index.ids(text)
+
+    def distinct(self, collection_name: str, field: str) -> List:
+        """Valores distintos de un campo con índice hash (sin recorrer la colección)"""
+        self._ensure_loaded(collection_name)
+        index = self._secondary.get(collection_name, {}).get(field)
+        if index is None or index.kind != "hash":
+            with self._lock.read():
+                return sorted({r.get(field) for r in getattr(self, collection_name)} - {None}, key=str)
+        with self._lock.read():
+            return sorted((v for v in index.values() if v is not None), key=str)
+
+    def explain(self, collection_name: str, query: Dict) -> Dict:
+        """Describe el plan de 'search' sin ejecutarlo"""
+        if collection_name not in UNIQUE_FIELDS:
+            return {"collection": collection_name, "strategy": "none"}
+        with self._lock.read():
+            plan = self._plan(collection_name, query)
+            total = len(getattr(self, collection_name))
+        return {
+            "collection": collection_name,
+            "strategy": plan["strategy"],
+            "indexes": plan["indexes"],
+            "residual": plan["residual"],
+            "candidates": len(plan["candidates"]) if plan["candidates"] is not None else total,
+        }
+
+    def _listing_for(self, name: str, query: Dict, order_by: str) -> Optional[Tuple[ListingIndex, Any]]:
+        """(índice de listado, valor) con la partición más chica para la consulta"""
+        best = None
+        for idx in self._listing[name]:
+            if idx.order_by != order_by or idx.field not in query:
+                continue
+            cond = query[idx.field]
+            if is_operator_condition(cond):
+                if set(cond) != {"$eq"}:
+                    continue
+                cond = cond["$eq"]
+            size = idx.size(cond)
+            if best is None or size < best[0]:
+                best = (size, idx, cond)
+        if best is None or any(
+            f == "id" or f in self._unique.get(name, {}) for f in query
+        ):
+            return None
+        return best[1], best[2]
+
+    def _estimate(self, name: str, query: Dict) -> Tuple[Optional[int], Optional[set]]:
+        """
+        Cota de candidatos del índice más selectivo, sin materializarlos, y
+        el conjunto de ids del índice hash más selectivo por igualdad (el del
+        índice, sin copiar: solo válido bajo el lock de lectura).
+        """
+        best = None
+        members = None
+        for field, cond in query.items():
+            equality = not is_operator_condition(cond) or set(cond) == {"$eq"}
+            if (field == "id" or field in self._unique.get(name, {})) and equality:
+                return 1, None
+            idx = self._secondary.get(name, {}).get(field)
+            if idx is None or not idx.supports(cond):
+                continue
+            estimate = idx.estimate(cond)
+            if best is None or estimate < best:
+                best = estimate
+                members = None
+                if idx.kind == "hash" and equality:
+                    value = cond["$eq"] if is_operator_condition(cond) else cond
+                    members = idx.ids_for(value)
+        return best, members
+
+    def _plan(self, name: str, query: Dict) -> Dict:
+        self._ensure_loaded(name)
+        # (estimación, campo, tipo, función que produce los candidatos)
+        options = []
+        for field, cond in query.items():
+            equality = not is_operator_condition(cond) or set(cond) == {"$eq"}
+            value = cond["$eq"] if is_operator_condition(cond) and equality else cond
+            if field == "id" and equality:
+                hit = value in self._by_id[name] if isinstance(value, int) else False
+                options.append((int(hit), field, "primary", lambda v=value: {v} if hit else set()))
+            elif field in self._unique.get(name, {}) and equality and value is not None:
+                rec = self._unique[name][field].get(value) if not isinstance(value, (dict, list)) else None
+                options.append((int(rec is not None), field, "unique",
+                                lambda r=rec: {r["id"]} if r is not None else set()))
+            elif field in self._secondary.get(name, {}):
+                idx = self._secondary[name][field]
+                if idx.supports(cond):
+                    options.append((idx.estimate(cond), field, idx.kind,
+                                    lambda i=idx, c=cond: i.candidates(c)))
+
+        if not options:
+            return {"strategy": "scan", "indexes": [], "residual": list(query), "candidates": None}
+
+        # más selectivo primero; se intersecta con el siguiente índice solo si
+        # es más barato que filtrar los candidatos ya obtenidos
+        options.sort(key=lambda o: o[0])
+        candidates = None
+        used = []
+        for estimate, field, kind, fetch in options:
+            if candidates is not None and estimate > 4 * len(candidates):
+                break
+            ids = fetch()
+            candidates = ids if candidates is None else candidates & ids
+            used.append({"field": field, "kind": kind, "estimate": estimate})
+            if not candidates:
+                break
+        used_fields = {u["field"] for u in used}
+        return {
+            "strategy": "index",
+            "indexes": used,
+            "residual": [f for f in query if f not in used_fields],
+            "candidates": candidates,
+        }
+
+    # ----------------- PERSISTENCIA -----------------
+    def _persist_put(self, name: str, record: Dict) -> None:
+        if not self.persist_to_disk:
+            return
+        if self._journal:
+            self._journal.append_put(name, record)
+        else:
+            self._save_collection(name)
+
+    def _persist_many(self, name: str, records: List[Dict]) -> None:
+        if not self.persist_to_disk:
+            return
+        if self._journal:
+            self._journal.append_puts(name, records)
+        else:
+            self._save_collection(name)
+
+    def _persist_delete(self, name: str, record_id: int) -> None:
+        if not self.persist_to_disk:
+            return
+        if self._journal:
+            self._journal.append_delete(name, record_id)
+        else:
+            self._save_collection(name)
+
+    def _save_collection(self, name: str) -> None:
+        if not self.write_behind:
+            getattr(self, f"_save_{name}")()
+            return
+        with self._dirty_lock:
+            self._dirty.add(name)
+            self._dirty_count += 1
+            if self._dirty_count >= self.flush_every:
+                self._flush_wakeup.set()
+
+    def _flush_loop(self) -> None:
+        while not self._closing.is_set():
+            self._flush_wakeup.wait(self.flush_interval_ms / 1000)
+            self._flush_wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe a disco las colecciones con cambios pendientes"""
+        if self._journal:
+            self._journal.sync()
+            return
+        with self._flush_lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+                self._dirty_count = 0
+            for name in dirty:
+                getattr(self, f"_save_{name}")()
+
+    def _journal_capture(self, rotate):
+        # bajo lock de lectura: ninguna mutación entre la rotación y la copia
+        with self._lock.read():
+            rotate()
+            collections = {name: list(getattr(self, name)) for name in UNIQUE_FIELDS}
+            with self._seq_lock:
+                sequences = dict(self._sequences)
+        return collections, sequences
+
+    def compact(self) -> None:
+        """Compacta el journal en un snapshot nuevo (solo storage="journal")"""
+        if self._journal:
+            self._journal.compact(self._journal_capture)
+
+    def close(self) -> None:
+        """Detiene los hilos de persistencia, vacía lo pendiente y cierra archivos"""
+        self._closing.set()
+        self._flush_wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        if self.write_behind:
+            self.flush()
+        if self._journal:
+            self._journal.close()
+        if (self.persist_to_disk and self.use_binary_snapshot
+                and not binary_snapshot.is_fresh(self.data_dir)):
+            self.save_binary_snapshot()
+
     def _load_all(self):
-        self._load_users()
-        self._load_convocatorias()
-        self._load_solicitudes()
+        with self._lock.write():
+            if self.use_binary_snapshot and self._open_binary_snapshot():
+                return
+            if self._journal:
+                collections, sequences = self._journal.load()
+                with self._seq_lock:
+                    self._sequences.update(sequences)
+                for name, rows in collections.items():
+                    setattr(self, name, rows)
+                    self._rebuild_indexes(name)
+                return
+            self._load_sequences()
+            self._load_users()
+            self._load_convocatorias()
+            self._load_solicitudes()
+
+    def _open_binary_snapshot(self) -> bool:
+        if not binary_snapshot.is_fresh(self.data_dir):
+            return False
+        try:
+            reader = binary_snapshot.BinarySnapshot(self.data_dir / binary_snapshot.FILE_NAME)
+        except binary_snapshot.IncompatibleSnapshot:
+            return False
+        with self._seq_lock:
+            for name in self._sequences:
+                self._sequences[name] = int(reader.sequences.get(name, 0))
+        self._snapshot_reader = reader
+        self._pending = set(UNIQUE_FIELDS)
+        return True
+
+    def save_binary_snapshot(self) -> None:
+        """Escribe data/snapshot.sgpi con el estado actual"""
+        with self._lock.read():
+            collections = {name: list(getattr(self, name)) for name in UNIQUE_FIELDS}
+            with self._seq_lock:
+                sequences = dict(self._sequences)
+        binary_snapshot.write_snapshot(
+            self.data_dir / binary_snapshot.FILE_NAME, collections, sequences
+        )
 
     def _load_users(self):
         f = self.data_dir / "users.json"
@@ -162,11 +1020,15 @@ class Database:
                 self.users = json.load(fh)
         else:
             self.users = []
+        self._rebuild_indexes("users")
 
     def _save_users(self):
         f = self.data_dir / "users.json"
+        with self._lock.read():
+            rows = list(self.users)
         with open(f, "w", encoding="utf-8") as fh:
-            json.dump(self.users, fh, ensure_ascii=False, indent=2)
+            json.dump(rows, fh, ensure_ascii=False, indent=2)
+        self._save_sequences()
 
     def _load_convocatorias(self):
         f = self.data_dir / "convocatorias.json"
@@ -175,11 +1037,15 @@ class Database:
                 self.convocatorias = json.load(fh)
         else:
             self.convocatorias = []
+        self._rebuild_indexes("convocatorias")
 
     def _save_convocatorias(self):
         f = self.data_dir / "convocatorias.json"
+        with self._lock.read():
+            rows = list(self.convocatorias)
         with open(f, "w", encoding="utf-8") as fh:
-            json.dump(self.convocatorias, fh, ensure_ascii=False, indent=2)
+            json.dump(rows, fh, ensure_ascii=False, indent=2)
+        self._save_sequences()
 
     def _load_solicitudes(self):
         f = self.data_dir / "solicitudes.json"
@@ -188,22 +1054,120 @@ class Database:
                 self.solicitudes = json.load(fh)
         else:
             self.solicitudes = []
+        self._rebuild_indexes("solicitudes")
 
     def _save_solicitudes(self):
         f = self.data_dir / "solicitudes.json"
+        with self._lock.read():
+            rows = list(self.solicitudes)
         with open(f, "w", encoding="utf-8") as fh:
-            json.dump(self.solicitudes, fh, ensure_ascii=False, indent=2)
+            json.dump(rows, fh, ensure_ascii=False, indent=2)
+        self._save_sequences()
+
+
+    def _load_sequences(self):
+        f = self.data_dir / "sequences.json"
+        if f.exists():
+            with open(f, "r", encoding="utf-8") as fh:
+                stored = json.load(fh)
+            for name in self._sequences:
+                self._sequences[name] = int(stored.get(name, 0))
+
+    def _save_sequences(self):
+        f = self.data_dir / "sequences.json"
+        with self._seq_lock:
+            data = dict(self._sequences)
+        with open(f, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+
+
+class DatabaseSnapshot:
+    """Vista de solo lectura de la base de datos en un instante dado"""
+
+    def __init__(self, collections: Dict[str, List[Dict]]):
+        self.taken_at = datetime.now().isoformat()
+        self._collections = collections
+        self._by_id: Dict[str, Dict[int, Dict]] = {}
+
+    @property
+    def users(self) -> List[Dict]:
+        return self._collections["users"]
+
+    @property
+    def convocatorias(self) -> List[Dict]:
+        return self._collections["convocatorias"]
+
+    @property
+    def solicitudes(self) -> List[Dict]:
+        return self._collections["solicitudes"]
+
+    def _get(self, name: str, record_id: int) -> Optional[Dict]:
+        if name not in self._by_id:
+            self._by_id[name] = {r["id"]: r for r in self._collections[name]}
+        return self._by_id[name].get(record_id)
+
+    def get_user_by_id(self, user_id: int) -> Optional[Dict]:
+        return self._get("users", user_id)
+
+    def get_convocatoria_by_id(self, conv_id: int) -> Optional[Dict]:
+        return self._get("convocatorias", conv_id)
+
+    def get_solicitud_by_id(self, sol_id: int) -> Optional[Dict]:
+        return self._get("solicitudes", sol_id)
+
+    def search(self, collection_name: str, query: Dict) -> List[Dict]:
+        col = self._collections.get(collection_name)
+        if col is None:
+            return []
+        return sorted((item for item in col if matches(item, query)), key=lambda r: r["id"])
+
+    def get_stats(self) -> Dict:
+        return {
+            "total_users": len(self.users),
+            "total_convocatorias": len(self.convocatorias),
+            "total_solicitudes": len(self.solicitudes),
+            "last_updated": self.taken_at
+        }
 
 
 # Singleton
 _db_instance: Optional[Database] = None
 
-def get_database(persist_to_disk: bool = False, data_dir: str = "data") -> Database:
+def get_database(
+    persist_to_disk: bool = False,
+    data_dir: str = "data",
+    storage: str = "json",
+    fsync: str = "always",
+    write_behind: bool = False,
+    engine: str = "memory",
+    use_binary_snapshot: bool = False,
+):
+    """
+    engine="memory": Database en memoria (un proceso).
+    engine="sqlite": SQLiteDatabase en data_dir/sgpi.sqlite3, compartida por
+    todos los workers; los parámetros de persistencia en memoria no aplican.
+    """
     global _db_instance
     if _db_instance is None:
-        _db_instance = Database(persist_to_disk=persist_to_disk, data_dir=data_dir)
+        if engine == "sqlite":
+            from data_layer.database.sqlite_database import SQLiteDatabase
+            _db_instance = SQLiteDatabase(path=str(Path(data_dir) / "sgpi.sqlite3"))
+        elif engine == "memory":
+            _db_instance = Database(
+                persist_to_disk=persist_to_disk, data_dir=data_dir, storage=storage,
+                fsync=fsync, write_behind=write_behind,
+                use_binary_snapshot=use_binary_snapshot,
+            )
+        else:
+            raise ValueError(f"Motor de base de datos desconocido: {engine}")
     return _db_instance
 
-# alias
-db = get_database()
-
+# alias (configurable por variables de entorno, ver config/settings.py)
+db = get_database(
+    persist_to_disk=settings.DB_PERSIST_TO_DISK,
+    data_dir=settings.DB_DATA_DIR,
+    storage=settings.DB_STORAGE,
+    write_behind=settings.DB_WRITE_BEHIND,
+    engine=settings.DB_ENGINE,
+    use_binary_snapshot=settings.DB_BINARY_SNAPSHOT,
+)
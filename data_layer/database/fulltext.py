@@ -0,0 +1,234 @@
+# data_layer/database/fulltext.py
+"""
+Índice invertido de texto libre para la base en memoria.
+
+Normalización (análisis) pensada para español:
+    "Diseños Industriales" -> ["disen", "industrial"]
+  - minúsculas y sin tildes (NFKD; la ñ queda como n)
+  - se descartan palabras vacías ("de", "la", "para", ...)
+  - stemming liviano: plural (-es/-s) y vocal final; "patentes", "patente"
+    y "patent" quedan en el mismo término
+
+Consulta: todos los términos deben aparecer (AND). Cada término de la
+consulta coincide exacto o como prefijo de un término indexado (coincidencia
+por prefijo pesa la mitad). Ranking: suma de peso del campo x frecuencia x idf.
+"""
+
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import heapq
+import math
+import re
+import unicodedata
+
+STOP_WORDS = frozenset("""
+a al con de del el en es la las lo los o para por que se sin su sus un una y
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# prefijos más cortos solo coinciden exacto; límite de expansión por término
+MIN_PREFIX = 2
+MAX_EXPANSION = 256
+PREFIX_FACTOR = 0.5
+
+
+def fold(text: str) -> str:
+    """Minúsculas sin tildes ni diacríticos"""
+    text = text.lower()
+    if text.isascii():
+        return text
+    # NFKD separa letra y tilde; lo que no es ASCII no forma términos
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Stemming liviano para español: plural y vocal final"""
+    if len(token) > 5 and token.endswith("eses"):
+        token = token[:-2]
+    elif len(token) > 4 and token.endswith("ces"):
+        token = token[:-3] + "z"
+    elif len(token) > 4 and token.endswith(("os", "as", "es")):
+        token = token[:-2]
+    elif len(token) > 3 and token.endswith("s"):
+        token = token[:-1]
+    if len(token) > 3 and token[-1] in "aeo":
+        token = token[:-1]
+    return token
+
+
+def analyze(text) -> List[str]:
+    """Texto -> términos normalizados (con repeticiones, en orden)"""
+    if text is None:
+        return []
+    return [stem(t) for t in _TOKEN_RE.findall(fold(str(text))) if t not in STOP_WORDS]
+
+
+class FullTextIndex:
+    """
+    fields: campo -> peso. Los registros no se copian: el índice solo guarda
+    término -> {id: peso}. Para quitar un registro se vuelve a analizar su
+    versión anterior (los registros de la base son inmutables).
+    """
+
+    kind = "fulltext"
+
+    def __init__(self, fields: Dict[str, float]):
+        self.fields = dict(fields)
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []      # ordenado, para prefijos
+        self._docs = 0
+
+    # ----------------- MANTENIMIENTO -----------------
+    def _weights(self, record: Dict) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for field, weight in self.fields.items():
+            for term in analyze(record.get(field)):
+                weights[term] = weights.get(term, 0.0) + weight
+        return weights
+
+    def add(self, record: Dict) -> None:
+        weights = self._weights(record)
+        if not weights:
+            return
+        record_id = record["id"]
+        postings = self._postings
+        for term, weight in weights.items():
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = {}
+                insort(self._vocabulary, term)
+            posting[record_id] = weight
+        self._docs += 1
+
+    def remove(self, record: Dict) -> None:
+        weights = self._weights(record)
+        if not weights:
+            return
+        record_id = record["id"]
+        removed = False
+        for term in weights:
+            posting = self._postings.get(term)
+            if posting is None or posting.pop(record_id, None) is None:
+                continue
+            removed = True
+            if not posting:
+                del self._postings[term]
+                pos = bisect_left(self._vocabulary, term)
+                if pos < len(self._vocabulary) and self._vocabulary[pos] == term:
+                    del self._vocabulary[pos]
+        if removed:
+            self._docs -= 1
+
+    def replace(self, old: Dict, new: Dict) -> None:
+        """Actualización: no hace nada si los campos de texto no cambiaron"""
+        if all(old.get(f) == new.get(f) for f in self.fields):
+            return
+        self.remove(old)
+        self.add(new)
+
+    def clear(self) -> None:
+        self._postings = {}
+        self._vocabulary = []
+        self._docs = 0
+
+    def rebuild(self, records: List[Dict]) -> None:
+        """Construcción en bloque: el vocabulario se ordena una sola vez"""
+        self.clear()
+        postings = self._postings
+        for record in records:
+            weights = self._weights(record)
+            if not weights:
+                continue
+            record_id = record["id"]
+            for term, weight in weights.items():
+                posting = postings.get(term)
+                if posting is None:
+                    posting = postings[term] = {}
+                posting[record_id] = weight
+            self._docs += 1
+        self._vocabulary = sorted(postings)
+
+    # ----------------- CONSULTA -----------------
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Términos indexados que coinciden con 'term': exacto y por prefijo"""
+        matches = []
+        if term in self._postings:
+            matches.append((term, 1.0))
+        if len(term) >= MIN_PREFIX:
+            vocab = self._vocabulary
+            pos = bisect_left(vocab, term)
+            end = min(len(vocab), pos + MAX_EXPANSION)
+            while pos < end and vocab[pos].startswith(term):
+                if vocab[pos] != term:
+                    matches.append((vocab[pos], PREFIX_FACTOR))
+                pos += 1
+        return matches
+
+    def _scored_expansion(self, term: str) -> List[Tuple[Dict[int, float], float]]:
+        """[(posting, factor x idf)] de los términos indexados que coinciden"""
+        total = max(1, self._docs)
+        return [
+            (posting, factor * math.log(1 + total / len(posting)))
+            for posting, factor in ((self._postings[t], f) for t, f in self._expand(term))
+        ]
+
+    @staticmethod
+    def _term_scores(expansion: List[Tuple[Dict[int, float], float]]) -> Dict[int, float]:
+        """Puntaje de cada registro para un término: la mejor coincidencia"""
+        scores: Dict[int, float] = {}
+        for posting, factor in expansion:
+            for record_id, weight in posting.items():
+                score = weight * factor
+                if score > scores.get(record_id, 0.0):
+                    scores[record_id] = score
+        return scores
+
+    def _query_terms(self, text: str) -> List[str]:
+        # mismo análisis que al indexar; un término a medio escribir ("conv")
+        # coincide por prefijo
+        return list(dict.fromkeys(analyze(text)))
+
+    def match(self, text: str) -> Dict[int, float]:
+        """id -> puntaje de los registros que contienen todos los términos"""
+        terms = self._query_terms(text)
+        if not terms:
+            return {}
+        expansions = [self._scored_expansion(t) for t in terms]
+        # el término más selectivo fija los candidatos; los demás solo se
+        # consultan para esos ids (un término frecuente como "2026" no se
+        # recorre entero)
+        expansions.sort(key=lambda e: sum(len(p) for p, _ in e))
+        result = self._term_scores(expansions[0])
+        for expansion in expansions[1:]:
+            if not result:
+                break
+            if len(result) * len(expansion) >= sum(len(p) for p, _ in expansion):
+                scores = self._term_scores(expansion)
+                result = {i: s + scores[i] for i, s in result.items() if i in scores}
+                continue
+            narrowed = {}
+            for record_id, score in result.items():
+                best = 0.0
+                for posting, factor in expansion:
+                    weight = posting.get(record_id)
+                    if weight is not None and weight * factor > best:
+                        best = weight * factor
+                if best:
+                    narrowed[record_id] = score + best
+            result = narrowed
+        return result
+
+    def search(self, text: str, limit: int = 20,
+               accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """[(id, puntaje)] de mayor a menor puntaje (a igualdad, id menor)"""
+        scored = self.match(text)
+        items = scored.items() if accept is None else ((i, s) for i, s in scored.items() if accept(i))
+        return heapq.nlargest(limit, items, key=lambda item: (item[1], -item[0]))
+
+    def ids(self, text: str) -> Set[int]:
+        return set(self.match(text))
+
+    def stats(self) -> Dict:
+        return {"documents": self._docs, "terms": len(self._postings)}
@@ -0,0 +1,273 @@
+# data_layer/database/indexes.py
+"""
+Índices secundarios para la base de datos en memoria.
+
+Una consulta es un dict campo -> condición. La condición puede ser un valor
+(igualdad) o un dict de operadores: {"$eq", "$gt", "$gte", "$lt", "$lte"}.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+OPERATORS = ("$eq",) + RANGE_OPERATORS
+
+
+def is_operator_condition(cond: Any) -> bool:
+    return isinstance(cond, dict) and bool(cond) and all(k in OPERATORS for k in cond)
+
+
+def matches(record: Dict, query: Dict) -> bool:
+    """Evalúa la consulta completa sobre un registro"""
+    for field, cond in query.items():
+        value = record.get(field)
+        if not is_operator_condition(cond):
+            if value != cond:
+                return False
+            continue
+        try:
+            for op, operand in cond.items():
+                if op == "$eq" and not value == operand:
+                    return False
+                if value is None and op != "$eq":
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+        except TypeError:
+            return False
+    return True
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class HashIndex:
+    """Índice de igualdad: valor -> ids"""
+
+    kind = "hash"
+
+    def __init__(self, field: str):
+        self.field = field
+        self._map: Dict[Any, Set[int]] = {}
+
+    def add(self, record: Dict) -> None:
+        value = record.get(self.field)
+        if _hashable(value):
+            self._map.setdefault(value, set()).add(record["id"])
+
+    def remove(self, record: Dict) -> None:
+        value = record.get(self.field)
+        if not _hashable(value):
+            return
+        ids = self._map.get(value)
+        if ids is not None:
+            ids.discard(record["id"])
+            if not ids:
+                del self._map[value]
+
+    def clear(self) -> None:
+        self._map = {}
+
+    def rebuild(self, records: List[Dict]) -> None:
+        self.clear()
+        for record in records:
+            self.add(record)
+
+    def _value(self, cond: Any) -> Any:
+        return cond["$eq"] if is_operator_condition(cond) else cond
+
+    def supports(self, cond: Any) -> bool:
+        if is_operator_condition(cond):
+            return "$eq" in cond and _hashable(cond["$eq"])
+        return _hashable(cond)
+
+    def estimate(self, cond: Any) -> int:
+        return len(self._map.get(self._value(cond), ()))
+
+    def candidates(self, cond: Any) -> Set[int]:
+        return set(self._map.get(self._value(cond), ()))
+
+    def values(self) -> List[Any]:
+        return list(self._map)
+
+    def ids_for(self, value: Any) -> Set[int]:
+        return self._map.get(value, set())
+
+
+class SortedIndex:
+    """Índice ordenado (valor, id) para consultas de rango e igualdad"""
+
+    kind = "sorted"
+
+    def __init__(self, field: str):
+        self.field = field
+        self._keys: List[Tuple[Any, int]] = []
+        # ids cuyo valor no es comparable con el resto; siempre son candidatos
+        self._other: Set[int] = set()
+
+    def add(self, record: Dict) -> None:
+        value = record.get(self.field)
+        if value is None:
+            return
+        try:
+            insort(self._keys, (value, record["id"]))
+        except TypeError:
+            self._other.add(record["id"])
+
+    def remove(self, record: Dict) -> None:
+        value = record.get(self.field)
+        if value is None:
+            return
+        key = (value, record["id"])
+        try:
+            pos = bisect_left(self._keys, key)
+        except TypeError:
+            self._other.discard(record["id"])
+            return
+        if pos < len(self._keys) and self._keys[pos] == key:
+            del self._keys[pos]
+        else:
+            self._other.discard(record["id"])
+
+    def clear(self) -> None:
+        self._keys = []
+        self._other = set()
+
+    def rebuild(self, records: List[Dict]) -> None:
+        """Construcción en bloque: un solo sort en vez de un insort por registro"""
+        self.clear()
+        field = self.field
+        keys = [(r[field], r["id"]) for r in records if r.get(field) is not None]
+        try:
+            keys.sort()
+        except TypeError:
+            # tipos mezclados: se indexa registro a registro
+            for record in records:
+                self.add(record)
+            return
+        self._keys = keys
+
+    def supports(self, cond: Any) -> bool:
+        if cond is None:
+            return False
+        if not is_operator_condition(cond):
+            return _hashable(cond)
+        return True
+
+    def _bounds(self, cond: Any) -> Tuple[int, int]:
+        if not is_operator_condition(cond):
+            cond = {"$eq": cond}
+        lo, hi = 0, len(self._keys)
+        # (valor,) ordena antes que cualquier (valor, id); (valor, inf) después
+        high = float("inf")
+        for op, operand in cond.items():
+            if op in ("$eq", "$gte"):
+                lo = max(lo, bisect_left(self._keys, (operand,)))
+            if op == "$gt":
+                lo = max(lo, bisect_right(self._keys, (operand, high)))
+            if op in ("$eq", "$lte"):
+                hi = min(hi, bisect_right(self._keys, (operand, high)))
+            if op == "$lt":
+                hi = min(hi, bisect_left(self._keys, (operand,)))
+        return lo, max(lo, hi)
+
+    def estimate(self, cond: Any) -> int:
+        try:
+            lo, hi = self._bounds(cond)
+        except TypeError:
+            return len(self._keys) + len(self._other)
+        return hi - lo + len(self._other)
+
+    def candidates(self, cond: Any) -> Set[int]:
+        try:
+            lo, hi = self._bounds(cond)
+        except TypeError:
+            return {i for _, i in self._keys} | self._other
+        return {i for _, i in self._keys[lo:hi]} | self._other
+
+    def iter_from(self, after: Optional[Tuple[Any, int]] = None, descending: bool = False) -> Iterator[Tuple[Any, int]]:
+        """(valor, id) en orden, empezando estrictamente después de 'after'"""
+        keys = self._keys
+        if descending:
+            pos = len(keys) if after is None else bisect_left(keys, tuple(after))
+            for i in range(pos - 1, -1, -1):
+                yield keys[i]
+        else:
+            pos = 0 if after is None else bisect_right(keys, tuple(after))
+            for i in range(pos, len(keys)):
+                yield keys[i]
+
+
+class ListingIndex:
+    """
+    Índice compuesto (campo, orden): por cada valor de 'field' un SortedIndex
+    de 'order_by'. Un listado filtrado por igualdad en 'field' y ordenado por
+    'order_by' recorre solo la partición de ese valor, ya en orden.
+    """
+
+    kind = "listing"
+
+    def __init__(self, field: str, order_by: str):
+        self.field = field
+        self.order_by = order_by
+        self._parts: Dict[Any, SortedIndex] = {}
+
+    def add(self, record: Dict) -> None:
+        value = record.get(self.field)
+        if value is None or not _hashable(value):
+            return
+        part = self._parts.get(value)
+        if part is None:
+            part = self._parts[value] = SortedIndex(self.order_by)
+        part.add(record)
+
+    def remove(self, record: Dict) -> None:
+        value = record.get(self.field)
+        if value is None or not _hashable(value):
+            return
+        part = self._parts.get(value)
+        if part is None:
+            return
+        part.remove(record)
+        if not part._keys and not part._other:
+            del self._parts[value]
+
+    def clear(self) -> None:
+        self._parts = {}
+
+    def rebuild(self, records: List[Dict]) -> None:
+        groups: Dict[Any, List[Dict]] = {}
+        for record in records:
+            value = record.get(self.field)
+            if value is not None and _hashable(value):
+                groups.setdefault(value, []).append(record)
+        self._parts = {}
+        for value, group in groups.items():
+            part = self._parts[value] = SortedIndex(self.order_by)
+            part.rebuild(group)
+
+    def size(self, value: Any) -> int:
+        part = self._parts.get(value) if _hashable(value) else None
+        return len(part._keys) if part is not None else 0
+
+    def iter_from(self, value: Any, after: Optional[Tuple[Any, int]] = None,
+                  descending: bool = False) -> Iterator[Tuple[Any, int]]:
+        part = self._parts.get(value) if _hashable(value) else None
+        return part.iter_from(after, descending) if part is not None else iter(())
+
+
+INDEX_TYPES = {
+    HashIndex.kind: HashIndex,
+    SortedIndex.kind: SortedIndex,
+}
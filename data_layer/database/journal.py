@@ -0,0 +1,230 @@
+# data_layer/database/journal.py
+"""
+Persistencia por journal (append-only) para la base de datos en memoria.
+
+Cada mutación agrega una línea JSON a journal.log:
+    {"op": "put", "col": "users", "rec": {...}}   alta o modificación (registro completo)
+    {"op": "del", "col": "users", "id": 7}        borrado físico
+
+Al arrancar se carga snapshot.json y se reproduce el journal encima. La
+compactación vuelca el estado actual a un snapshot nuevo (escritura atómica
+con os.replace) y descarta el journal ya incluido en él.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class Journal:
+    SNAPSHOT_FILE = "snapshot.json"
+    JOURNAL_FILE = "journal.log"
+    # journal congelado durante una compactación en curso
+    ROTATED_FILE = "journal.log.1"
+
+    def __init__(
+        self,
+        data_dir: Path,
+        collections: List[str],
+        fsync: str = "always",
+        fsync_interval: float = 1.0,
+        compact_threshold: int = 10000,
+        compact_check_interval: float = 30.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política fsync desconocida: {fsync}")
+        self.data_dir = Path(data_dir)
+        self.collections = list(collections)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self.compact_check_interval = compact_check_interval
+
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._fh = None
+        self._entries = 0          # entradas en el journal actual
+        self._unsynced = False
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    # ----------------- CARGA -----------------
+    def load(self) -> Tuple[Dict[str, List[Dict]], Dict[str, int]]:
+        """Devuelve (colecciones, secuencias) a partir de snapshot + journal"""
+        data: Dict[str, Dict[int, Dict]] = {name: {} for name in self.collections}
+        sequences = {name: 0 for name in self.collections}
+
+        snap = self.data_dir / self.SNAPSHOT_FILE
+        if snap.exists():
+            with open(snap, "r", encoding="utf-8") as fh:
+                stored = json.load(fh)
+            for name in self.collections:
+                for rec in stored.get("collections", {}).get(name, []):
+                    data[name][rec["id"]] = rec
+                sequences[name] = int(stored.get("sequences", {}).get(name, 0))
+
+        self._entries = 0
+        for fname in (self.ROTATED_FILE, self.JOURNAL_FILE):
+            count = self._replay(self.data_dir / fname, data, sequences)
+            if fname == self.JOURNAL_FILE:
+                self._entries = count
+
+        for name in self.collections:
+            sequences[name] = max(sequences[name], max(data[name], default=0))
+        return {name: list(rows.values()) for name, rows in data.items()}, sequences
+
+    def _replay(self, path: Path, data: Dict[str, Dict[int, Dict]], sequences: Dict[str, int]) -> int:
+        if not path.exists():
+            return 0
+        count = 0
+        good_offset = 0
+        with open(path, "rb") as fh:
+            for line in fh:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("línea incompleta")
+                    entry = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    # última línea incompleta tras una caída: se descarta
+                    break
+                good_offset += len(line)
+                rows = data.get(entry.get("col"))
+                if rows is None:
+                    continue
+                if entry["op"] == "put":
+                    rec = entry["rec"]
+                    rows[rec["id"]] = rec
+                    sequences[entry["col"]] = max(sequences[entry["col"]], rec["id"])
+                elif entry["op"] == "del":
+                    rows.pop(entry["id"], None)
+                count += 1
+        if good_offset < path.stat().st_size:
+            # truncar para que las escrituras nuevas no queden pegadas a la basura
+            with open(path, "r+b") as fh:
+                fh.truncate(good_offset)
+        return count
+
+    # ----------------- ESCRITURA -----------------
+    def append_put(self, collection: str, record: Dict) -> None:
+        self._append({"op": "put", "col": collection, "rec": record})
+
+    def append_delete(self, collection: str, record_id: int) -> None:
+        self._append({"op": "del", "col": collection, "id": record_id})
+
+    def append_puts(self, collection: str, records: List[Dict]) -> None:
+        """Varias altas con una sola escritura y un solo fsync"""
+        self._append_many([{"op": "put", "col": collection, "rec": r} for r in records])
+
+    def _append(self, entry: Dict) -> None:
+        self._append_many([entry])
+
+    def _append_many(self, entries: List[Dict]) -> None:
+        data = "".join(
+            json.dumps(e, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            for e in entries
+        )
+        with self._lock:
+            fh = self._open()
+            fh.write(data)
+            fh.flush()
+            if self.fsync == "always":
+                os.fsync(fh.fileno())
+            else:
+                self._unsynced = True
+            self._entries += len(entries)
+
+    def _open(self):
+        if self._fh is None:
+            self._fh = open(self.data_dir / self.JOURNAL_FILE, "a", encoding="utf-8")
+        return self._fh
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._fh is not None and self._unsynced:
+                os.fsync(self._fh.fileno())
+                self._unsynced = False
+
+    # ----------------- COMPACTACIÓN -----------------
+    def compact(self, capture: Callable[[Callable[[], None]], Tuple[Dict[str, List[Dict]], Dict[str, int]]]) -> None:
+        """
+        Vuelca el estado actual a un snapshot nuevo. 'capture(rotate)' debe
+        llamar a rotate() y devolver (colecciones, secuencias) sin que entre
+        ambas cosas ocurran mutaciones (p. ej. bajo el lock de lectura de la DB):
+        así toda mutación posterior queda en el journal nuevo.
+        """
+        with self._compact_lock:
+            collections, sequences = capture(self._rotate)
+            payload = {"sequences": sequences, "collections": collections}
+            self._write_atomic(self.data_dir / self.SNAPSHOT_FILE, payload)
+            rotated = self.data_dir / self.ROTATED_FILE
+            if rotated.exists():
+                rotated.unlink()
+
+    def _rotate(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
+            current = self.data_dir / self.JOURNAL_FILE
+            rotated = self.data_dir / self.ROTATED_FILE
+            if current.exists() and not rotated.exists():
+                os.replace(current, rotated)
+            self._entries = 0
+            self._unsynced = False
+
+    def _write_atomic(self, path: Path, payload: Dict) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, ensure_ascii=False, separators=(",", ":"), default=str)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(self.data_dir, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def needs_compaction(self) -> bool:
+        return self._entries >= self.compact_threshold
+
+    # ----------------- HILO DE FONDO -----------------
+    def start_background(self, compactor: Callable[[], None]) -> None:
+        """Arranca el hilo que hace fsync periódico y compacta cuando corresponde"""
+        if self._worker is not None:
+            return
+
+        def run():
+            last_check = time.monotonic()
+            tick = min(self.fsync_interval, self.compact_check_interval)
+            while not self._stop.wait(tick):
+                if self.fsync == "interval":
+                    self.sync()
+                if time.monotonic() - last_check >= self.compact_check_interval:
+                    last_check = time.monotonic()
+                    if self.needs_compaction():
+                        compactor()
+
+        self._worker = threading.Thread(target=run, name="sgpi-journal", daemon=True)
+        self._worker.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+                if self.fsync != "never":
+                    os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
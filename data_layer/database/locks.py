@@ -0,0 +1,64 @@
+# data_layer/database/locks.py
+"""
+Lock lectores/escritor para la base de datos en memoria.
+"""
+
+from contextlib import contextmanager
+import threading
+
+
+class RWLock:
+    """
+    Permite muchos lectores concurrentes o un único escritor.
+
+    - Los lectores nuevos esperan si hay un escritor esperando, para que un
+      flujo continuo de lecturas no deje sin turno a las escrituras.
+    - El escritor puede volver a tomar el lock (escritura o lectura) desde el
+      mismo hilo. Las lecturas anidadas de un lector NO son reentrantes.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        if self._writer == threading.get_ident():
+            yield
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                self._writers_waiting += 1
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+                self._writers_waiting -= 1
+                self._writer = me
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._cond.notify_all()
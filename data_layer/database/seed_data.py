@@ -5,16 +5,55 @@ No incluyen 'id' para permitir autoincremento del Database
 """
 
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import json
 import random
-from business_logic.utils.password_utils import hash_password
+from business_logic.utils.password_utils import hash_passwords
+from config import settings
 
-def seed_users():
+# Hashes bcrypt precalculados de las contraseñas seed: {costo: {password: hash}}
+SEED_HASHES_FILE = Path(__file__).with_name("seed_password_hashes.json")
+
+def seed_passwords(n_docentes: int = 11):
+    return ['Admin123!', 'Gestor123!'] + [f'Docente{i}123!' for i in range(1, n_docentes + 1)]
+
+def seed_password_hashes(
+    passwords: Iterable[str],
+    rounds: Optional[int] = None,
+    use_fixture: bool = True,
+) -> Dict[str, str]:
+    """
+    Devuelve {password: hash}. Con use_fixture reutiliza los hashes
+    precalculados para ese costo; los que falten se calculan en paralelo.
+    """
+    rounds = rounds or settings.BCRYPT_ROUNDS
+    passwords = list(dict.fromkeys(passwords))
+    cached: Dict[str, str] = {}
+    if use_fixture and SEED_HASHES_FILE.exists():
+        stored = json.loads(SEED_HASHES_FILE.read_text(encoding="utf-8"))
+        cached = stored.get(str(rounds), {})
+    hashes = {p: cached[p] for p in passwords if p in cached}
+    hashes.update(hash_passwords([p for p in passwords if p not in hashes], rounds))
+    return hashes
+
+def write_seed_hashes(rounds: Optional[int] = None, n_docentes: int = 11) -> Path:
+    """Regenera el archivo de hashes precalculados para un costo dado"""
+    rounds = rounds or settings.BCRYPT_ROUNDS
+    stored = {}
+    if SEED_HASHES_FILE.exists():
+        stored = json.loads(SEED_HASHES_FILE.read_text(encoding="utf-8"))
+    stored[str(rounds)] = seed_password_hashes(seed_passwords(n_docentes), rounds, use_fixture=False)
+    SEED_HASHES_FILE.write_text(json.dumps(stored, indent=2), encoding="utf-8")
+    return SEED_HASHES_FILE
+
+def seed_users(n_docentes: int = 11, rounds: Optional[int] = None, use_fixture: bool = True):
     now = datetime.now()
     base = [
         {
             'username': 'admin',
             'email': 'admin@sgpi.edu',
-            'password_hash': hash_password('Admin123!'),
+            'password': 'Admin123!',
             'role': 'administrador',
             'full_name': 'Administrador del Sistema',
             'status': 'activo',
@@ -25,7 +64,7 @@ def seed_users():
         {
             'username': 'gestor_ingenieria',
             'email': 'gestor.ingenieria@sgpi.edu',
-            'password_hash': hash_password('Gestor123!'),
+            'password': 'Gestor123!',
             'role': 'gestor',
             'full_name': 'María González',
             'status': 'activo',
@@ -36,11 +75,11 @@ def seed_users():
     ]
 
     # Generar docentes adicionales
-    for i in range(1, 12):  # 11 docentes => total usuarios ~13
+    for i in range(1, n_docentes + 1):  # 11 docentes por defecto => total usuarios ~13
         base.append({
             'username': f'docente{i}',
             'email': f'docente{i}@sgpi.edu',
-            'password_hash': hash_password(f'Docente{i}123!'),
+            'password': f'Docente{i}123!',
             'role': 'docente',
             'full_name': f'Docente Ejemplo {i}',
             'status': 'activo',
@@ -54,6 +93,11 @@ def seed_users():
             'last_login': (now - timedelta(days=random.randint(0, 10))).isoformat() if random.random() > 0.3 else None
         })
 
+    # hashear todas las contraseñas juntas (fixture + cálculo en paralelo)
+    hashes = seed_password_hashes((u['password'] for u in base), rounds, use_fixture)
+    for u in base:
+        u['password_hash'] = hashes[u.pop('password')]
+
     return base
 
 def seed_convocatorias():
@@ -102,3 +146,10 @@ def seed_solicitudes():
             'fecha_registro': datetime.now().isoformat()
         })
     return solicitudes
+
+
+if __name__ == "__main__":
+    # python -m data_layer.database.seed_data [costo]
+    import sys
+    out = write_seed_hashes(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(f"Hashes seed guardados en {out}")
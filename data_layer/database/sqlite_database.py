@@ -0,0 +1,703 @@
+# data_layer/database/sqlite_database.py
+"""
+Motor SQLite con la misma API que Database, para despliegues con varios
+procesos (prefork): todos los workers comparten el mismo archivo.
+
+Cada registro se guarda como JSON en la columna 'data'; los campos que se
+filtran a menudo tienen índices de expresión sobre json_extract, que SQLite
+usa cuando la consulta repite exactamente la misma expresión.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from data_layer.database.database import (
+    DEFAULT_INDEXES, FULLTEXT_FIELDS, LISTING_INDEXES, UNIQUE_FIELDS, DatabaseSnapshot,
+)
+from data_layer.database.fulltext import analyze
+from data_layer.database.indexes import is_operator_condition, matches
+
+_FIELD_RE = re.compile(r"^\w+$")
+_SQL_OPERATORS = {"$eq": "=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+# filas por índice que lee ANALYZE y altas masivas que lo disparan
+ANALYSIS_LIMIT = 10000
+ANALYZE_AFTER_ROWS = 1000
+
+
+def _expr(field: str) -> str:
+    # expresión literal: debe coincidir con la del índice para que se use
+    return f"json_extract(data, '$.{field}')"
+
+
+def _dumps(record: Dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class SQLiteDatabase:
+    def __init__(self, path: str = "data/sgpi.sqlite3", busy_timeout_ms: int = 5000, pool_size: int = 8):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        # pool acotado: cada operación toma una conexión y la devuelve. El
+        # servidor de desarrollo crea un hilo por request; con una conexión
+        # por hilo se acumulaban sin límite. None = hueco aún sin conexión.
+        self.pool_size = pool_size
+        self._pool = self._new_pool()
+        # la conexión que el hilo tiene tomada (las llamadas anidadas la reusan)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+        # mismas notificaciones que Database (solo mutaciones de este proceso)
+        self._listeners: List[Callable[[str, str, Dict], None]] = []
+        self._create_schema()
+
+    # ----------------- CONEXIONES -----------------
+    def _new_pool(self) -> "queue.LifoQueue[Optional[sqlite3.Connection]]":
+        pool: "queue.LifoQueue[Optional[sqlite3.Connection]]" = queue.LifoQueue()
+        for _ in range(self.pool_size):
+            pool.put(None)
+        return pool
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,      # transacciones explícitas
+            cached_statements=256,     # caché de sentencias preparadas
+            check_same_thread=False,   # pasa de un hilo a otro a través del pool
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        with self._conn_lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # anidada dentro de otra operación del mismo hilo (p. ej. una
+            # transacción de escritura): misma conexión, misma transacción
+            yield conn
+            return
+        pool = self._pool
+        try:
+            conn = pool.get(timeout=self.busy_timeout_ms / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError("No hay conexiones libres en el pool") from None
+        try:
+            if conn is None:
+                conn = self._connect()
+            self._local.conn = conn
+            yield conn
+        finally:
+            self._local.conn = None
+            pool.put(conn)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE toma el lock de escritura al inicio y evita
+        # deadlocks al promover una lectura a escritura entre procesos
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _create_schema(self) -> None:
+        with self._write() as conn:
+            for name in UNIQUE_FIELDS:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+                )
+                fields = list(UNIQUE_FIELDS[name]) + [f for f, _ in DEFAULT_INDEXES.get(name, [])]
+                for field in fields:
+                    self._create_index(conn, name, field)
+                for field, order_by in LISTING_INDEXES.get(name, ()):
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{name}_{field}_{order_by} "
+                        f"ON {name}({_expr(field)}, {_expr(order_by)}, id)"
+                    )
+                if name in FULLTEXT_FIELDS:
+                    self._create_fulltext(conn, name)
+            # versiones compartidas por todos los workers; id 0 = la colección.
+            # La fila '_epoch' identifica el archivo (si se recrea, cambia).
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS versions ("
+                "collection TEXT NOT NULL, id INTEGER NOT NULL, "
+                "version INTEGER NOT NULL, modified REAL NOT NULL, "
+                "PRIMARY KEY (collection, id)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO versions VALUES ('_epoch', 0, ?, ?)",
+                (int.from_bytes(os.urandom(4), "big"), time.time()),
+            )
+        with self._conn() as conn:
+            self._epoch = format(conn.execute(
+                "SELECT version FROM versions WHERE collection = '_epoch'"
+            ).fetchone()[0], "08x")
+            # sin estadísticas el planificador elige mal entre índices compuestos
+            # con igualdad (p. ej. estado en lugar de convocatoria_id)
+            analyzed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+        if not analyzed:
+            self.analyze()
+
+    def analyze(self) -> None:
+        """Actualiza las estadísticas de los índices (muestreo acotado)"""
+        with self._write() as conn:
+            conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            conn.execute("ANALYZE")
+
+    def _create_index(self, conn: sqlite3.Connection, name: str, field: str) -> None:
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{name}_{field} ON {name}({_expr(field)})"
+        )
+
+    def _create_fulltext(self, conn: sqlite3.Connection, name: str) -> None:
+        """
+        Tabla FTS5 con el texto ya analizado (sin tildes, con stemming): la
+        misma normalización que el índice en memoria. rowid = id del registro.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (f"fts_{name}",)
+        ).fetchone()
+        if exists:
+            return
+        columns = ", ".join(FULLTEXT_FIELDS[name])
+        conn.execute(f"CREATE VIRTUAL TABLE fts_{name} USING fts5({columns})")
+        # base existente: indexar lo que ya hay
+        self._fts_put(conn, name, self._all(name, conn), replace=False)
+
+    def _fts_put(self, conn: sqlite3.Connection, name: str, records: List[Dict], replace: bool = True) -> None:
+        if name not in FULLTEXT_FIELDS or not records:
+            return
+        fields = list(FULLTEXT_FIELDS[name])
+        if replace:
+            self._fts_delete(conn, name, [r["id"] for r in records])
+        conn.executemany(
+            f"INSERT INTO fts_{name}(rowid, {', '.join(fields)}) "
+            f"VALUES (?{', ?' * len(fields)})",
+            [[r["id"]] + [" ".join(analyze(r.get(f))) for f in fields] for r in records],
+        )
+
+    def _fts_delete(self, conn: sqlite3.Connection, name: str, record_ids: List[int]) -> None:
+        if name in FULLTEXT_FIELDS:
+            conn.executemany(f"DELETE FROM fts_{name} WHERE rowid = ?", [(i,) for i in record_ids])
+
+    def create_index(self, collection_name: str, field: str, kind: str = "hash") -> None:
+        """Crea un índice de expresión (B-tree: sirve para igualdad y rangos)"""
+        if collection_name not in UNIQUE_FIELDS:
+            raise ValueError(f"Colección desconocida: {collection_name}")
+        if not _FIELD_RE.match(field):
+            raise ValueError(f"Nombre de campo inválido: {field}")
+        with self._write() as conn:
+            self._create_index(conn, collection_name, field)
+
+    # ----------------- NOTIFICACIONES -----------------
+    def add_listener(self, fn: Callable[[str, str, Dict], None]) -> None:
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn: Callable[[str, str, Dict], None]) -> None:
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _notify(self, name: str, op: str, record: Dict) -> None:
+        for fn in self._listeners:
+            fn(name, op, record)
+
+    # ----------------- VERSIONES -----------------
+    _BUMP_SQL = (
+        "INSERT INTO versions VALUES (?, ?, 1, ?) ON CONFLICT(collection, id) "
+        "DO UPDATE SET version = version + 1, modified = excluded.modified"
+    )
+
+    def _bump(self, conn: sqlite3.Connection, name: str, record_ids: List[int], deleted: bool = False) -> None:
+        """Sube la versión de la colección y de los registros en la misma transacción"""
+        now = time.time()
+        if deleted:
+            conn.executemany(
+                "DELETE FROM versions WHERE collection = ? AND id = ?",
+                [(name, i) for i in record_ids],
+            )
+        else:
+            conn.executemany(self._BUMP_SQL, [(name, i, now) for i in record_ids])
+        conn.execute(self._BUMP_SQL, (name, 0, now))
+
+    def _version_row(self, name: str, record_id: int) -> Optional[Tuple[int, float]]:
+        with self._conn() as conn:
+            return conn.execute(
+                "SELECT version, modified FROM versions WHERE collection = ? AND id = ?",
+                (name, record_id),
+            ).fetchone()
+
+    def collection_version(self, name: str) -> Tuple[str, float]:
+        row = self._version_row(name, 0) or (0, 0.0)
+        return f"{self._epoch}.{row[0]}", row[1]
+
+    def record_version(self, name: str, record_id: int) -> Optional[Tuple[str, float]]:
+        row = self._version_row(name, record_id)
+        if row is None:
+            return None
+        return f"{self._epoch}.{row[0]}", row[1]
+
+    # ----------------- GENÉRICOS -----------------
+    def _row(self, name: str, row) -> Optional[Dict]:
+        if row is None:
+            return None
+        record = json.loads(row[1])
+        record["id"] = row[0]
+        return record
+
+    def _get(self, name: str, record_id: int) -> Optional[Dict]:
+        with self._conn() as conn:
+            row = conn.execute(
+                f"SELECT id, data FROM {name} WHERE id = ?", (record_id,)
+            ).fetchone()
+        return self._row(name, row)
+
+    def _find_unique(self, name: str, field: str, value: Any) -> Optional[Dict]:
+        # si hubiera duplicados gana el más reciente, igual que en memoria
+        with self._conn() as conn:
+            row = conn.execute(
+                f"SELECT id, data FROM {name} WHERE {_expr(field)} = ? ORDER BY id DESC LIMIT 1",
+                (value,),
+            ).fetchone()
+        return self._row(name, row)
+
+    def _insert(self, conn: sqlite3.Connection, name: str, record: Dict) -> Dict:
+        record.pop("id", None)
+        cur = conn.execute(f"INSERT INTO {name}(data) VALUES (?)", (_dumps(record),))
+        record["id"] = cur.lastrowid
+        self._bump(conn, name, [record["id"]])
+        self._fts_put(conn, name, [record], replace=False)
+        return record
+
+    def _insert_many(self, name: str, records: List[Dict], on_id=None) -> List[Dict]:
+        """Alta masiva en una transacción: ids reservados de una vez y executemany"""
+        if not records:
+            return []
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = ?", (name,)
+            ).fetchone()
+            first = (row[0] if row else 0) + 1
+            for i, record in enumerate(records):
+                record["id"] = first + i
+                if on_id:
+                    on_id(record)
+            conn.executemany(
+                f"INSERT INTO {name}(id, data) VALUES (?, ?)",
+                [(r["id"], _dumps({k: v for k, v in r.items() if k != "id"})) for r in records],
+            )
+            self._bump(conn, name, [r["id"] for r in records])
+            self._fts_put(conn, name, records, replace=False)
+        if len(records) >= ANALYZE_AFTER_ROWS:
+            # una carga masiva cambia la distribución de los índices
+            self.analyze()
+        for record in records:
+            self._notify(name, "insert", record)
+        return records
+
+    def _update(self, name: str, record_id: int, updates: Dict,
+                expected: Optional[Dict] = None) -> Optional[Dict]:
+        with self._write() as conn:
+            record = self._row(name, conn.execute(
+                f"SELECT id, data FROM {name} WHERE id = ?", (record_id,)
+            ).fetchone())
+            if not record:
+                return None
+            # BEGIN IMMEDIATE: ningún otro proceso escribe entre leer y comparar
+            if expected and any(record.get(k) != v for k, v in expected.items()):
+                return None
+            for k, v in updates.items():
+                if k not in ("id", "created_at"):
+                    record[k] = v
+            record["updated_at"] = datetime.now().isoformat()
+            conn.execute(f"UPDATE {name} SET data = ? WHERE id = ?", (_dumps(record), record_id))
+            self._bump(conn, name, [record_id])
+            if any(f in updates for f in FULLTEXT_FIELDS.get(name, ())):
+                self._fts_put(conn, name, [record])
+        self._notify(name, "update", record)
+        return record
+
+    def _delete(self, name: str, record_id: int) -> bool:
+        with self._write() as conn:
+            record = self._row(name, conn.execute(
+                f"SELECT id, data FROM {name} WHERE id = ?", (record_id,)
+            ).fetchone())
+            if not record:
+                return False
+            conn.execute(f"DELETE FROM {name} WHERE id = ?", (record_id,))
+            self._bump(conn, name, [record_id], deleted=True)
+            self._fts_delete(conn, name, [record_id])
+        self._notify(name, "delete", record)
+        return True
+
+    def _all(self, name: str, conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
+        if conn is None:
+            with self._conn() as conn:
+                return self._all(name, conn)
+        return [self._row(name, r) for r in conn.execute(f"SELECT id, data FROM {name} ORDER BY id")]
+
+    # Compatibilidad con el código que lee db.users / db.convocatorias / db.solicitudes
+    @property
+    def users(self) -> List[Dict]:
+        return self._all("users")
+
+    @property
+    def convocatorias(self) -> List[Dict]:
+        return self._all("convocatorias")
+
+    @property
+    def solicitudes(self) -> List[Dict]:
+        return self._all("solicitudes")
+
+    # ----------------- USERS -----------------
+    def add_user(self, user_data: Dict) -> Dict:
+        user = dict(user_data)
+        now = datetime.now().isoformat()
+        user.setdefault("created_at", now)
+        user.setdefault("updated_at", now)
+        user.setdefault("status", "activo")
+        with self._write() as conn:
+            user = self._insert(conn, "users", user)
+        self._notify("users", "insert", user)
+        return user
+
+    def add_users(self, users: Iterable[Dict]) -> List[Dict]:
+        now = datetime.now().isoformat()
+        records = []
+        for data in users:
+            user = dict(data)
+            user.setdefault("created_at", now)
+            user.setdefault("updated_at", now)
+            user.setdefault("status", "activo")
+            records.append(user)
+        return self._insert_many("users", records)
+
+    def get_user_by_id(self, user_id: int) -> Optional[Dict]:
+        return self._get("users", user_id)
+
+    def find_user_by_username(self, username: str) -> Optional[Dict]:
+        return self._find_unique("users", "username", username)
+
+    def find_user_by_email(self, email: str) -> Optional[Dict]:
+        return self._find_unique("users", "email", email)
+
+    def update_user(self, user_id: int, updates: Dict, expected: Optional[Dict] = None) -> Optional[Dict]:
+        return self._update("users", user_id, updates, expected)
+
+    def delete_user(self, user_id: int, soft_delete: bool = True) -> bool:
+        if soft_delete:
+            return self._update("users", user_id, {"status": "inactivo"}) is not None
+        return self._delete("users", user_id)
+
+    # ----------------- CONVOCATORIAS -----------------
+    def add_convocatoria(self, conv_data: Dict) -> Dict:
+        conv = dict(conv_data)
+        now = datetime.now().isoformat()
+        conv.setdefault("created_at", now)
+        conv.setdefault("updated_at", now)
+        with self._write() as conn:
+            conv = self._insert(conn, "convocatorias", conv)
+        self._notify("convocatorias", "insert", conv)
+        return conv
+
+    def add_convocatorias(self, convocatorias: Iterable[Dict]) -> List[Dict]:
+        now = datetime.now().isoformat()
+        records = []
+        for data in convocatorias:
+            conv = dict(data)
+            conv.setdefault("created_at", now)
+            conv.setdefault("updated_at", now)
+            records.append(conv)
+        return self._insert_many("convocatorias", records)
+
+    def get_convocatoria_by_id(self, conv_id: int) -> Optional[Dict]:
+        return self._get("convocatorias", conv_id)
+
+    # alias usado por las rutas
+    get_convocatoria = get_convocatoria_by_id
+
+    def update_convocatoria(self, id, updates):
+        return self._update("convocatorias", id, updates)
+
+    def delete_convocatoria(self, id):
+        return self._delete("convocatorias", id)
+
+    # ----------------- SOLICITUDES -----------------
+    def add_solicitud(self, sol_data: Dict) -> Dict:
+        sol = dict(sol_data)
+        now = datetime.now().isoformat()
+        sol.setdefault("created_at", now)
+        sol.setdefault("updated_at", now)
+        with self._write() as conn:
+            sol = self._insert(conn, "solicitudes", sol)
+            # el código depende del id asignado: se completa en la misma transacción
+            if "codigo" not in sol:
+                tipo = (sol.get("tipo") or "XX").upper()[:2]
+                sol["codigo"] = f"{tipo}-{datetime.now().year}-{sol['id']:04d}"
+                conn.execute("UPDATE solicitudes SET data = ? WHERE id = ?", (_dumps(sol), sol["id"]))
+                self._fts_put(conn, "solicitudes", [sol])
+        self._notify("solicitudes", "insert", sol)
+        return sol
+
+    def add_solicitudes(self, solicitudes: Iterable[Dict]) -> List[Dict]:
+        now = datetime.now().isoformat()
+        year = datetime.now().year
+        records = []
+        for data in solicitudes:
+            sol = dict(data)
+            sol.setdefault("created_at", now)
+            sol.setdefault("updated_at", now)
+            records.append(sol)
+
+        def set_codigo(sol):
+            if "codigo" not in sol:
+                tipo = (sol.get("tipo") or "XX").upper()[:2]
+                sol["codigo"] = f"{tipo}-{year}-{sol['id']:04d}"
+
+        return self._insert_many("solicitudes", records, on_id=set_codigo)
+
+    def get_solicitud_by_id(self, sol_id: int) -> Optional[Dict]:
+        return self._get("solicitudes", sol_id)
+
+    def find_solicitud_by_codigo(self, codigo: str) -> Optional[Dict]:
+        return self._find_unique("solicitudes", "codigo", codigo)
+
+    def update_solicitud(self, sol_id: int, updates: Dict) -> Optional[Dict]:
+        return self._update("solicitudes", sol_id, updates)
+
+    def delete_solicitud(self, sol_id: int) -> bool:
+        return self._delete("solicitudes", sol_id)
+
+    # ----------------- STATS & SEARCH -----------------
+    def get_stats(self) -> Dict:
+        with self._conn() as conn:
+            counts = {
+                name: conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                for name in UNIQUE_FIELDS
+            }
+        return {
+            "total_users": counts["users"],
+            "total_convocatorias": counts["convocatorias"],
+            "total_solicitudes": counts["solicitudes"],
+            "last_updated": datetime.now().isoformat()
+        }
+
+    def _where(self, query: Dict):
+        """Traduce la consulta a SQL; lo que no se puede traducir se filtra en Python"""
+        clauses, params, residual = [], [], {}
+        for field, cond in query.items():
+            ops = cond if is_operator_condition(cond) else {"$eq": cond}
+            if not _FIELD_RE.match(field) or any(
+                isinstance(v, (dict, list)) for v in ops.values()
+            ):
+                residual[field] = cond
+                continue
+            expr = "id" if field == "id" else _expr(field)
+            for op, value in ops.items():
+                if value is None:
+                    if op != "$eq":
+                        residual[field] = cond
+                        continue
+                    clauses.append(f"{expr} IS NULL")
+                else:
+                    clauses.append(f"{expr} {_SQL_OPERATORS[op]} ?")
+                    params.append(value)
+        where = " AND ".join(clauses) if clauses else "1"
+        return where, params, residual
+
+    def search(self, collection_name: str, query: Dict) -> List[Dict]:
+        if collection_name not in UNIQUE_FIELDS:
+            return []
+        where, params, residual = self._where(query)
+        # sin ORDER BY: con él SQLite prefiere recorrer por rowid en vez de
+        # usar el índice de rango; se ordena el resultado (ya filtrado) aquí
+        with self._conn() as conn:
+            rows = sorted(conn.execute(
+                f"SELECT id, data FROM {collection_name} WHERE {where}", params
+            ))
+        results = (self._row(collection_name, r) for r in rows)
+        if residual:
+            return [r for r in results if matches(r, residual)]
+        return list(results)
+
+    def search_page(
+        self,
+        collection_name: str,
+        query: Dict,
+        order_by: str = "id",
+        descending: bool = False,
+        after: Optional[tuple] = None,
+        limit: int = 50,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Dict]:
+        """Misma semántica que Database.search_page: ORDER BY + LIMIT con keyset"""
+        if collection_name not in UNIQUE_FIELDS or limit <= 0 or not _FIELD_RE.match(order_by):
+            return []
+        where, params, residual = self._where(query)
+        expr = "id" if order_by == "id" else _expr(order_by)
+        direction = "DESC" if descending else "ASC"
+        cmp = "<" if descending else ">"
+        results: List[Dict] = []
+        # con filtros en Python una tanda puede no alcanzar: se sigue desde
+        # la última clave vista
+        last = tuple(after) if after is not None else None
+        batch = limit if not (residual or predicate) else limit * 4
+        while len(results) < limit:
+            sql = f"SELECT id, data, {expr} FROM {collection_name} WHERE {where} AND {expr} IS NOT NULL"
+            args = list(params)
+            if last is not None:
+                sql += f" AND ({expr}, id) {cmp} (?, ?)"
+                args.extend(last)
+            sql += f" ORDER BY {expr} {direction}, id {direction} LIMIT ?"
+            args.append(batch)
+            with self._conn() as conn:
+                rows = conn.execute(sql, args).fetchall()
+            for row in rows:
+                last = (row[2], row[0])
+                record = self._row(collection_name, row[:2])
+                if residual and not matches(record, residual):
+                    continue
+                if predicate is not None and not predicate(record):
+                    continue
+                results.append(record)
+                if len(results) >= limit:
+                    break
+            if len(rows) < batch:
+                break
+        return results
+
+    def iter_search(
+        self,
+        collection_name: str,
+        query: Optional[Dict] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Dict]:
+        """Misma semántica que Database.iter_search: tandas por keyset sobre id"""
+        after = None
+        while True:
+            page = self.search_page(
+                collection_name, query or {}, after=after, limit=batch_size, predicate=predicate
+            )
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = (page[-1]["id"], page[-1]["id"])
+
+    def _fts_query(self, text: str) -> Optional[str]:
+        # cada término exacto o como prefijo ("t"*), todos obligatorios
+        terms = list(dict.fromkeys(analyze(text)))
+        return " AND ".join(f'"{t}"*' for t in terms) if terms else None
+
+    def text_search(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int = 20,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[Tuple[Dict, float]]:
+        """Misma interfaz que Database.text_search; ranking bm25 de FTS5"""
+        query = self._fts_query(text)
+        if collection_name not in FULLTEXT_FIELDS or query is None or limit <= 0:
+            return []
+        weights = ", ".join(str(w) for w in FULLTEXT_FIELDS[collection_name].values())
+        sql = (
+            f"SELECT c.id, c.data, bm25(fts_{collection_name}, {weights}) AS rank "
+            f"FROM fts_{collection_name} JOIN {collection_name} c ON c.id = fts_{collection_name}.rowid "
+            f"WHERE fts_{collection_name} MATCH ? ORDER BY rank, c.id LIMIT ? OFFSET ?"
+        )
+        results: List[Tuple[Dict, float]] = []
+        batch = limit if predicate is None else limit * 4
+        offset = 0
+        while len(results) < limit:
+            with self._conn() as conn:
+                rows = conn.execute(sql, (query, batch, offset)).fetchall()
+            for row in rows:
+                record = self._row(collection_name, row[:2])
+                if predicate is None or predicate(record):
+                    results.append((record, -row[2]))
+                    if len(results) >= limit:
+                        break
+            if len(rows) < batch:
+                break
+            offset += batch
+        return results
+
+    def text_match_ids(self, collection_name: str, text: str) -> set:
+        query = self._fts_query(text)
+        if collection_name not in FULLTEXT_FIELDS or query is None:
+            return set()
+        with self._conn() as conn:
+            return {r[0] for r in conn.execute(
+                f"SELECT rowid FROM fts_{collection_name} WHERE fts_{collection_name} MATCH ?", (query,)
+            )}
+
+    def distinct(self, collection_name: str, field: str) -> List:
+        if collection_name not in UNIQUE_FIELDS or not _FIELD_RE.match(field):
+            return []
+        with self._conn() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT {_expr(field)} FROM {collection_name} WHERE {_expr(field)} IS NOT NULL"
+            ).fetchall()
+        return sorted((r[0] for r in rows), key=str)
+
+    def explain(self, collection_name: str, query: Dict) -> Dict:
+        """Plan de SQLite (EXPLAIN QUERY PLAN) para la consulta"""
+        if collection_name not in UNIQUE_FIELDS:
+            return {"collection": collection_name, "strategy": "none"}
+        where, params, residual = self._where(query)
+        with self._conn() as conn:
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id, data FROM {collection_name} WHERE {where}",
+                params,
+            ).fetchall()
+        details = [row[-1] for row in plan]
+        return {
+            "collection": collection_name,
+            "strategy": "index" if any("USING" in d for d in details) else "scan",
+            "plan": details,
+            "residual": list(residual),
+        }
+
+    def snapshot(self) -> DatabaseSnapshot:
+        """Foto consistente: las tres lecturas ocurren en una sola transacción WAL"""
+        with self._conn() as conn:
+            conn.execute("BEGIN")
+            try:
+                collections = {name: self._all(name, conn) for name in UNIQUE_FIELDS}
+            finally:
+                conn.execute("COMMIT")
+        return DatabaseSnapshot(collections)
+
+    # ----------------- CICLO DE VIDA -----------------
+    def flush(self) -> None:
+        """Las escrituras ya son durables al hacer COMMIT; se vuelca el WAL"""
+        with self._conn() as conn:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        with self._conn_lock:
+            connections, self._connections = self._connections, []
+            # si se vuelve a usar, abre conexiones nuevas
+            self._pool = self._new_pool()
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,281 @@
+# data_layer/models/auditoria.py
+"""
+Bitácora de auditoría asíncrona.
+
+Cada cambio de convocatorias y solicitudes (o de cualquier colección
+registrada) genera un AuditEvent. El hilo que hace el cambio solo lo encola y,
+si entró en la cola, lo indexa en memoria. Un hilo de fondo lo escribe después por lotes en un
+archivo JSONL append-only que rota por tamaño:
+    auditoria.log, auditoria.log.1, ..., auditoria.log.N
+
+Cola llena:
+    overflow="drop"   el evento se descarta y se cuenta en stats()["dropped"]
+                      (la request nunca espera)
+    overflow="block"  se espera hasta block_timeout segundos y luego se descarta
+
+Con attach(db) los eventos salen de las notificaciones de la base, que se
+emiten dentro de su lock de escritura. Por eso "block" frena también a los
+demás escritores mientras el disco no da abasto.
+
+close() (registrado con atexit en app.py) vacía la cola antes de salir.
+"""
+
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import queue
+import threading
+import time
+
+OVERFLOW_POLICIES = ("drop", "block")
+_STOP = object()
+
+
+class AuditEvent:
+    __slots__ = ("ts", "entity", "entity_id", "action", "user_id", "data")
+
+    def __init__(self, entity: str, entity_id: Any, action: str,
+                 user_id: Optional[int] = None, data: Optional[Dict] = None,
+                 ts: Optional[float] = None):
+        self.ts = time.time() if ts is None else ts
+        self.entity = entity
+        self.entity_id = entity_id
+        self.action = action
+        self.user_id = user_id
+        self.data = data
+
+    def to_dict(self) -> Dict:
+        return {
+            "ts": self.ts,
+            "entity": self.entity,
+            "entity_id": self.entity_id,
+            "action": self.action,
+            "user_id": self.user_id,
+            "data": self.data,
+        }
+
+    def __repr__(self) -> str:
+        return f"<AuditEvent {self.action} {self.entity}#{self.entity_id}>"
+
+
+class AuditLog:
+    FILE_NAME = "auditoria.log"
+
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 5,
+        overflow: str = "drop",
+        block_timeout: float = 0.5,
+        recent_per_entity: int = 50,
+        max_entities: int = 10000,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de desborde desconocida: {overflow}")
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.recent_per_entity = recent_per_entity
+        self.max_entities = max_entities
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        # (entidad, id) -> últimos eventos; LRU acotado por max_entities
+        self._recent: "OrderedDict[Tuple[str, Any], Deque[AuditEvent]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fh = None
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._worker: Optional[threading.Thread] = None
+        self._detach: List[Callable[[], None]] = []
+
+        if self.log_dir is not None:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._worker = threading.Thread(target=self._run, name="sgpi-auditoria", daemon=True)
+            self._worker.start()
+
+    # ----------------- ENCOLAR -----------------
+    def record(self, entity: str, entity_id: Any, action: str,
+               user_id: Optional[int] = None, data: Optional[Dict] = None) -> bool:
+        """Registra un evento; devuelve False si se descartó por cola llena"""
+        event = AuditEvent(entity, entity_id, action, user_id, data)
+        if self._worker is None:
+            self._index(event)
+            return True
+        try:
+            if self.overflow == "block":
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        with self._lock:
+            self._enqueued += 1
+        # solo lo que llegó a la cola: events_for no muestra descartados
+        self._index(event)
+        return True
+
+    def _index(self, event: AuditEvent) -> None:
+        key = (event.entity, event.entity_id)
+        with self._lock:
+            events = self._recent.get(key)
+            if events is None:
+                events = self._recent[key] = deque(maxlen=self.recent_per_entity)
+                if len(self._recent) > self.max_entities:
+                    self._recent.popitem(last=False)
+            else:
+                self._recent.move_to_end(key)
+            events.append(event)
+
+    def attach(self, db, collections: Iterable[str] = ("convocatorias", "solicitudes"),
+               actor: Optional[Callable[[], Optional[int]]] = None) -> None:
+        """
+        Audita las mutaciones de 'collections' usando las notificaciones de
+        la base. actor() devuelve el id del usuario que hace el cambio.
+        """
+        watched = frozenset(collections)
+
+        def listener(name: str, op: str, record: Dict) -> None:
+            if name in watched:
+                # los registros de la base no se modifican en el lugar
+                self.record(name, record.get("id"), op, actor() if actor else None, record)
+
+        db.add_listener(listener)
+        self._detach.append(lambda: db.remove_listener(listener))
+
+    # ----------------- CONSULTA -----------------
+    def events_for(self, entity: str, entity_id: Any, limit: int = 50) -> List[Dict]:
+        """Eventos recientes de una entidad, del más nuevo al más viejo"""
+        with self._lock:
+            events = list(self._recent.get((entity, entity_id), ()))
+        return [e.to_dict() for e in reversed(events[-limit:])] if limit else []
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "tracked_entities": len(self._recent),
+            }
+
+    # ----------------- ESCRITURA -----------------
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            if first is _STOP:
+                stop = True
+            else:
+                batch.append(first)
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    self._queue.task_done()
+                    continue
+                batch.append(item)
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                for _ in range(len(batch) + (first is _STOP)):
+                    self._queue.task_done()
+
+    def _write(self, batch: List[AuditEvent]) -> None:
+        data = "".join(
+            json.dumps(e.to_dict(), ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            for e in batch
+        )
+        try:
+            fh = self._open()
+            fh.write(data)
+            fh.flush()
+            if fh.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            with self._lock:
+                self._errors += 1
+            return
+        with self._lock:
+            self._written += len(batch)
+
+    def _open(self):
+        if self._fh is None:
+            self._fh = open(self.log_dir / self.FILE_NAME, "a", encoding="utf-8")
+        return self._fh
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        self._fh = None
+        base = self.log_dir / self.FILE_NAME
+        for i in range(self.backups - 1, 0, -1):
+            src = base.with_name(f"{self.FILE_NAME}.{i}")
+            if src.exists():
+                os.replace(src, base.with_name(f"{self.FILE_NAME}.{i + 1}"))
+        if self.backups > 0:
+            os.replace(base, base.with_name(f"{self.FILE_NAME}.1"))
+        else:
+            base.unlink()
+
+    # ----------------- CIERRE -----------------
+    def flush(self) -> None:
+        """Espera a que todo lo encolado esté escrito"""
+        if self._worker is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        for detach in self._detach:
+            detach()
+        self._detach = []
+        if self._worker is not None:
+            # put bloqueante: el sentinel no puede perderse con la cola llena
+            self._queue.put(_STOP)
+            self._worker.join()
+            self._worker = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+_audit_log: Optional[AuditLog] = None
+_audit_lock = threading.Lock()
+
+def get_audit_log() -> AuditLog:
+    global _audit_log
+    if _audit_log is None:
+        with _audit_lock:
+            if _audit_log is None:
+                from config import settings
+                _audit_log = AuditLog(
+                    log_dir=settings.AUDIT_DIR if settings.AUDIT_PERSIST else None,
+                    max_queue=settings.AUDIT_QUEUE_SIZE,
+                    batch_size=settings.AUDIT_BATCH_SIZE,
+                    flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+                    max_bytes=settings.AUDIT_MAX_BYTES,
+                    backups=settings.AUDIT_BACKUPS,
+                    overflow=settings.AUDIT_OVERFLOW,
+                )
+    return _audit_log
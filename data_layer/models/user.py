@@ -1,7 +1,8 @@
+from collections import deque
 from datetime import datetime, date
 from enum import Enum
-from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field, fields
+from typing import Optional, List, Deque, Dict, Any
 import hashlib
 import uuid
 
@@ -27,7 +28,7 @@ class UserDepartment(Enum):
     FACULTAD_CIENCIAS = 'facultad_ciencias'
     ADMINISTRACION = 'administracion'
 
-@dataclass
+@dataclass(slots=True)
 class UserProfile:
     """Perfil extendido del usuario"""
     cedula: Optional[str] = None
@@ -35,14 +36,15 @@ class UserProfile:
     direccion: Optional[str] = None
     especialidad: Optional[str] = None
     def to_dict(self):
-        return {k: v.isoformat() 
-                if isinstance(v, date) 
-                else v 
-                for k, 
-                v in asdict(self).items() 
-                if v is not None}
+        # lista de campos precalculada: sin la copia recursiva de asdict
+        out = {}
+        for k in _PROFILE_FIELDS:
+            v = getattr(self, k)
+            if v is not None:
+                out[k] = v.isoformat() if isinstance(v, date) else v
+        return out
 
-@dataclass
+@dataclass(slots=True)
 class UserPermissions:
     """Permisos específicos del usuario"""
     # Módulos de acceso
@@ -61,9 +63,93 @@ class UserPermissions:
     puede_ver_todas_solicitudes: bool = False
     
     def to_dict(self):
-        return asdict(self)
+        return {k: getattr(self, k) for k in PERMISSION_NAMES}
 
-@dataclass
+# ============ TABLA DE PERMISOS COMPILADA ============
+# Cada permiso de UserPermissions es un bit. La máscara de cada rol se calcula
+# una sola vez al importar; comprobar un permiso es un AND de enteros.
+
+_PROFILE_FIELDS = tuple(f.name for f in fields(UserProfile))
+PERMISSION_NAMES = tuple(f.name for f in fields(UserPermissions))
+PERMISSION_BITS = {name: 1 << i for i, name in enumerate(PERMISSION_NAMES)}
+_PERMISSION_ITEMS = tuple(PERMISSION_BITS.items())
+
+MODULE_PERMISSIONS = {
+    'dashboard': 'puede_ver_dashboard',
+    'convocatorias': 'puede_gestionar_convocatorias',
+    'solicitudes': 'puede_gestionar_solicitudes',
+    'usuarios': 'puede_gestionar_usuarios',
+    'reportes': 'puede_ver_reportes'
+}
+
+_ROLE_PERMISSIONS = {
+    UserRole.ADMINISTRADOR: (
+        'puede_gestionar_convocatorias', 'puede_crear_convocatorias',
+        'puede_publicar_convocatorias', 'puede_gestionar_usuarios',
+        'puede_ver_reportes', 'puede_exportar_datos',
+    ),
+    UserRole.GESTOR: (
+        'puede_prevalidar_solicitudes', 'puede_ver_todas_solicitudes',
+    ),
+    UserRole.DOCENTE: (
+        'puede_gestionar_solicitudes', 'puede_exportar_datos',
+    ),
+    UserRole.COORDINADOR: (
+        'puede_gestionar_convocatorias', 'puede_gestionar_solicitudes',
+        'puede_ver_reportes', 'puede_exportar_datos',
+        'puede_validar_solicitudes', 'puede_ver_todas_solicitudes',
+        'puede_crear_convocatorias', 'puede_publicar_convocatorias',
+    ),
+}
+
+
+def permission_mask(*names: str) -> int:
+    """Máscara de uno o más permisos; ValueError si alguno no existe"""
+    mask = 0
+    for name in names:
+        try:
+            mask |= PERMISSION_BITS[name]
+        except KeyError:
+            raise ValueError(f"Permiso desconocido: {name}") from None
+    return mask
+
+
+def permissions_to_mask(permissions: UserPermissions) -> int:
+    return sum(bit for name, bit in PERMISSION_BITS.items() if getattr(permissions, name))
+
+
+def mask_to_permissions(mask: int) -> UserPermissions:
+    return UserPermissions(**permissions_dict(mask))
+
+
+def permissions_dict(mask: int) -> Dict[str, bool]:
+    """Serialización de una máscara sin pasar por el dataclass"""
+    return {name: bool(mask & bit) for name, bit in _PERMISSION_ITEMS}
+
+
+_BASE_MASK = permissions_to_mask(UserPermissions())
+ROLE_PERMISSION_MASKS = {
+    role.value: _BASE_MASK | permission_mask(*_ROLE_PERMISSIONS.get(role, ()))
+    for role in UserRole
+}
+
+
+def compile_permissions(role: Any, overrides: Optional[Dict[str, bool]] = None) -> int:
+    """
+    Máscara efectiva: la del rol más los permisos concedidos o quitados al
+    usuario en 'overrides' ({"puede_ver_reportes": True, ...}).
+    """
+    role = role.value if isinstance(role, UserRole) else role
+    mask = ROLE_PERMISSION_MASKS.get(role, _BASE_MASK)
+    for name, granted in (overrides or {}).items():
+        bit = PERMISSION_BITS.get(name)
+        if bit is None:
+            continue
+        mask = mask | bit if granted else mask & ~bit
+    return mask
+
+
+@dataclass(slots=True)
 class UserLoginHistory:
     """Historial de inicio de sesión"""
     id: str
@@ -87,9 +173,24 @@ class UserLoginHistory:
             'failure_reason': self.failure_reason
         }
 
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
 class User:
     """Modelo principal de usuario"""
     
+    # sin __dict__: menos memoria por instancia y acceso a atributos más rápido
+    __slots__ = (
+        'id', 'username', 'email', 'password_hash', 'role', 'full_name',
+        'status', 'department', 'created_at', 'updated_at', 'last_login',
+        'permission_mask', 'profile', '_permissions', '_login_history',
+    )
+    
+    # historial en memoria acotado; el registro completo de intentos está en
+    # business_logic.utils.login_attempts
+    LOGIN_HISTORY_LIMIT = 20
+    
     def __init__(
         self,
         id: int,
@@ -103,7 +204,9 @@ class User:
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
         last_login: Optional[datetime] = None,
-        permissions: Optional[UserPermissions] = None
+        permissions: Optional[UserPermissions] = None,
+        permission_mask: Optional[int] = None,
+        profile: Optional[UserProfile] = None
     ):
         self.id = id
         self.username = username
@@ -113,11 +216,24 @@ class User:
         self.full_name = full_name
         self.status = status if isinstance(status, UserStatus) else UserStatus(status)
         self.department = department
-        self.created_at = created_at or datetime.now()
-        self.updated_at = updated_at or datetime.now()
+        if created_at is None or updated_at is None:
+            now = datetime.now()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
         self.last_login = last_login
-        self.permissions = permissions or self._get_default_permissions()
-        self.login_history: List[UserLoginHistory] = []
+        # la máscara es la fuente de verdad; 'permissions' se arma al pedirlo
+        if permissions is not None:
+            self.permission_mask = permissions_to_mask(permissions)
+        elif permission_mask is not None:
+            self.permission_mask = permission_mask
+        else:
+            self.permission_mask = ROLE_PERMISSION_MASKS[self.role.value]
+        self.profile = profile
+        # se crean al primer uso: la mayoría de los modelos nunca los necesita
+        self._permissions: Optional[UserPermissions] = None
+        self._login_history: Optional[Deque[UserLoginHistory]] = None
     
     # ============ MÉTODOS DE FÁBRICA ============
     
@@ -198,6 +314,8 @@ class User:
                        'titulo_academico', 'especialidad',
                        'foto_perfil', 'biografia']
         
+        if self.profile is None:
+            self.profile = UserProfile()
         for key, value in kwargs.items():
             if key in valid_fields and hasattr(self.profile, key):
                 setattr(self.profile, key, value)
@@ -257,24 +375,33 @@ class User:
         """Verifica si la cuenta está activa"""
         return self.status == UserStatus.ACTIVO
     
+    @property
+    def login_history(self) -> Deque[UserLoginHistory]:
+        if self._login_history is None:
+            self._login_history = deque(maxlen=self.LOGIN_HISTORY_LIMIT)
+        return self._login_history
+    
+    @property
+    def permissions(self) -> UserPermissions:
+        """Vista dataclass de la máscara (se construye la primera vez)"""
+        if self._permissions is None:
+            self._permissions = mask_to_permissions(self.permission_mask)
+        return self._permissions
+    
+    @permissions.setter
+    def permissions(self, value: UserPermissions) -> None:
+        self.permission_mask = permissions_to_mask(value)
+        self._permissions = None
+    
     def has_permission(self, permission_name: str) -> bool:
         """Verifica si el usuario tiene un permiso específico"""
-        if hasattr(self.permissions, permission_name):
-            return getattr(self.permissions, permission_name)
-        return False
+        bit = PERMISSION_BITS.get(permission_name)
+        return bit is not None and bool(self.permission_mask & bit)
     
     def can_access_module(self, module_name: str) -> bool:
         """Verifica si el usuario puede acceder a un módulo"""
-        permission_map = {
-            'dashboard': 'puede_ver_dashboard',
-            'convocatorias': 'puede_gestionar_convocatorias',
-            'solicitudes': 'puede_gestionar_solicitudes',
-            'usuarios': 'puede_gestionar_usuarios',
-            'reportes': 'puede_ver_reportes'
-        }
-        
-        if module_name in permission_map:
-            return self.has_permission(permission_map[module_name])
+        if module_name in MODULE_PERMISSIONS:
+            return self.has_permission(MODULE_PERMISSIONS[module_name])
         
         return False
     
@@ -282,6 +409,7 @@ class User:
     
     def to_dict(self, include_password: bool = False) -> Dict[str, Any]:
         """Convierte el usuario a diccionario"""
+        department = self.department
         data = {
             'id': self.id,
             'username': self.username,
@@ -289,14 +417,14 @@ class User:
             'role': self.role.value,
             'full_name': self.full_name,
             'status': self.status.value,
-            'department': self.department.value if self.department else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'profile': self.profile.to_dict(),
-            'permissions': self.permissions.to_dict(),
-            'login_history_count': len(self.login_history),
-            'is_active': self.is_active()
+            'department': department.value if department is not None else None,
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
+            'last_login': _iso(self.last_login),
+            'profile': self.profile.to_dict() if self.profile is not None else None,
+            'permissions': permissions_dict(self.permission_mask),
+            'login_history_count': len(self._login_history) if self._login_history else 0,
+            'is_active': self.status is UserStatus.ACTIVO
         }
         
         if include_password:
@@ -306,51 +434,22 @@ class User:
     
     def to_minimal_dict(self) -> Dict[str, Any]:
         """Versión minimalista para listados"""
+        department = self.department
         return {
             'id': self.id,
             'username': self.username,
             'full_name': self.full_name,
             'role': self.role.value,
-            'department': self.department.value if self.department else None,
+            'department': department.value if department is not None else None,
             'status': self.status.value,
-            'last_login': self.last_login.isoformat() if self.last_login else None
+            'last_login': _iso(self.last_login)
         }
     
     # ============ MÉTODOS PRIVADOS ============
     
     def _get_default_permissions(self) -> UserPermissions:
         """Obtiene permisos por defecto según el rol"""
-        permissions = UserPermissions()
-        
-        if self.role == UserRole.ADMINISTRADOR:
-            permissions.puede_gestionar_convocatorias = True
-            permissions.puede_crear_convocatorias = True
-            permissions.puede_publicar_convocatorias = True
-            permissions.puede_gestionar_usuarios = True
-            permissions.puede_ver_reportes = True
-            permissions.puede_exportar_datos = True
-            
-        
-        elif self.role == UserRole.GESTOR:
-            permissions.puede_prevalidar_solicitudes = True
-            permissions.puede_ver_todas_solicitudes = True
-            permissions.puede_ver_todas_solicitudes = True
-        
-        elif self.role == UserRole.DOCENTE:
-            permissions.puede_gestionar_solicitudes = True
-            permissions.puede_exportar_datos = True
-        
-        elif self.role == UserRole.COORDINADOR:
-            permissions.puede_gestionar_convocatorias = True
-            permissions.puede_gestionar_solicitudes = True
-            permissions.puede_ver_reportes = True
-            permissions.puede_exportar_datos = True
-            permissions.puede_validar_solicitudes = True
-            permissions.puede_ver_todas_solicitudes = True
-            permissions.puede_crear_convocatorias = True
-            permissions.puede_publicar_convocatorias = True
-        
-        return permissions
+        return mask_to_permissions(ROLE_PERMISSION_MASKS[self.role.value])
     
     # ============ MÉTODOS MÁGICOS ============
     
@@ -0,0 +1,60 @@
+from data_layer.database.database import db
+
+# Los listados se ordenan por fecha de creación (más nuevas primero) y se
+# paginan por keyset: 'after' es la clave (created_at, id) del último
+# registro de la página anterior.
+ORDER_BY = "created_at"
+
+
+class SolicitudRepository:
+    """
+    Acceso a solicitudes. Los registros son los dicts de la base (no se
+    modifican en el lugar: los cambios van por update()).
+
+    Cada listado filtra por campos con índice mantenido por la base (user_id,
+    convocatoria_id, estado) y recorre el índice ordenado de created_at, así
+    una página cuesta O(tamaño de página) y no O(total de solicitudes).
+    """
+
+    def __init__(self):
+        self.db = db
+
+    def find_by_id(self, solicitud_id):
+        """Busca solicitud por ID (índice primario)"""
+        return self.db.get_solicitud_by_id(solicitud_id)
+
+    def find_by_codigo(self, codigo):
+        """Busca solicitud por código (índice único)"""
+        return self.db.find_solicitud_by_codigo(codigo)
+
+    def page(self, filters, after=None, limit=20, descending=True):
+        """Una página de solicitudes que cumplen 'filters' (campo -> valor)"""
+        query = {k: v for k, v in filters.items() if v is not None}
+        return self.db.search_page(
+            "solicitudes", query, order_by=ORDER_BY, descending=descending,
+            after=after, limit=limit,
+        )
+
+    def page_by_user(self, user_id, estado=None, after=None, limit=20):
+        """Solicitudes de un usuario (índice user_id)"""
+        return self.page({"user_id": user_id, "estado": estado}, after, limit)
+
+    def page_by_convocatoria(self, convocatoria_id, estado=None, user_id=None, after=None, limit=20):
+        """Solicitudes de una convocatoria (índice convocatoria_id)"""
+        filters = {"convocatoria_id": convocatoria_id, "estado": estado, "user_id": user_id}
+        return self.page(filters, after, limit)
+
+    def page_all(self, estado=None, tipo=None, after=None, limit=20):
+        """Todas las solicitudes (índice estado/tipo si se filtra)"""
+        return self.page({"estado": estado, "tipo": tipo}, after, limit)
+
+    def create(self, data):
+        """Alta: la base asigna id, código y fechas"""
+        return self.db.add_solicitud(data)
+
+    def update(self, solicitud_id, updates):
+        """Publica una versión nueva del registro y reindexa"""
+        return self.db.update_solicitud(solicitud_id, updates)
+
+    def delete(self, solicitud_id):
+        return self.db.delete_solicitud(solicitud_id)
@@ -1,36 +1,137 @@
-from data_layer.models.user import User
+from data_layer.models.user import User, UserDepartment, compile_permissions
 from data_layer.database.database import db
+from collections import OrderedDict
 from datetime import datetime
+import threading
+
+
+class UserModelCache:
+    """
+    LRU de modelos User ya construidos, por id.
+
+    Construir un User crea sus permisos y su historial; la mayoría de las
+    requests solo lo leen. Cada entrada guarda el updated_at del registro
+    del que salió y solo se usa si coincide con el del registro recién
+    leído: así un cambio hecho por otro proceso (motor sqlite, donde los
+    listeners no lo ven) tampoco deja un modelo viejo en uso. Los modelos en
+    caché son compartidos entre hilos: no deben modificarse, los cambios van
+    por la base (update_user).
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._items = OrderedDict()     # id -> (updated_at, modelo)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, stamp):
+        """Modelo del registro con ese updated_at, o None"""
+        with self._lock:
+            entry = self._items.get(user_id)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._items.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, stamp, model):
+        with self._lock:
+            self._items[user_id] = (stamp, model)
+            self._items.move_to_end(user_id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._items.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._items), "maxsize": self.maxsize,
+                    "hits": self.hits, "misses": self.misses}
+
+    def on_db_change(self, collection, op, record):
+        """Listener de la DB: libera antes las entradas de este proceso"""
+        if collection == "users" and op in ("update", "delete"):
+            self.invalidate(record["id"])
+
+
+user_model_cache = UserModelCache()
+db.add_listener(user_model_cache.on_db_change)
+
+
+def _parse_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_department(value):
+    if value is None or isinstance(value, UserDepartment):
+        return value
+    try:
+        return UserDepartment(value)
+    except ValueError:
+        return None
+
 
 class UserRepository:
     def __init__(self):
-        self.collection = db.users
-    
+        self.db = db
+        self.cache = user_model_cache
+
     def find_by_username(self, username):
-        """Busca usuario por username"""
-        user_data = next((u for u in self.collection 
-                         if u['username'] == username), None)
-        
+        """Busca usuario por username (índice hash de la DB)"""
+        user_data = self.db.find_user_by_username(username)
+
         if user_data:
-            return self._to_model(user_data)
+            return self._cached_model(user_data)
         return None
-    
+
+    def find_by_email(self, email):
+        """Busca usuario por email (índice hash de la DB)"""
+        user_data = self.db.find_user_by_email(email)
+
+        if user_data:
+            return self._cached_model(user_data)
+        return None
+
     def find_by_id(self, user_id):
-        """Busca usuario por ID"""
-        user_data = next((u for u in self.collection 
-                         if u['id'] == user_id), None)
-        
+        """Busca usuario por ID (índice hash de la DB, modelo del LRU)"""
+        user_data = self.db.get_user_by_id(user_id)
+
         if user_data:
-            return self._to_model(user_data)
+            return self._cached_model(user_data)
+        self.cache.invalidate(user_id)
         return None
-    
+
     def update_last_login(self, user_id):
         """Actualiza la fecha de último login"""
-        for user in self.collection:
-            if user['id'] == user_id:
-                user['last_login'] = datetime.now()
-                break
-    
+        self.db.update_user(user_id, {'last_login': datetime.now().isoformat()})
+
+    def update_password_hash(self, user_id, password_hash):
+        """Reemplaza el hash de contraseña (cambio de contraseña o re-hash)"""
+        self.db.update_user(user_id, {'password_hash': password_hash})
+
+    def _cached_model(self, data):
+        # el registro se acaba de leer: si su updated_at no es el de la
+        # entrada, el modelo se arma con estos datos
+        stamp = data.get('updated_at')
+        model = self.cache.get(data['id'], stamp)
+        if model is None:
+            model = self._to_model(data)
+            self.cache.put(data['id'], stamp, model)
+        return model
+
     def _to_model(self, data):
         """Convierte datos dict a objeto User"""
         return User(
@@ -39,8 +140,11 @@ class UserRepository:
             password_hash=data['password_hash'],
             email=data['email'],
             role=data['role'],
-            full_name=data['full_name'],
-            is_active=data['is_active'],
-            created_at=data['created_at'],
-            last_login=data.get('last_login')
-        )
\ No newline at end of file
+            full_name=data.get('full_name', ''),
+            status=data.get('status', 'activo'),
+            department=_parse_department(data.get('department')),
+            created_at=_parse_datetime(data.get('created_at')),
+            updated_at=_parse_datetime(data.get('updated_at')),
+            last_login=_parse_datetime(data.get('last_login')),
+            permission_mask=compile_permissions(data['role'], data.get('permissions'))
+        )
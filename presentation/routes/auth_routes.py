@@ -1,7 +1,12 @@
 # presentation/routes/auth_routes.py
 from flask import Blueprint, request, session, render_template,redirect, jsonify, url_for
 from data_layer.database.database import db
-from business_logic.utils.password_utils import verify_password
+from business_logic.exceptions.auth_exceptions import AuthServiceBusyError, LoginThrottledError
+from business_logic.utils.decorators import permission_required
+from business_logic.utils.login_attempts import get_login_attempts
+from business_logic.utils.password_pool import get_password_verifier
+from business_logic.utils.password_utils import needs_rehash
+from business_logic.utils.permissions import store_session_permissions
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -25,24 +30,66 @@ def login():
             "message": "Debe ingresar usuario y contraseña."
         }), 400
 
+    # Límite de intentos fallidos: se corta antes de cualquier trabajo bcrypt.
+    # El intento queda reservado (cuenta para el límite) hasta registrar su
+    # resultado; si sale del with sin resultado, la reserva se libera.
+    attempts = get_login_attempts()
+    ip = request.remote_addr
+    try:
+        attempt = attempts.check(username, ip)
+    except LoginThrottledError as e:
+        resp = jsonify({
+            "success": False,
+            "message": "Demasiados intentos fallidos. Intente nuevamente más tarde."
+        })
+        resp.headers["Retry-After"] = str(e.retry_after)
+        return resp, 429
+
+    with attempt:
+        return _login(attempt, username, password)
+
+
+def _login(attempt, username, password):
     user = db.find_user_by_username(username)
     if not user:
+        attempt.record(False, "usuario_no_encontrado")
         return jsonify({
             "success": False,
             "message": "Usuario no encontrado."
         }), 404
 
-    if not verify_password(password, user.get("password_hash", "")):
+    # bcrypt corre en el pool acotado; si está saturado se rechaza al instante
+    try:
+        valid = get_password_verifier().verify(password, user.get("password_hash", ""))
+    except AuthServiceBusyError as e:
+        resp = jsonify({
+            "success": False,
+            "message": "Demasiados inicios de sesión en curso. Intente nuevamente en unos segundos."
+        })
+        resp.headers["Retry-After"] = str(e.retry_after)
+        return resp, 503
+
+    if not valid:
+        attempt.record(False, "password_incorrecto")
         return jsonify({
             "success": False,
             "message": "Contraseña incorrecta."
         }), 401
 
+    # Migrar el hash al costo configurado, en segundo plano
+    old_hash = user.get("password_hash", "")
+    if needs_rehash(old_hash):
+        get_password_verifier().rehash_async(
+            password, lambda new_hash: _store_rehash(user["id"], old_hash, new_hash)
+        )
+
     # Login exitoso
+    attempt.record(True)
     session.clear()
     session["user_id"] = user["id"]
     session["username"] = user["username"]
     session["role"] = user["role"]
+    store_session_permissions(user)
 
     return jsonify({
         "success": True,
@@ -52,6 +99,19 @@ def login():
 
     #return redirect(url_for("dashboard.dashboard_home"))
 
+def _store_rehash(user_id, old_hash, new_hash):
+    # solo si la contraseña no cambió mientras se calculaba el hash nuevo; la
+    # comparación se hace dentro de la escritura para no pisar un cambio
+    db.update_user(user_id, {"password_hash": new_hash}, expected={"password_hash": old_hash})
+
+# Métricas del pool de verificación (solo administración)
+@auth_bp.get("/metrics")
+@permission_required("puede_gestionar_usuarios")
+def login_metrics():
+    data = get_password_verifier().stats()
+    data["attempts"] = get_login_attempts().stats()
+    return jsonify({"success": True, "data": data})
+
 # Logout
 @auth_bp.route("/logout")
 def logout():
@@ -0,0 +1,49 @@
+from flask import Blueprint, request, session, jsonify
+from data_layer.database.database import db
+from business_logic.utils.http_cache import args_digest, conditional, make_etag
+from business_logic.utils.permissions import session_has_permission
+
+busqueda_bp = Blueprint("busqueda", __name__, url_prefix="/buscar")
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# campos devueltos por cada resultado
+RESULT_FIELDS = {
+    "convocatorias": ("id", "nombre", "tipo", "ano", "estado", "fecha_inicio", "fecha_fin"),
+    "solicitudes": ("id", "codigo", "titulo", "tipo", "estado", "convocatoria_id", "user_id"),
+}
+
+
+@busqueda_bp.get("/")
+def buscar():
+    # /buscar?q=diseño indus&en=solicitudes&limite=20
+    args = request.args
+    collection = args.get("en", "convocatorias")
+    if collection not in RESULT_FIELDS:
+        return jsonify({"ok": False, "msg": "Colección inválida"}), 400
+    try:
+        limit = min(MAX_LIMIT, max(1, int(args.get("limite") or DEFAULT_LIMIT)))
+    except ValueError:
+        return jsonify({"ok": False, "msg": "Límite inválido"}), 400
+
+    # sin permiso para ver todas, cada usuario busca solo en sus solicitudes
+    own_only = collection == "solicitudes" and not session_has_permission("puede_ver_todas_solicitudes")
+    user_id = session.get("user_id")
+
+    version, modified = db.collection_version(collection)
+    etag = make_etag("buscar", version, user_id if own_only else None, args_digest(args.items(multi=True)))
+
+    def build():
+        predicate = (lambda sol: sol.get("user_id") == user_id) if own_only else None
+        fields = RESULT_FIELDS[collection]
+        results = db.text_search(collection, args.get("q", ""), limit=limit, predicate=predicate)
+        return jsonify({
+            "ok": True,
+            "data": [
+                dict({f: record.get(f) for f in fields}, score=round(score, 4))
+                for record, score in results
+            ],
+        })
+
+    return conditional(etag, modified, build, per_user=own_only)
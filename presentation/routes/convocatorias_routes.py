@@ -1,25 +1,106 @@
 from flask import Blueprint, request, session, render_template,redirect, jsonify, url_for
 from data_layer.database.database import db
 from business_logic.utils.password_utils import verify_password
+from business_logic.utils.decorators import permission_required
+from business_logic.services.convocatorias_service import ConvocatoriasService, validar_campos
+from business_logic.exceptions.validation_exceptions import ValidationError
+from business_logic.utils.http_cache import args_digest, conditional, make_etag
+from business_logic.utils.render_cache import get_render_cache
+from business_logic.utils.streaming import stream_records
+from datetime import datetime
 
 convocatoria_bp = Blueprint("convocatoria", __name__, url_prefix="/convocatoria")
 
 @convocatoria_bp.get("/")
 def convocatoria_list():
-    convocatorias = db.convocatorias  # lista completa
-    return render_template("convocatorias/list.html", convocatorias=convocatorias)
+    # la página solo trae los filtros; los datos se piden a /listar
+    version, modified = db.collection_version("convocatorias")
+    current_year = datetime.now().year
+    # la plantilla depende del usuario (menú, nombre) y del año en curso
+    etag = make_etag("conv-page", version, session.get("user_id"), current_year)
+
+    def build():
+        # HTML compartido por rol; se vuelve a renderizar al cambiar las convocatorias
+        return get_render_cache().get_or_render(
+            "convocatorias/list.html",
+            lambda: render_template(
+                "convocatorias/list.html",
+                years=ConvocatoriasService().anos_disponibles() or [current_year],
+                current_year=current_year,
+            ),
+            collections=("convocatorias",),
+            key=current_year,
+            role=session.get("role"),
+        )
+
+    return conditional(etag, modified, build, per_user=True)
+
+
+@convocatoria_bp.get("/listar")
+def convocatoria_listar():
+    args = request.args
+    version, modified = db.collection_version("convocatorias")
+    etag = make_etag("conv-list", version, args_digest(args.items(multi=True)))
+    return conditional(etag, modified, lambda: _listar_response(args))
+
+
+def _listar_response(args):
+    try:
+        page = ConvocatoriasService().listar(
+            ano=args.get("ano"),
+            tipo=args.get("tipo"),
+            estado=args.get("estado"),
+            texto=args.get("q"),
+            orden=args.get("orden"),
+            cursor=args.get("cursor"),
+            limite=args.get("limite"),
+        )
+    except ValidationError as e:
+        return jsonify({"ok": False, "msg": e.message, "details": e.details}), 400
+
+    return jsonify({"ok": True, "data": page["items"], "next_cursor": page["next_cursor"]})
+
+
+@convocatoria_bp.get("/exportar")
+@permission_required("puede_exportar_datos")
+def convocatoria_exportar():
+    # todas las que cumplen los filtros, en streaming (JSON o ?formato=ndjson)
+    args = request.args
+    version, modified = db.collection_version("convocatorias")
+    etag = make_etag("conv-export", version, args_digest(args.items(multi=True)))
+
+    def build():
+        try:
+            records = ConvocatoriasService().exportar(
+                ano=args.get("ano"),
+                tipo=args.get("tipo"),
+                estado=args.get("estado"),
+                texto=args.get("q"),
+            )
+        except ValidationError as e:
+            return jsonify({"ok": False, "msg": e.message, "details": e.details}), 400
+        return stream_records(records, ok=True)
+
+    return conditional(etag, modified, build)
 
 
 @convocatoria_bp.get("/detalle/<int:convocatoria_id>")
 def convocatoria_detalle(convocatoria_id):
-    conv = db.get_convocatoria(convocatoria_id)
-
-    if not conv:
+    stamp = db.record_version("convocatorias", convocatoria_id)
+    if stamp is None:
         return jsonify({"ok": False, "msg": "Convocatoria no encontrada"}), 404
-    
-    return jsonify({"ok": True, "data": conv})
+
+    def build():
+        conv = db.get_convocatoria(convocatoria_id)
+        if not conv:
+            return jsonify({"ok": False, "msg": "Convocatoria no encontrada"}), 404
+        return jsonify({"ok": True, "data": conv})
+
+    version, modified = stamp
+    return conditional(make_etag("conv", convocatoria_id, version), modified, build)
 
 @convocatoria_bp.post("/crear")
+@permission_required("puede_crear_convocatorias")
 def convocatoria_create():
     data = request.form or request.get_json() or {}
 
@@ -32,17 +113,34 @@ def convocatoria_create():
     if not tipo or not nombre or not fecha_inicio or not fecha_fin:
         return jsonify({"ok": False, "msg": "Todos los campos son obligatorios"}), 400
 
+    # año y trimestre alimentan los índices del listado
+    try:
+        ano = int(data.get("ano") or str(fecha_inicio)[:4])
+    except ValueError:
+        return jsonify({"ok": False, "msg": "Año inválido"}), 400
+
+    try:
+        campos = validar_campos({
+            "tipo": tipo, "estado": estado, "trimestre": data.get("trimestre"),
+        })
+    except ValidationError as e:
+        return jsonify({"ok": False, "msg": e.message, "details": e.details}), 400
+
     nueva = db.add_convocatoria({
-        "tipo": tipo,
+        "tipo": campos["tipo"],
         "nombre": nombre,
+        "ano": ano,
+        "trimestre": campos["trimestre"],
+        "descripcion": data.get("descripcion", ""),
         "fecha_inicio": fecha_inicio,
         "fecha_fin": fecha_fin,
-        "estado": estado,
+        "estado": campos["estado"],
     })
 
     return jsonify({"ok": True, "msg": "Convocatoria creada", "data": nueva})
 
 @convocatoria_bp.post("/editar/<int:convocatoria_id>")
+@permission_required("puede_gestionar_convocatorias")
 def convocatoria_update(convocatoria_id):
     data = request.form or request.get_json() or {}
 
@@ -57,6 +155,12 @@ def convocatoria_update(convocatoria_id):
         "fecha_fin": data.get("fecha_fin", conv["fecha_fin"]),
         "estado": data.get("estado", conv["estado"]),
     }
+    # solo se validan los valores que cambian (los guardados ya valen)
+    cambios = {k: data[k] for k in ("tipo", "estado", "trimestre") if k in data}
+    try:
+        updates.update(validar_campos(cambios))
+    except ValidationError as e:
+        return jsonify({"ok": False, "msg": e.message, "details": e.details}), 400
 
     db.update_convocatoria(convocatoria_id, updates)
 
@@ -64,6 +168,7 @@ def convocatoria_update(convocatoria_id):
 
 
 @convocatoria_bp.delete("/eliminar/<int:convocatoria_id>")
+@permission_required("puede_gestionar_convocatorias")
 def convocatoria_delete(convocatoria_id):
     ok = db.delete_convocatoria(convocatoria_id)
 
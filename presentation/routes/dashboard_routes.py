@@ -1,6 +1,8 @@
 # presentation/routes/dashboard_routes.py
 
-from flask import Blueprint, render_template, session, redirect, url_for
+from flask import Blueprint, session, redirect, url_for, jsonify
+from business_logic.utils.decorators import permission_required
+from business_logic.utils.render_cache import get_render_cache
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 
@@ -11,4 +13,12 @@ def dashboard_home():
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
 
-    return render_template("dashboard/dashboard.html")
+    # mismo HTML para todos los usuarios del rol: se renderiza una vez
+    return get_render_cache().render("dashboard/dashboard.html")
+
+
+# Métricas de la caché de HTML (solo administración)
+@dashboard_bp.get("/cache")
+@permission_required("puede_gestionar_usuarios")
+def render_cache_metrics():
+    return jsonify({"success": True, "data": get_render_cache().stats()})
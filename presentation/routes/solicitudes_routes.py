@@ -0,0 +1,124 @@
+from flask import Blueprint, request, session, jsonify
+from data_layer.database.database import db
+from business_logic.utils.decorators import permission_required
+from business_logic.services.solicitudes_service import SolicitudesService
+from business_logic.exceptions.validation_exceptions import ValidationError
+from business_logic.utils.http_cache import args_digest, conditional, make_etag
+from business_logic.utils.permissions import session_has_permission
+from business_logic.utils.streaming import stream_records
+
+solicitud_bp = Blueprint("solicitud", __name__, url_prefix="/solicitudes")
+
+
+def _ver_todas():
+    return session_has_permission("puede_ver_todas_solicitudes")
+
+
+def _pagina(tag, args, per_user, listar):
+    """Listado JSON con 304 mientras no cambie la colección"""
+    version, modified = db.collection_version("solicitudes")
+    etag = make_etag(tag, version, session.get("user_id") if per_user else None,
+                     args_digest(args.items(multi=True)))
+
+    def build():
+        try:
+            page = listar()
+        except ValidationError as e:
+            return jsonify({"ok": False, "msg": e.message, "details": e.details}), 400
+        return jsonify({"ok": True, "data": page["items"], "next_cursor": page["next_cursor"]})
+
+    return conditional(etag, modified, build, per_user=per_user)
+
+
+@solicitud_bp.get("/mias")
+def solicitud_mias():
+    args = request.args
+    return _pagina("sol-mias", args, True, lambda: SolicitudesService().listar_mias(
+        session.get("user_id"),
+        estado=args.get("estado"),
+        cursor=args.get("cursor"),
+        limite=args.get("limite"),
+    ))
+
+
+@solicitud_bp.get("/convocatoria/<int:convocatoria_id>")
+def solicitud_por_convocatoria(convocatoria_id):
+    # sin permiso para ver todas, solo las propias dentro de la convocatoria
+    args = request.args
+    own_only = not _ver_todas()
+    return _pagina("sol-conv", args, own_only, lambda: SolicitudesService().listar_por_convocatoria(
+        convocatoria_id,
+        user_id=session.get("user_id") if own_only else None,
+        estado=args.get("estado"),
+        cursor=args.get("cursor"),
+        limite=args.get("limite"),
+    ))
+
+
+@solicitud_bp.get("/todas")
+@permission_required("puede_ver_todas_solicitudes")
+def solicitud_todas():
+    args = request.args
+    return _pagina("sol-todas", args, False, lambda: SolicitudesService().listar_todas(
+        estado=args.get("estado"),
+        tipo=args.get("tipo"),
+        cursor=args.get("cursor"),
+        limite=args.get("limite"),
+    ))
+
+
+@solicitud_bp.get("/detalle/<int:solicitud_id>")
+def solicitud_detalle(solicitud_id):
+    user_id = None if _ver_todas() else session.get("user_id")
+    sol = SolicitudesService().detalle(solicitud_id, user_id=user_id)
+    if sol is None:
+        return jsonify({"ok": False, "msg": "Solicitud no encontrada"}), 404
+    stamp = db.record_version("solicitudes", solicitud_id)
+    if stamp is None:
+        return jsonify({"ok": True, "data": sol})
+    version, modified = stamp
+    return conditional(make_etag("sol", solicitud_id, version), modified,
+                       lambda: jsonify({"ok": True, "data": sol}), per_user=user_id is not None)
+
+
+@solicitud_bp.post("/crear")
+@permission_required("puede_gestionar_solicitudes")
+def solicitud_crear():
+    data = request.form or request.get_json(silent=True) or {}
+    try:
+        nueva = SolicitudesService().crear(session.get("user_id"), data)
+    except ValidationError as e:
+        return jsonify({"ok": False, "msg": e.message, "details": e.details}), 400
+    return jsonify({"ok": True, "msg": "Solicitud creada", "data": nueva})
+
+
+# filtros de la exportación que van directo a los índices de la base
+EXPORT_FILTERS = ("estado", "tipo", "convocatoria_id")
+
+
+@solicitud_bp.get("/exportar")
+@permission_required("puede_exportar_datos")
+def solicitud_exportar():
+    args = request.args
+    query = {}
+    for field in EXPORT_FILTERS:
+        value = args.get(field)
+        if value not in (None, "", "all"):
+            query[field] = value
+    if "convocatoria_id" in query:
+        try:
+            query["convocatoria_id"] = int(query["convocatoria_id"])
+        except ValueError:
+            return jsonify({"ok": False, "msg": "Convocatoria inválida"}), 400
+    # sin permiso para ver todas, solo las propias
+    own_only = not _ver_todas()
+    if own_only:
+        query["user_id"] = session.get("user_id")
+
+    version, modified = db.collection_version("solicitudes")
+    etag = make_etag("sol-export", version, query.get("user_id"), args_digest(args.items(multi=True)))
+    return conditional(
+        etag, modified,
+        lambda: stream_records(db.iter_search("solicitudes", query), ok=True),
+        per_user=own_only,
+    )
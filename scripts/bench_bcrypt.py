@@ -0,0 +1,83 @@
+# scripts/bench_bcrypt.py
+"""
+Benchmark del costo de bcrypt en esta máquina, para elegir SGPI_BCRYPT_ROUNDS.
+
+Uso:
+    python -m scripts.bench_bcrypt [--min 8] [--max 14] [--budget-ms 250] [--workers N]
+
+Para cada costo reporta la latencia de un login (checkpw) y el throughput de
+logins por segundo usando el mismo número de hilos que el pool de
+verificación. Sugiere el costo más alto cuya p95 cabe en el presupuesto.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import statistics
+import time
+
+import bcrypt
+
+PASSWORD = b"Docente123!"
+
+
+def _latencies(hashed: bytes, samples: int):
+    out = []
+    for _ in range(samples):
+        t = time.perf_counter()
+        bcrypt.checkpw(PASSWORD, hashed)
+        out.append((time.perf_counter() - t) * 1000)
+    return sorted(out)
+
+
+def _throughput(hashed: bytes, workers: int, seconds: float) -> float:
+    deadline = time.perf_counter() + seconds
+
+    def worker(_):
+        done = 0
+        while time.perf_counter() < deadline:
+            bcrypt.checkpw(PASSWORD, hashed)
+            done += 1
+        return done
+
+    t = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        total = sum(pool.map(worker, range(workers)))
+    return total / (time.perf_counter() - t)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min", type=int, default=8)
+    parser.add_argument("--max", type=int, default=14)
+    parser.add_argument("--budget-ms", type=float, default=250.0)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}  hilos de verificación: {args.workers}  "
+          f"presupuesto p95: {args.budget_ms:.0f} ms")
+    print(f"{'costo':>5}{'p50 ms':>10}{'p95 ms':>10}{'logins/s':>11}")
+    suggested = None
+    for rounds in range(args.min, args.max + 1):
+        hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds))
+        first = _latencies(hashed, 1)[0]
+        # costos altos: menos muestras para que el benchmark no se eternice
+        samples = max(3, min(30, int(2000 / max(first, 1))))
+        lat = _latencies(hashed, samples)
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        rate = _throughput(hashed, args.workers, args.seconds)
+        print(f"{rounds:>5}{statistics.median(lat):>10.1f}{p95:>10.1f}{rate:>11.1f}")
+        if p95 <= args.budget_ms:
+            suggested = rounds
+        elif first > args.budget_ms * 4:
+            break
+
+    if suggested is None:
+        print("Ningún costo cabe en el presupuesto.")
+    else:
+        print(f"Sugerido: SGPI_BCRYPT_ROUNDS={suggested}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# scripts/bench_models.py
+"""
+Micro-benchmark del modelo User: construcción y serialización.
+
+Uso:
+    python -m scripts.bench_models [usuarios]
+
+Compara el User actual (__slots__, máscara de permisos, serialización sin
+asdict) con una réplica del modelo anterior (atributos en __dict__,
+UserPermissions y lista de historial por instancia, to_dict vía asdict).
+Mide tiempo y memoria asignada (tracemalloc) para N usuarios.
+"""
+
+from dataclasses import asdict
+from datetime import datetime
+import gc
+import sys
+import time
+import tracemalloc
+
+from data_layer.models.user import User, UserDepartment, UserPermissions, UserRole, UserStatus
+
+
+class _LegacyUser:
+    """Réplica del modelo anterior, solo para comparar"""
+
+    def __init__(self, id, username, email, password_hash, role, full_name, status,
+                 department, created_at, updated_at, last_login):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.password_hash = password_hash
+        self.role = role if isinstance(role, UserRole) else UserRole(role)
+        self.full_name = full_name
+        self.status = status if isinstance(status, UserStatus) else UserStatus(status)
+        self.department = department
+        self.created_at = created_at or datetime.now()
+        self.updated_at = updated_at or datetime.now()
+        self.last_login = last_login
+        self.permissions = UserPermissions(puede_gestionar_solicitudes=True, puede_exportar_datos=True)
+        self.login_history = []
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'role': self.role.value,
+            'full_name': self.full_name,
+            'status': self.status.value,
+            'department': self.department.value if self.department else None,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'last_login': self.last_login.isoformat() if self.last_login else None,
+            'permissions': asdict(self.permissions),
+            'login_history_count': len(self.login_history),
+            'is_active': self.status == UserStatus.ACTIVO
+        }
+
+    def to_minimal_dict(self):
+        return {
+            'id': self.id,
+            'username': self.username,
+            'full_name': self.full_name,
+            'role': self.role.value,
+            'department': self.department.value if self.department else None,
+            'status': self.status.value,
+            'last_login': self.last_login.isoformat() if self.last_login else None
+        }
+
+
+def _rows(n):
+    now = datetime.now()
+    return [
+        dict(id=i, username=f"docente{i}", email=f"docente{i}@sgpi.edu",
+             password_hash="$2b$12$" + "x" * 53, role="docente", full_name=f"Docente {i}",
+             status="activo", department=UserDepartment.FACULTAD_INGENIERIA,
+             created_at=now, updated_at=now, last_login=None)
+        for i in range(n)
+    ]
+
+
+def _measure(label, fn):
+    gc.collect()
+    tracemalloc.start()
+    t = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28}{elapsed * 1000:>10.1f} ms{current / 1e6:>10.2f} MB{peak / 1e6:>10.2f} MB")
+    return result
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = _rows(n)
+    print(f"{n} usuarios")
+    print(f"{'operación':<28}{'tiempo':>13}{'retenido':>13}{'pico':>13}")
+    for label, cls in (("anterior", _LegacyUser), ("actual", User)):
+        users = _measure(f"{label}: construir", lambda: [cls(**r) for r in rows])
+        _measure(f"{label}: to_dict", lambda: [u.to_dict() for u in users])
+        _measure(f"{label}: to_minimal_dict", lambda: [u.to_minimal_dict() for u in users])
+        del users
+
+
+if __name__ == "__main__":
+    main()
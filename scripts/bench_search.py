@@ -0,0 +1,89 @@
+# scripts/bench_search.py
+"""
+Benchmark de la búsqueda de texto completo sobre solicitudes.
+
+Uso:
+    python -m scripts.bench_search [solicitudes]
+
+Carga N solicitudes sintéticas en la base en memoria (alta masiva) y mide consultas típicas del buscador: palabra completa, prefijo a
+medio escribir, varias palabras con tildes y código. Compara con el
+recorrido lineal por subcadena que hacía el listado antes del índice.
+"""
+
+from itertools import cycle
+import random
+import sys
+import time
+
+from data_layer.database.database import Database
+
+_WORDS = (
+    "sistema método dispositivo proceso diseño industrial modelo utilidad marca "
+    "colectiva software plataforma sensor biodegradable envase compuesto "
+    "nanopartículas agrícola riego energía solar panel batería litio algoritmo "
+    "aprendizaje automático imagen médica prótesis textil reciclado cemento"
+).split()
+_TIPOS = ("patente", "marca", "derecho_autor", "modelo_utilidad", "diseño_industrial")
+_PREFIJOS = {"patente": "PA", "marca": "MA", "derecho_autor": "DA",
+             "modelo_utilidad": "MU", "diseño_industrial": "DI"}
+
+QUERIES = (
+    "energía solar",
+    "nanopart",
+    "diseno industrial textil",
+    "prótesis médica",
+    "bateria litio algoritmo",
+    "DI-2026-012345",
+)
+
+
+def _rows(n):
+    rng = random.Random(7)
+    tipos = cycle(_TIPOS)
+    rows = []
+    for i in range(1, n + 1):
+        tipo = next(tipos)
+        rows.append({
+            "tipo": tipo,
+            "codigo": f"{_PREFIJOS[tipo]}-2026-{i:06d}",
+            "titulo": " ".join(rng.sample(_WORDS, 4)).capitalize(),
+            "descripcion": " ".join(rng.choices(_WORDS, k=12)),
+            "user_id": rng.randint(1, 500),
+            "estado": "enviada",
+        })
+    return rows
+
+
+def _time(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    db = Database()
+    t = time.perf_counter()
+    records = db.add_solicitudes(_rows(n))
+    print(f"{n} solicitudes cargadas e indexadas en {time.perf_counter() - t:.1f} s")
+    print(f"índice: {db._fulltext['solicitudes'].stats()}")
+
+    print(f"{'consulta':<28}{'índice':>12}{'resultados':>12}{'lineal':>12}")
+    for query in QUERIES:
+        elapsed, results = _time(lambda: db.text_search("solicitudes", query, limit=20))
+        total = len(db.text_match_ids("solicitudes", query))
+        needle = query.lower()
+        linear, _ = _time(lambda: [
+            r for r in records
+            if needle in r["titulo"].lower() or needle in r["descripcion"].lower()
+            or needle in r["codigo"].lower()
+        ], repeat=1)
+        print(f"{query:<28}{elapsed * 1000:>9.1f} ms{total:>12}{linear * 1000:>9.1f} ms")
+        del results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# scripts/bench_startup.py
+"""
+Benchmark de arranque: carga desde los JSON vs. snapshot binario.
+
+Uso:
+    python -m scripts.bench_startup [solicitudes] [usuarios]
+
+Genera datos sintéticos en un directorio temporal y mide:
+  - construcción de Database (lo que bloquea el arranque)
+  - primer acceso a cada colección (con snapshot binario la carga es perezosa)
+"""
+
+from pathlib import Path
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from data_layer.database import binary_snapshot
+from data_layer.database.database import Database
+
+
+def _generate(data_dir: Path, n_solicitudes: int, n_users: int) -> None:
+    db = Database(persist_to_disk=True, data_dir=str(data_dir))
+    db.add_users(
+        {"username": f"docente{i}", "email": f"docente{i}@sgpi.edu", "role": "docente",
+         "password_hash": "$2b$12$" + "x" * 53, "full_name": f"Docente {i}",
+         "department": "facultad_ingenieria"}
+        for i in range(n_users)
+    )
+    db.add_convocatorias(
+        {"tipo": "normal", "nombre": f"Convocatoria {i}", "estado": "finalizada",
+         "fecha_inicio": f"20{10 + i // 4}-01-01", "fecha_fin": f"20{10 + i // 4}-03-28"}
+        for i in range(60)
+    )
+    db.add_solicitudes(
+        {"tipo": random.choice(["patente", "marca", "derecho_autor"]),
+         "titulo": f"Solicitud {i}", "descripcion": "Descripción de ejemplo " * 4,
+         "user_id": random.randint(1, n_users), "convocatoria_id": random.randint(1, 60),
+         "estado": random.choice(["borrador", "enviada", "aprobada"])}
+        for i in range(n_solicitudes)
+    )
+    db.close()
+
+
+def _measure(data_dir: Path, use_binary: bool):
+    t0 = time.perf_counter()
+    db = Database(persist_to_disk=True, data_dir=str(data_dir), use_binary_snapshot=use_binary)
+    t_open = time.perf_counter() - t0
+    firsts = {}
+    for name in ("users", "convocatorias", "solicitudes"):
+        t = time.perf_counter()
+        len(getattr(db, name))
+        firsts[name] = time.perf_counter() - t
+    return t_open, firsts, time.perf_counter() - t0
+
+
+def main() -> None:
+    n_solicitudes = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_users = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    data_dir = Path(tempfile.mkdtemp(prefix="sgpi-bench-"))
+    try:
+        print(f"Generando {n_users} usuarios y {n_solicitudes} solicitudes en {data_dir} ...")
+        _generate(data_dir, n_solicitudes, n_users)
+        t = time.perf_counter()
+        snap = binary_snapshot.convert_json_dir(data_dir)
+        print(f"Conversión a binario: {time.perf_counter() - t:.3f}s "
+              f"({snap.stat().st_size / 1e6:.1f} MB)")
+
+        print(f"{'modo':<10}{'arranque':>12}{'users':>10}{'convoc.':>10}{'solic.':>10}{'total':>10}")
+        for label, use_binary in (("json", False), ("binario", True)):
+            t_open, firsts, total = _measure(data_dir, use_binary)
+            print(f"{label:<10}{t_open:>11.3f}s{firsts['users']:>9.3f}s"
+                  f"{firsts['convocatorias']:>9.3f}s{firsts['solicitudes']:>9.3f}s{total:>9.3f}s")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# scripts/build_assets.py
+"""
+Build offline de los archivos estáticos.
+
+Uso:
+    python -m scripts.build_assets [--clean]
+
+Recorre static/ y escribe en static/dist/:
+  - cada archivo con el hash de su contenido en el nombre
+        css/dashboard.css -> css/dashboard.3f2a9c1b.css
+  - imágenes redimensionadas al ancho máximo en que se muestran, PNG/JPEG
+    optimizados y una variante WebP (requiere Pillow)
+  - texto (css, js, svg) precomprimido en .gz y .br (brotli es opcional)
+  - manifest.json: nombre lógico -> archivo generado y variantes
+
+La app lee el manifiesto al arrancar (business_logic/utils/static_assets.py):
+url_for('static', ...) apunta al archivo con hash y se sirve con caché
+inmutable. Sin manifiesto todo sigue funcionando con los originales.
+Volver a correr el build después de cambiar cualquier archivo estático.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import gzip
+import hashlib
+import io
+import json
+import shutil
+import sys
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_NAME = "manifest.json"
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+RASTER = {".png", ".jpg", ".jpeg"}
+# ancho máximo en px (2x del tamaño en que se muestran, para pantallas HiDPI)
+DEFAULT_MAX_WIDTH = 1600
+IMAGE_MAX_WIDTH = {
+    "images/LogoUG-Vertical-1-linea.png": 360,    # login: max-width 180px
+    "images/user.png": 128,
+    # dashboard: carrusel de 450px de alto con object-fit: cover, se dibuja a
+    # 1300 * 450 / 423 ≈ 1383px de ancho sea cual sea la pantalla
+    "images/BANNER-1.png": 2766,
+}
+WEBP_QUALITY = 82
+HASH_LENGTH = 8
+
+
+def _fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def _hashed_name(logical: str, digest: str, suffix: Optional[str] = None) -> str:
+    path = Path(logical)
+    return str(path.with_name(f"{path.stem}.{digest}{suffix or path.suffix}").as_posix())
+
+
+def _write(name: str, data: bytes) -> None:
+    target = DIST_DIR / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+
+
+def _optimize_image(logical: str, data: bytes) -> Dict[str, bytes]:
+    """{sufijo: bytes}: la imagen en su formato original y en WebP"""
+    suffix = Path(logical).suffix.lower()
+    if Image is None:
+        return {suffix: data}
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    max_width = IMAGE_MAX_WIDTH.get(logical, DEFAULT_MAX_WIDTH)
+    if image.width > max_width:
+        height = round(image.height * max_width / image.width)
+        image = image.resize((max_width, height), Image.LANCZOS)
+
+    out = {}
+    buffer = io.BytesIO()
+    if suffix == ".png":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        image.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True, progressive=True)
+    # si el original ya era más chico (y no hubo que achicarlo), se queda
+    optimized = buffer.getvalue()
+    out[suffix] = optimized if len(optimized) < len(data) or image.width == max_width else data
+
+    buffer = io.BytesIO()
+    lossless = suffix == ".png" and image.mode in ("P", "1", "L")
+    image.save(buffer, "WEBP", quality=WEBP_QUALITY, lossless=lossless, method=6)
+    if buffer.tell() < len(out[suffix]):
+        out[".webp"] = buffer.getvalue()
+    return out
+
+
+def _compress(name: str, data: bytes) -> list:
+    """Escribe .gz y .br junto a 'name' si achican el archivo"""
+    encodings = []
+    variants = [("gzip", ".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, ("br", ".br", lambda d: brotli.compress(d, quality=11)))
+    for encoding, ext, compress in variants:
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            _write(name + ext, compressed)
+            encodings.append(encoding)
+    return encodings
+
+
+def build() -> Dict[str, Dict]:
+    if DIST_DIR.exists():
+        shutil.rmtree(DIST_DIR)
+    manifest: Dict[str, Dict] = {}
+    for source in sorted(STATIC_DIR.rglob("*")):
+        if not source.is_file() or DIST_DIR in source.parents:
+            continue
+        logical = source.relative_to(STATIC_DIR).as_posix()
+        data = source.read_bytes()
+        if not data:
+            continue
+        digest = _fingerprint(data)
+        suffix = source.suffix.lower()
+        entry: Dict = {}
+
+        if suffix in RASTER:
+            variants = _optimize_image(logical, data)
+            entry["file"] = _hashed_name(logical, digest)
+            _write(entry["file"], variants[suffix])
+            if ".webp" in variants:
+                entry["webp"] = _hashed_name(logical, digest, ".webp")
+                _write(entry["webp"], variants[".webp"])
+            entry["size"] = len(variants[suffix])
+        else:
+            entry["file"] = _hashed_name(logical, digest)
+            _write(entry["file"], data)
+            entry["size"] = len(data)
+            if suffix in COMPRESSIBLE:
+                entry["encodings"] = _compress(entry["file"], data)
+
+        manifest[logical] = entry
+        print(f"{logical:<45}{len(data):>9} -> {entry['file']} ({entry['size']})"
+              + (" +webp" if "webp" in entry else "")
+              + "".join(f" +{e}" for e in entry.get("encodings", ())))
+
+    (DIST_DIR / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+def main() -> None:
+    if "--clean" in sys.argv[1:]:
+        shutil.rmtree(DIST_DIR, ignore_errors=True)
+        print(f"{DIST_DIR} eliminado")
+        return
+    if Image is None:
+        print("Pillow no está instalado: imágenes sin redimensionar ni WebP")
+    if brotli is None:
+        print("brotli no está instalado: solo se genera .gz")
+    manifest = build()
+    print(f"{len(manifest)} archivos -> {DIST_DIR / MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
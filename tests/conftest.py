@@ -0,0 +1,38 @@
+# tests/conftest.py
+"""
+Fixtures compartidas: la app con los datos seed (cargados una vez por
+sesión de pytest) y un cliente con la sesión de un usuario de cada rol.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import app as flask_app, initialize_data_once
+    initialize_data_once()
+    flask_app.config.update(TESTING=True)
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login_as(client):
+    """login_as(rol) deja en la sesión del cliente el primer usuario seed de ese rol"""
+    from data_layer.database.database import db
+
+    def login(role):
+        user = db.search("users", {"role": role})[0]
+        with client.session_transaction() as sess:
+            # como el login real: no queda nada de la sesión anterior
+            sess.clear()
+            sess["user_id"] = user["id"]
+            sess["username"] = user["username"]
+            sess["role"] = user["role"]
+        return user
+
+    return login
@@ -0,0 +1,215 @@
+# tests/integration/test_routes.py
+"""
+Rutas con el cliente de pruebas de Flask sobre los datos seed.
+"""
+
+import base64
+import json
+import time
+
+from business_logic.exceptions.auth_exceptions import AuthServiceBusyError
+from business_logic.utils.password_utils import get_hash_rounds, hash_password, verify_password
+from config import settings
+
+JSON = {"Accept": "application/json"}
+
+
+def _raw_cursor(value):
+    raw = json.dumps(value).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# ----------------- CONVOCATORIAS -----------------
+def test_listar_convocatorias_cursor_alterado(client, login_as):
+    login_as("docente")
+    # el valor del cursor debe ser del tipo del campo de orden
+    for query, tipo in (("", str), ("&orden=id", int), ("&ano=2024", str), ("&q=convocatoria", str)):
+        for value in (None, "a", [1], 5):
+            response = client.get(f"/convocatoria/listar?cursor={_raw_cursor([value, 1])}{query}")
+            assert response.status_code == (200 if isinstance(value, tipo) else 400)
+
+
+def test_crear_convocatoria_valida_campos(client, login_as):
+    login_as("administrador")
+    base = {
+        "tipo": "normal", "nombre": "Convocatoria de prueba", "fecha_inicio": "2024-01-01",
+        "fecha_fin": "2024-03-28", "estado": "planificada", "trimestre": 1,
+    }
+    for campo, valor in (("estado", "<img src=x onerror=alert(1)>"), ("tipo", "otro"), ("trimestre", 9)):
+        response = client.post("/convocatoria/crear", json={**base, campo: valor}, headers=JSON)
+        assert response.status_code == 400
+        assert response.get_json()["details"]["field"] == campo
+
+    response = client.post("/convocatoria/crear", json={**base, "trimestre": "T2"}, headers=JSON)
+    assert response.status_code == 200
+    assert response.get_json()["data"]["trimestre"] == 2
+
+
+def test_detalle_convocatoria_304_hasta_que_cambia(client, login_as):
+    login_as("administrador")
+    first = client.get("/convocatoria/detalle/1")
+    etag = first.headers["ETag"]
+    assert client.get("/convocatoria/detalle/1", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/convocatoria/editar/1", json={"nombre": "Renombrada"}, headers=JSON)
+    response = client.get("/convocatoria/detalle/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["data"]["nombre"] == "Renombrada"
+
+
+def test_crear_convocatoria_requiere_permiso(client, login_as):
+    assert client.post("/convocatoria/crear", json={}, headers=JSON).status_code == 401
+    login_as("docente")
+    assert client.post("/convocatoria/crear", json={}, headers=JSON).status_code == 403
+    response = client.post("/convocatoria/crear", data={"tipo": "normal"})
+    assert response.status_code == 302
+    assert response.headers["Location"].startswith("/dashboard")
+
+
+def test_exportar_convocatorias(client, login_as):
+    from data_layer.database.database import db
+    login_as("docente")
+    body = client.get("/convocatoria/exportar").get_json()
+    assert body["ok"] and [c["id"] for c in body["data"]] == sorted(c["id"] for c in db.convocatorias)
+
+    for url, headers in (("/convocatoria/exportar?formato=ndjson", {}),
+                         ("/convocatoria/exportar", {"Accept": "application/x-ndjson"})):
+        response = client.get(url, headers=headers)
+        assert response.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert rows == body["data"]
+
+    estado = body["data"][0]["estado"]
+    filtered = client.get(f"/convocatoria/exportar?estado={estado}").get_json()["data"]
+    assert filtered and all(c["estado"] == estado for c in filtered)
+    assert client.get("/convocatoria/exportar?ano=x", headers=JSON).status_code == 400
+
+
+# ----------------- SOLICITUDES -----------------
+def test_solicitudes_mias_paginas(client, login_as):
+    user = login_as("docente")
+    seen, cursor = [], None
+    while True:
+        url = "/solicitudes/mias?limite=3" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        seen.extend(body["data"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert all(sol["user_id"] == user["id"] for sol in seen)
+    keys = [(sol["created_at"], sol["id"]) for sol in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_solicitudes_cursor_alterado(client, login_as):
+    login_as("gestor")
+    for url in ("/solicitudes/mias", "/solicitudes/todas", "/solicitudes/convocatoria/1"):
+        for value in ([1, 1], [None, 1], [[1], 1], ["2024-01-01", "x"], "basura"):
+            response = client.get(f"{url}?cursor={_raw_cursor(value)}", headers=JSON)
+            assert response.status_code == 400
+            assert response.get_json()["details"]["field"] == "cursor"
+        assert client.get(f"{url}?cursor=%25%25", headers=JSON).status_code == 400
+
+
+def test_exportar_solicitudes_solo_propias(client, login_as):
+    from data_layer.database.database import db
+    from data_layer.models.user import ROLE_PERMISSION_MASKS, permission_mask
+    from business_logic.utils.permissions import SESSION_KEY
+    # el docente con más solicitudes
+    owner = max((u for u in db.users if u["role"] == "docente"),
+                key=lambda u: len(db.search("solicitudes", {"user_id": u["id"]})))
+    with client.session_transaction() as sess:
+        sess.update(user_id=owner["id"], username=owner["username"], role="docente")
+
+    response = client.get("/solicitudes/exportar?formato=ndjson")
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows and {r["user_id"] for r in rows} == {owner["id"]}
+    assert len(rows) == len(db.search("solicitudes", {"user_id": owner["id"]}))
+    assert "Cookie" in response.vary
+
+    # con permiso para ver todas, todas
+    with client.session_transaction() as sess:
+        sess[SESSION_KEY] = ROLE_PERMISSION_MASKS["docente"] | permission_mask("puede_ver_todas_solicitudes")
+    body = client.get("/solicitudes/exportar").get_json()
+    assert len(body["data"]) == len(db.solicitudes)
+
+    login_as("gestor")
+    assert client.get("/solicitudes/exportar", headers=JSON).status_code == 403
+
+
+# ----------------- LOGIN -----------------
+def test_login_bloquea_tras_fallos(client):
+    for _ in range(5):
+        response = client.post("/auth/login", json={"usuario": "no_existe", "password": "x"})
+        assert response.status_code == 404
+    response = client.post("/auth/login", json={"usuario": "no_existe", "password": "x"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_login_con_pool_saturado(client, monkeypatch):
+    from data_layer.database.database import db
+    from business_logic.utils.login_attempts import get_login_attempts
+    from presentation.routes import auth_routes
+
+    class Busy:
+        def verify(self, password, hashed_password):
+            raise AuthServiceBusyError(retry_after=4)
+
+    monkeypatch.setattr(auth_routes, "get_password_verifier", Busy)
+    username = db.search("users", {"role": "gestor"})[0]["username"]
+    # más intentos que el límite: la reserva se libera y no cuentan como fallos
+    for _ in range(8):
+        response = client.post("/auth/login", json={"usuario": username, "password": "x"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "4"
+    assert get_login_attempts().history(username) == []
+    get_login_attempts().check(username).release()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_login_sube_el_costo_del_hash(client, monkeypatch):
+    from data_layer.database.database import db
+    user = db.add_user({"username": "costo_bajo", "email": "costo_bajo@sgpi.test", "role": "docente",
+                        "password_hash": hash_password("clave-vieja", rounds=4)})
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+
+    response = client.post("/auth/login", json={"usuario": "costo_bajo", "password": "clave-vieja"})
+    assert response.status_code == 200
+    _wait_for(lambda: get_hash_rounds(db.get_user_by_id(user["id"])["password_hash"]) == 5)
+    assert verify_password("clave-vieja", db.get_user_by_id(user["id"])["password_hash"])
+
+
+def test_rehash_no_pisa_un_cambio_de_contrasena():
+    from data_layer.database.database import db
+    from presentation.routes.auth_routes import _store_rehash
+    old_hash = hash_password("clave-vieja", rounds=4)
+    user = db.add_user({"username": "cambio_en_curso", "email": "cambio@sgpi.test", "password_hash": old_hash})
+    # la contraseña cambia mientras se calculaba el hash nuevo de la vieja
+    changed = hash_password("clave-nueva", rounds=4)
+    db.update_user(user["id"], {"password_hash": changed})
+    _store_rehash(user["id"], old_hash, hash_password("clave-vieja", rounds=5))
+    assert db.get_user_by_id(user["id"])["password_hash"] == changed
+
+
+def test_metricas_de_login_solo_administracion(client, login_as):
+    login_as("docente")
+    assert client.get("/auth/metrics", headers=JSON).status_code == 403
+    login_as("administrador")
+    body = client.get("/auth/metrics", headers=JSON).get_json()
+    assert "attempts" in body["data"]
+
+
+# ----------------- DASHBOARD -----------------
+def test_metricas_de_cache_solo_administracion(client, login_as):
+    login_as("gestor")
+    assert client.get("/dashboard/cache", headers=JSON).status_code == 403
+    login_as("administrador")
+    assert client.get("/dashboard/cache", headers=JSON).get_json()["success"]
@@ -0,0 +1,150 @@
+# tests/unit/test_auditoria.py
+"""
+Bitácora de auditoría: lotes JSONL, cola llena (drop / block), rotación por
+tamaño, índice en memoria por entidad y vaciado de la cola al cerrar.
+"""
+
+import json
+import threading
+
+import pytest
+
+from data_layer.database.database import Database
+from data_layer.models.auditoria import AuditLog
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class _Stalled:
+    """Frena la escritura del primer lote hasta release()"""
+
+    def __init__(self, log):
+        self.entered, self.released = threading.Event(), threading.Event()
+        self.batches = []
+        write = log._write
+
+        def stalled(batch):
+            self.batches.append(len(batch))
+            self.entered.set()
+            self.released.wait()
+            write(batch)
+
+        log._write = stalled
+
+    def release(self):
+        self.released.set()
+
+
+def test_lotes_jsonl(tmp_path):
+    log = AuditLog(log_dir=tmp_path, flush_interval=0.01)
+    stall = _Stalled(log)
+    log.record("solicitudes", 0, "insert", user_id=7, data={"titulo": "ñandú"})
+    stall.entered.wait()
+    # mientras se escribe el primero, los demás se juntan en un solo lote
+    for i in range(1, 10):
+        log.record("solicitudes", i, "update")
+    stall.release()
+    log.close()
+
+    assert stall.batches == [1, 9]
+    events = _lines(tmp_path / AuditLog.FILE_NAME)
+    assert [e["entity_id"] for e in events] == list(range(10))
+    assert events[0]["user_id"] == 7 and events[0]["data"] == {"titulo": "ñandú"}
+    assert log.stats()["written"] == 10
+
+
+@pytest.mark.parametrize("overflow", ["drop", "block"])
+def test_cola_llena(tmp_path, overflow):
+    log = AuditLog(log_dir=tmp_path, max_queue=2, overflow=overflow, block_timeout=0.05)
+    stall = _Stalled(log)
+    assert log.record("convocatorias", 1, "insert")
+    stall.entered.wait()
+    assert log.record("convocatorias", 2, "insert")
+    assert log.record("convocatorias", 3, "insert")
+    assert not log.record("convocatorias", 4, "insert")
+
+    stats = log.stats()
+    assert (stats["enqueued"], stats["dropped"], stats["queue_depth"]) == (3, 1, 2)
+    # lo descartado tampoco aparece en el índice en memoria
+    assert log.events_for("convocatorias", 4) == []
+
+    stall.release()
+    log.close()
+    assert [e["entity_id"] for e in _lines(tmp_path / AuditLog.FILE_NAME)] == [1, 2, 3]
+    assert log.stats()["written"] == 3
+
+
+def test_block_espera_a_que_haya_lugar(tmp_path):
+    log = AuditLog(log_dir=tmp_path, max_queue=1, overflow="block", block_timeout=5)
+    stall = _Stalled(log)
+    log.record("solicitudes", 1, "insert")
+    stall.entered.wait()
+    log.record("solicitudes", 2, "insert")
+    threading.Timer(0.05, stall.release).start()
+    assert log.record("solicitudes", 3, "insert")
+    log.close()
+    assert log.stats()["dropped"] == 0
+    assert len(_lines(tmp_path / AuditLog.FILE_NAME)) == 3
+
+
+def test_rotacion(tmp_path):
+    log = AuditLog(log_dir=tmp_path, batch_size=1, max_bytes=300, backups=2)
+    for i in range(40):
+        log.record("solicitudes", i, "update", data={"relleno": "x" * 50})
+    log.close()
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    # el archivo actual puede no existir si el último lote justo lo rotó
+    assert names[-2:] == ["auditoria.log.1", "auditoria.log.2"]
+    assert set(names) <= {"auditoria.log", "auditoria.log.1", "auditoria.log.2"}
+    rotated = tmp_path / "auditoria.log.1"
+    assert 300 <= rotated.stat().st_size < 300 + 200
+    # los respaldos guardan lo más reciente, en orden
+    ids = [e["entity_id"] for name in names[::-1] for e in _lines(tmp_path / name)]
+    assert ids == list(range(40 - len(ids), 40))
+
+
+def test_rotacion_sin_respaldos(tmp_path):
+    log = AuditLog(log_dir=tmp_path, batch_size=1, max_bytes=100, backups=0)
+    for i in range(5):
+        log.record("solicitudes", i, "update", data={"relleno": "x" * 100})
+    log.close()
+    assert [p.name for p in tmp_path.iterdir()] == []
+
+
+def test_events_for_orden_y_limite():
+    log = AuditLog(recent_per_entity=4, max_entities=2)
+    for action in ("insert", "update", "update", "update", "delete"):
+        log.record("solicitudes", 1, action)
+    log.record("solicitudes", 2, "insert")
+
+    events = log.events_for("solicitudes", 1)
+    assert [e["action"] for e in events] == ["delete", "update", "update", "update"]
+    assert [e["ts"] for e in events] == sorted((e["ts"] for e in events), reverse=True)
+    assert [e["action"] for e in log.events_for("solicitudes", 1, limit=2)] == ["delete", "update"]
+    assert log.events_for("solicitudes", 1, limit=0) == []
+
+    # LRU por entidad: la menos usada sale al pasar max_entities
+    log.record("solicitudes", 3, "insert")
+    assert log.events_for("solicitudes", 1) == []
+    assert log.stats()["tracked_entities"] == 2
+
+
+def test_close_vacia_la_cola_y_se_desconecta(tmp_path):
+    db = Database()
+    log = AuditLog(log_dir=tmp_path, flush_interval=5, batch_size=7)
+    log.attach(db, actor=lambda: 42)
+    for i in range(100):
+        db.add_solicitud({"titulo": f"S{i}", "tipo": "patente"})
+    db.add_user({"username": "ana", "email": "ana@sgpi.test"})
+    log.close()
+
+    events = _lines(tmp_path / AuditLog.FILE_NAME)
+    assert len(events) == 100
+    assert {(e["entity"], e["action"], e["user_id"]) for e in events} == {("solicitudes", "insert", 42)}
+    assert log.stats()["queue_depth"] == 0
+    # después de cerrar ya no escucha a la base
+    db.update_solicitud(1, {"estado": "enviada"})
+    assert log.stats()["enqueued"] == 100
@@ -0,0 +1,110 @@
+# tests/unit/test_compression.py
+"""
+Negociación de Content-Encoding (brotli / gzip / nada), casos que no se
+comprimen, streaming fragmento a fragmento y sufijo del ETag.
+"""
+
+import gzip
+import json
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify, send_file
+
+from business_logic.utils import compression
+from business_logic.utils.compression import ResponseCompressor
+
+BIG = {"data": [{"id": i, "titulo": f"Solicitud {i}"} for i in range(100)]}
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = Flask(__name__)
+    app.after_request(ResponseCompressor(min_size=500))
+    image = tmp_path / "logo.png"
+    image.write_bytes(b"\x89PNG" + b"\0" * 2000)
+
+    @app.get("/big")
+    def big():
+        response = jsonify(BIG)
+        response.set_etag("conv-list-3")
+        return response
+
+    @app.get("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.get("/png")
+    def png():
+        return send_file(image)
+
+    @app.get("/no-transform")
+    def no_transform():
+        response = jsonify(BIG)
+        response.headers["Cache-Control"] = "no-transform"
+        return response
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            yield '{"data":['
+            yield ",".join(json.dumps(r) for r in BIG["data"])
+            yield "]}"
+        return Response(chunks(), mimetype="application/json")
+
+    return app.test_client()
+
+
+def test_gzip(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.get_etag() == ("conv-list-3-gz", False)
+    assert "Accept-Encoding" in response.vary
+    assert json.loads(gzip.decompress(response.data)) == BIG
+
+
+def test_brotli_preferido():
+    brotli = pytest.importorskip("brotli")
+    app = Flask(__name__)
+    app.after_request(ResponseCompressor())
+    app.add_url_rule("/big", "big", lambda: jsonify(BIG))
+    response = app.test_client().get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.data)) == BIG
+
+
+@pytest.mark.parametrize("accept", [None, "identity", "br;q=0, gzip;q=0"])
+def test_sin_codificacion_aceptada(client, monkeypatch, accept):
+    monkeypatch.setattr(compression, "brotli", None)
+    headers = {"Accept-Encoding": accept} if accept else {}
+    response = client.get("/big", headers=headers)
+    assert "Content-Encoding" not in response.headers
+    assert response.get_etag() == ("conv-list-3", False)
+    # el cuerpo depende igual de Accept-Encoding
+    assert "Accept-Encoding" in response.vary
+    assert response.get_json() == BIG
+
+
+@pytest.mark.parametrize("path", ["/small", "/png", "/no-transform"])
+def test_no_se_comprime(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_head_no_se_comprime(client):
+    response = client.head("/big", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streaming_por_fragmentos(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    decompressor = zlib.decompressobj(31)
+    parts = [decompressor.decompress(chunk) for chunk in response.response]
+    # cada fragmento se puede descomprimir al llegar (flush por fragmento)
+    assert parts[0] == b'{"data":['
+    assert json.loads(b"".join(parts) + decompressor.flush()) == BIG
+    response.close()
@@ -0,0 +1,159 @@
+# tests/unit/test_database_indexes.py
+"""
+Índices y planificador de la base en memoria: los resultados con índices
+deben coincidir con recorrer la colección, también después de modificar y
+borrar registros.
+"""
+
+import random
+import threading
+
+import pytest
+
+from data_layer.database.database import Database
+from data_layer.database.indexes import matches
+
+ESTADOS = ["borrador", "enviada", "aprobada", "rechazada"]
+TIPOS = ["patente", "marca", "derecho_autor"]
+
+
+def _brute(db, name, query):
+    return sorted((r for r in getattr(db, name) if matches(r, query)), key=lambda r: r["id"])
+
+
+def _page_all(db, name, query, order_by, descending, limit=7):
+    pages, after = [], None
+    while True:
+        page = db.search_page(name, query, order_by=order_by, descending=descending,
+                              after=after, limit=limit)
+        pages.extend(page)
+        if len(page) < limit:
+            return pages
+        after = (page[-1][order_by], page[-1]["id"])
+
+
+@pytest.fixture
+def db():
+    rng = random.Random(7)
+    database = Database()
+    database.add_users(
+        {"username": f"user{i}", "email": f"user{i}@sgpi.test", "role": rng.choice(["admin", "investigador"])}
+        for i in range(50)
+    )
+    database.add_solicitudes(
+        {
+            "titulo": f"Solicitud {i}",
+            "tipo": rng.choice(TIPOS),
+            "estado": rng.choice(ESTADOS),
+            "user_id": rng.randint(1, 10),
+            "convocatoria_id": rng.randint(1, 4),
+            "created_at": f"2024-01-{rng.randint(1, 28):02d}T00:00:00",
+        }
+        for i in range(400)
+    )
+    return database
+
+
+def _mutate(db, rng, rounds=200):
+    for _ in range(rounds):
+        ids = list(db._by_id["solicitudes"])
+        sol_id = rng.choice(ids)
+        if rng.random() < 0.3:
+            db.delete_solicitud(sol_id)
+        else:
+            db.update_solicitud(sol_id, {
+                "estado": rng.choice(ESTADOS),
+                "user_id": rng.randint(1, 10),
+                "created_at": f"2024-02-{rng.randint(1, 28):02d}T00:00:00",
+            })
+
+
+QUERIES = [
+    {"estado": "enviada"},
+    {"estado": "enviada", "tipo": "marca"},
+    {"user_id": 3, "estado": {"$eq": "aprobada"}},
+    {"convocatoria_id": 2, "created_at": {"$gte": "2024-01-10", "$lt": "2024-02-15"}},
+    {"titulo": "Solicitud 17"},
+    {"codigo": "PA-2024-0005"},
+]
+
+
+def test_lookup_por_id_y_campo_unico(db):
+    user = db.find_user_by_username("user7")
+    assert user is not None
+    assert db.get_user_by_id(user["id"]) is user
+    assert db.find_user_by_email("user7@sgpi.test") is user
+    assert db.find_user_by_username("nadie") is None
+
+
+def test_plan_usa_indices(db):
+    assert db.explain("solicitudes", {"estado": "enviada"})["strategy"] == "index"
+    assert db.explain("solicitudes", {"titulo": "Solicitud 1"})["strategy"] == "scan"
+    plan = db.explain("solicitudes", {"estado": "enviada", "titulo": "x"})
+    assert plan["residual"] == ["titulo"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_coincide_con_recorrido(db, query):
+    _mutate(db, random.Random(1))
+    assert db.search("solicitudes", query) == _brute(db, "solicitudes", query)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("query", [{}, {"user_id": 4}, {"convocatoria_id": 1, "estado": "borrador"}])
+def test_search_page_coincide_con_recorrido(db, query, descending):
+    _mutate(db, random.Random(2))
+    expected = sorted(_brute(db, "solicitudes", query),
+                      key=lambda r: (r["created_at"], r["id"]), reverse=descending)
+    assert _page_all(db, "solicitudes", query, "created_at", descending) == expected
+
+
+def test_indices_consistentes_tras_modificar_y_borrar(db):
+    _mutate(db, random.Random(3), rounds=400)
+    rows = db.solicitudes
+    assert len(rows) == len(db._by_id["solicitudes"])
+    assert all(db._positions["solicitudes"][r["id"]] == i for i, r in enumerate(rows))
+    assert all(db._by_id["solicitudes"][r["id"]] is r for r in rows)
+    for sol in rows:
+        assert db.find_solicitud_by_codigo(sol["codigo"]) is sol
+    for estado in ESTADOS:
+        assert db.search("solicitudes", {"estado": estado}) == _brute(db, "solicitudes", {"estado": estado})
+
+
+def test_modificar_campo_unico_mueve_la_entrada(db):
+    user = db.find_user_by_username("user3")
+    db.update_user(user["id"], {"username": "user3b"})
+    assert db.find_user_by_username("user3") is None
+    assert db.find_user_by_username("user3b")["id"] == user["id"]
+
+
+def test_borrado_fisico(db):
+    user = db.find_user_by_username("user0")
+    assert db.delete_user(user["id"], soft_delete=False)
+    assert db.get_user_by_id(user["id"]) is None
+    assert db.find_user_by_email("user0@sgpi.test") is None
+    assert len(db.users) == 49
+    assert not db.delete_user(user["id"], soft_delete=False)
+
+
+def test_lecturas_sin_lock_durante_modificaciones(db):
+    user = db.find_user_by_username("user1")
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            db.update_user(user["id"], {"last_login": str(i)})
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    misses = 0
+    try:
+        for _ in range(50000):
+            if db.get_user_by_id(user["id"]) is None or db.find_user_by_username("user1") is None:
+                misses += 1
+    finally:
+        stop.set()
+        thread.join()
+    assert misses == 0
@@ -0,0 +1,86 @@
+# tests/unit/test_http_cache.py
+"""
+Respuestas condicionales: 304 sin armar el cuerpo cuando el cliente ya tiene
+la versión (ETag o Last-Modified), incluida la variante comprimida.
+"""
+
+from email.utils import formatdate
+
+import pytest
+from flask import Flask, jsonify
+
+from business_logic.utils.http_cache import args_digest, conditional, make_etag
+
+MODIFIED = 1_700_000_000.75
+
+
+@pytest.fixture
+def request_with():
+    app = Flask(__name__)
+
+    def context(**headers):
+        return app.test_request_context("/", headers=headers)
+
+    return context
+
+
+def _build(calls):
+    def build():
+        calls.append(1)
+        return jsonify({"ok": True})
+    return build
+
+
+def test_primera_respuesta_lleva_validadores(request_with):
+    calls = []
+    with request_with():
+        response = conditional("conv-7", MODIFIED, _build(calls), per_user=True)
+    assert response.status_code == 200 and calls == [1]
+    assert response.get_etag() == ("conv-7", False)
+    assert int(response.last_modified.timestamp()) == int(MODIFIED)
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert "Cookie" in response.vary
+
+
+@pytest.mark.parametrize("if_none_match", ['"conv-7"', '"otro", "conv-7"', '"conv-7-gz"', '"conv-7-br"', "*"])
+def test_if_none_match_devuelve_304_sin_armar(request_with, if_none_match):
+    calls = []
+    with request_with(**{"If-None-Match": if_none_match}):
+        response = conditional("conv-7", MODIFIED, _build(calls))
+    assert response.status_code == 304 and calls == []
+    assert response.get_etag() == ("conv-7", False)
+
+
+@pytest.mark.parametrize("if_none_match", ['"conv-6"', '"conv-7-zz"', 'W/"conv-"'])
+def test_etag_distinto_arma_la_respuesta(request_with, if_none_match):
+    calls = []
+    with request_with(**{"If-None-Match": if_none_match}):
+        response = conditional("conv-7", MODIFIED, _build(calls))
+    assert response.status_code == 200 and calls == [1]
+
+
+def test_if_modified_since(request_with):
+    calls = []
+    with request_with(**{"If-Modified-Since": formatdate(int(MODIFIED), usegmt=True)}):
+        assert conditional("conv-7", MODIFIED, _build(calls)).status_code == 304
+    with request_with(**{"If-Modified-Since": formatdate(int(MODIFIED) - 1, usegmt=True)}):
+        assert conditional("conv-7", MODIFIED, _build(calls)).status_code == 200
+    # If-None-Match manda aunque la fecha coincida
+    with request_with(**{"If-None-Match": '"conv-6"',
+                         "If-Modified-Since": formatdate(int(MODIFIED), usegmt=True)}):
+        assert conditional("conv-7", MODIFIED, _build(calls)).status_code == 200
+    assert calls == [1, 1]
+
+
+def test_errores_sin_validadores(request_with):
+    with request_with():
+        response = conditional("conv-7", MODIFIED, lambda: (jsonify({"ok": False}), 400))
+    assert response.status_code == 400
+    assert response.get_etag() == (None, None)
+    assert "Cache-Control" not in response.headers
+
+
+def test_etag_y_huella_de_parametros():
+    assert make_etag("conv", 7, 3) == "conv-7-3"
+    assert args_digest([("b", "2"), ("a", "1")]) == args_digest([("a", "1"), ("b", "2")])
+    assert args_digest([("a", "1")]) != args_digest([("a", "2")])
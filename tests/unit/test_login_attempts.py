@@ -0,0 +1,116 @@
+# tests/unit/test_login_attempts.py
+"""
+Limitación de intentos de login por usuario e IP (ventana deslizante) y
+reserva de intentos en curso.
+"""
+
+import threading
+
+import pytest
+
+from business_logic.exceptions.auth_exceptions import LoginThrottledError
+from business_logic.utils.login_attempts import LoginAttemptStore
+
+
+def _fail(store, username, ip="10.0.0.1"):
+    with store.check(username, ip) as attempt:
+        attempt.record(False, "password_incorrecto")
+
+
+def test_bloquea_tras_max_fallos():
+    store = LoginAttemptStore(max_failures=3, window=60)
+    for _ in range(3):
+        _fail(store, "ana")
+    with pytest.raises(LoginThrottledError) as exc:
+        store.check("ANA ", "10.0.0.2")
+    assert 1 <= exc.value.retry_after <= 61
+    # otro usuario desde otra IP no se ve afectado
+    store.check("beto", "10.0.0.3").release()
+    assert store.stats()["throttled"] == 1
+
+
+def test_exito_limpia_los_fallos():
+    store = LoginAttemptStore(max_failures=3, window=60)
+    for _ in range(2):
+        _fail(store, "ana")
+    with store.check("ana", "10.0.0.1") as attempt:
+        attempt.record(True)
+    for _ in range(2):
+        _fail(store, "ana")
+    store.check("ana", "10.0.0.1").release()
+    assert [h["success"] for h in store.history("ana")] == [False, False, True, False, False]
+
+
+def test_ventana_vencida_desbloquea(monkeypatch):
+    store = LoginAttemptStore(max_failures=2, window=10)
+    now = [1000.0]
+    monkeypatch.setattr("business_logic.utils.login_attempts.time.time", lambda: now[0])
+    _fail(store, "ana")
+    _fail(store, "ana")
+    with pytest.raises(LoginThrottledError):
+        store.check("ana")
+    now[0] += 11
+    store.check("ana").release()
+
+
+def test_limite_por_ip():
+    store = LoginAttemptStore(max_failures=100, ip_max_failures=4, window=60)
+    for i in range(4):
+        _fail(store, f"usuario{i}", ip="10.9.9.9")
+    with pytest.raises(LoginThrottledError):
+        store.check("otro", "10.9.9.9")
+    assert store.ip_stats("10.9.9.9") == {"attempts": 4, "failed": 4, "succeeded": 0}
+
+
+def test_rafaga_concurrente_respeta_el_limite():
+    store = LoginAttemptStore(max_failures=5, window=60)
+    threads = 40
+    barrier = threading.Barrier(threads)
+    admitted = []
+    lock = threading.Lock()
+
+    def login():
+        try:
+            attempt = store.check("ana", "10.0.0.1")
+        except LoginThrottledError:
+            attempt = None
+        with lock:
+            admitted.append(attempt is not None)
+        # todos los controles pasan antes de registrar cualquier fallo
+        barrier.wait()
+        if attempt is not None:
+            attempt.record(False, "password_incorrecto")
+
+    workers = [threading.Thread(target=login) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    assert sum(admitted) == 5
+    with pytest.raises(LoginThrottledError):
+        store.check("ana", "10.0.0.1")
+
+
+def test_reserva_sin_resultado_se_libera():
+    store = LoginAttemptStore(max_failures=2, window=60)
+    first = store.check("ana")
+    second = store.check("ana")
+    with pytest.raises(LoginThrottledError):
+        store.check("ana")
+    # p. ej. el pool de bcrypt estaba saturado: no cuenta como fallo
+    with first:
+        pass
+    second.release()
+    store.check("ana").release()
+    assert store.history("ana") == []
+
+
+def test_memoria_acotada():
+    store = LoginAttemptStore(history_size=3, max_failures=100, max_keys=10)
+    for i in range(100):
+        _fail(store, f"usuario{i}", ip=f"10.0.0.{i}")
+    for _ in range(10):
+        _fail(store, "usuario99", ip="10.0.0.99")
+    stats = store.stats()
+    assert stats["tracked_users"] == 10 and stats["tracked_ips"] == 10
+    assert len(store.history("usuario99")) == 3
@@ -0,0 +1,98 @@
+# tests/unit/test_pagination.py
+"""
+Cursores de paginación: ida y vuelta, y cursores alterados por el cliente
+(deben terminar en ValidationError, nunca en un TypeError del índice).
+"""
+
+import base64
+import json
+
+import pytest
+
+from business_logic.exceptions.validation_exceptions import ValidationError
+from business_logic.services.convocatorias_service import ConvocatoriasService, validar_campos
+from business_logic.utils.pagination import decode_cursor, encode_cursor
+from data_layer.database.database import Database
+
+
+def _raw_cursor(value):
+    raw = json.dumps(value).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.fixture
+def service():
+    db = Database()
+    db.add_convocatorias(
+        {
+            "nombre": f"Convocatoria {i}",
+            "tipo": "normal" if i % 2 else "extraordinaria",
+            "ano": 2023 + i % 2,
+            "estado": "registro",
+            "fecha_inicio": f"2024-{i % 12 + 1:02d}-01",
+            "fecha_fin": f"2024-{i % 12 + 1:02d}-28",
+        }
+        for i in range(30)
+    )
+    svc = ConvocatoriasService()
+    svc.db = db
+    return svc
+
+
+def test_ida_y_vuelta():
+    record = {"id": 7, "fecha_inicio": "2024-03-01"}
+    assert decode_cursor(encode_cursor(record, "fecha_inicio"), str) == ("2024-03-01", 7)
+    assert decode_cursor(encode_cursor(record, "id"), int) == (7, 7)
+
+
+@pytest.mark.parametrize("cursor", [
+    "no-es-base64!!",
+    _raw_cursor("texto"),
+    _raw_cursor([1, 2, 3]),
+    _raw_cursor(["2024-01-01", "7"]),
+    _raw_cursor(["2024-01-01", True]),
+])
+def test_cursor_malformado(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("value", [None, 5, [1], {"a": 1}, True])
+def test_cursor_con_valor_de_otro_tipo(value):
+    with pytest.raises(ValidationError) as exc:
+        decode_cursor(_raw_cursor([value, 1]), str)
+    assert exc.value.details["field"] == "cursor"
+
+
+def test_recorrer_paginas(service):
+    seen, cursor = [], None
+    while True:
+        page = service.listar(orden="fecha_inicio", cursor=cursor, limite=7)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == list(range(1, 31))
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.parametrize("kwargs,value", [
+    ({}, None),
+    ({"orden": "id"}, "a"),
+    ({}, [1]),
+    ({"ano": "2024"}, 5),
+    ({"texto": "convocatoria"}, 5),
+])
+def test_cursor_alterado_en_listado(service, kwargs, value):
+    with pytest.raises(ValidationError):
+        service.listar(cursor=_raw_cursor([value, 1]), **kwargs)
+
+
+def test_validar_campos():
+    assert validar_campos({"tipo": "normal", "estado": "registro", "trimestre": "T2"}) == {
+        "tipo": "normal", "estado": "registro", "trimestre": 2,
+    }
+    assert validar_campos({"trimestre": ""}) == {"trimestre": None}
+    for data in ({"tipo": "<img src=x>"}, {"estado": "abierta"}, {"trimestre": 5}, {"trimestre": "x"}):
+        with pytest.raises(ValidationError):
+            validar_campos(data)
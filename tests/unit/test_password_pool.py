@@ -0,0 +1,108 @@
+# tests/unit/test_password_pool.py
+"""
+Control de admisión del pool de bcrypt: rechazo inmediato con el pool
+lleno, cupos que se liberan aunque la espera venza y contadores de stats().
+"""
+
+import threading
+import time
+
+import pytest
+
+from business_logic.exceptions.auth_exceptions import AuthServiceBusyError
+from business_logic.utils import password_pool
+from business_logic.utils.password_pool import PasswordVerifier
+
+
+@pytest.fixture
+def stalled(monkeypatch):
+    """verify_password espera hasta release.set()"""
+    started, release = threading.Semaphore(0), threading.Event()
+
+    def slow_verify(password, hashed_password):
+        started.release()
+        release.wait()
+        return password == hashed_password
+
+    monkeypatch.setattr(password_pool, "verify_password", slow_verify)
+    yield started, release
+    release.set()
+
+
+def _wait_for(verifier, **expected):
+    deadline = time.monotonic() + 5
+    while any(verifier.stats()[k] != v for k, v in expected.items()):
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def _in_background(verifier, results, password="x", hashed="x"):
+    def run():
+        try:
+            results.append(verifier.verify(password, hashed))
+        except AuthServiceBusyError as e:
+            results.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_pool_saturado_rechaza_al_instante(stalled):
+    started, release = stalled
+    verifier = PasswordVerifier(max_workers=1, max_queue=1, retry_after=3)
+    results = []
+    threads = [_in_background(verifier, results) for _ in range(2)]
+    started.acquire()
+    _wait_for(verifier, running=1, queue_depth=1)      # uno corre, el otro espera
+    with pytest.raises(AuthServiceBusyError) as exc:
+        verifier.verify("x", "x")
+    assert exc.value.retry_after == 3
+
+    stats = verifier.stats()
+    assert (stats["running"], stats["queue_depth"], stats["submitted"], stats["rejected"]) == (1, 1, 2, 1)
+    # rehash_async tampoco entra sin cupo
+    assert verifier.rehash_async("x", lambda new_hash: None) is False
+
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == [True, True]
+    assert verifier.verify("x", "y") is False
+    verifier.shutdown()
+
+
+def test_cupo_liberado_tras_timeout(stalled):
+    started, release = stalled
+    verifier = PasswordVerifier(max_workers=1, max_queue=0, timeout=0.05)
+    with pytest.raises(AuthServiceBusyError):
+        verifier.verify("x", "x")
+    # la verificación sigue corriendo y conserva su cupo hasta terminar
+    started.acquire()
+    with pytest.raises(AuthServiceBusyError):
+        verifier.verify("x", "x")
+    assert verifier.stats()["rejected"] == 1
+
+    release.set()
+    _wait_for(verifier, running=0, queue_depth=0)
+    assert verifier.verify("x", "x") is True
+    assert verifier.stats()["submitted"] == 2
+    verifier.shutdown()
+
+
+def test_stats():
+    verifier = PasswordVerifier(max_workers=2, max_queue=4)
+    assert verifier.stats()["verify_ms"] == {"count": 0}
+    for _ in range(3):
+        verifier.verify("clave", "no-es-un-hash")
+    done = threading.Event()
+    assert verifier.rehash_async("clave", lambda new_hash: done.set())
+    done.wait(5)
+    verifier.shutdown()
+
+    stats = verifier.stats()
+    assert (stats["workers"], stats["max_queue"]) == (2, 4)
+    assert (stats["submitted"], stats["rejected"], stats["running"], stats["queue_depth"]) == (3, 0, 0, 0)
+    assert stats["verify_ms"]["count"] == 3
+    # la espera en cola se mide también para los rehash
+    assert stats["queue_wait_ms"]["count"] == 4
+    assert stats["verify_ms"]["p50"] <= stats["verify_ms"]["p95"] <= stats["verify_ms"]["max"]
@@ -0,0 +1,49 @@
+# tests/unit/test_password_utils.py
+"""
+Costo de los hashes bcrypt: lectura del costo, cuándo hay que rehashear y
+hash en paralelo.
+"""
+
+import pytest
+
+from business_logic.utils.password_utils import (
+    get_hash_rounds, hash_password, hash_passwords, needs_rehash, verify_password,
+)
+from config import settings
+
+
+def test_costo_del_hash():
+    assert get_hash_rounds(hash_password("secreta", rounds=4)) == 4
+    assert get_hash_rounds("$2b$12$" + "a" * 53) == 12
+    for not_bcrypt in ("", None, "texto-plano", "$2b$xx$abc", "$2b"):
+        assert get_hash_rounds(not_bcrypt) is None
+
+
+def test_costo_por_defecto(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    assert get_hash_rounds(hash_password("secreta")) == 5
+
+
+@pytest.mark.parametrize("rounds, target, expected", [
+    (4, 5, True),     # subir el costo
+    (6, 5, True),     # bajarlo también
+    (5, 5, False),
+])
+def test_needs_rehash(monkeypatch, rounds, target, expected):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", target)
+    hashed = hash_password("secreta", rounds=rounds)
+    assert needs_rehash(hashed) is expected
+    assert needs_rehash(hashed, rounds=rounds) is False
+
+
+def test_needs_rehash_ignora_lo_que_no_es_bcrypt():
+    assert needs_rehash("") is False
+    assert needs_rehash("texto-plano", rounds=4) is False
+
+
+def test_hash_en_paralelo():
+    hashes = hash_passwords(["a1", "b2", "a1", "c3"], rounds=4, max_workers=2)
+    assert list(hashes) == ["a1", "b2", "c3"]
+    assert all(verify_password(p, h) and get_hash_rounds(h) == 4 for p, h in hashes.items())
+    assert verify_password("otra", hashes["a1"]) is False
+    assert verify_password("a1", "no-es-un-hash") is False
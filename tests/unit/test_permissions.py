@@ -0,0 +1,149 @@
+# tests/unit/test_permissions.py
+"""
+Permisos por máscara de bits: máscaras por rol iguales a los permisos por
+defecto de antes, permisos por usuario y el decorador permission_required.
+"""
+
+import pytest
+from flask import Blueprint, Flask, jsonify, session
+
+from business_logic.utils.decorators import permission_required
+from business_logic.utils.permissions import (
+    SESSION_KEY, session_can_access_module, store_session_permissions, user_permission_mask,
+)
+from data_layer.models.user import (
+    MODULE_PERMISSIONS, PERMISSION_NAMES, ROLE_PERMISSION_MASKS, User, UserPermissions, UserRole,
+    compile_permissions, mask_to_permissions, permission_mask,
+)
+
+# lo que concedía User._get_default_permissions antes de las máscaras
+LEGACY_GRANTS = {
+    UserRole.ADMINISTRADOR: {
+        "puede_gestionar_convocatorias", "puede_crear_convocatorias", "puede_publicar_convocatorias",
+        "puede_gestionar_usuarios", "puede_ver_reportes", "puede_exportar_datos",
+    },
+    UserRole.GESTOR: {"puede_prevalidar_solicitudes", "puede_ver_todas_solicitudes"},
+    UserRole.DOCENTE: {"puede_gestionar_solicitudes", "puede_exportar_datos"},
+    UserRole.COORDINADOR: {
+        "puede_gestionar_convocatorias", "puede_gestionar_solicitudes", "puede_ver_reportes",
+        "puede_exportar_datos", "puede_validar_solicitudes", "puede_ver_todas_solicitudes",
+        "puede_crear_convocatorias", "puede_publicar_convocatorias",
+    },
+}
+
+
+def _legacy_permissions(role):
+    permissions = UserPermissions()
+    for name in LEGACY_GRANTS[role]:
+        setattr(permissions, name, True)
+    return permissions
+
+
+# ----------------- MÁSCARAS -----------------
+@pytest.mark.parametrize("role", list(UserRole))
+def test_mascara_del_rol_igual_a_los_permisos_de_antes(role):
+    expected = _legacy_permissions(role)
+    assert mask_to_permissions(ROLE_PERMISSION_MASKS[role.value]) == expected
+    user = User(id=1, username="u", email="u@sgpi.test", password_hash="", role=role)
+    assert user.permissions == expected
+    for name in PERMISSION_NAMES:
+        assert user.has_permission(name) is getattr(expected, name)
+    for module, name in MODULE_PERMISSIONS.items():
+        assert user.can_access_module(module) is getattr(expected, name)
+    assert user.has_permission("no_existe") is False
+    assert user.can_access_module("no_existe") is False
+
+
+def test_permisos_por_usuario():
+    overrides = {"puede_ver_reportes": True, "puede_exportar_datos": False, "no_existe": True}
+    mask = compile_permissions(UserRole.DOCENTE, overrides)
+    assert mask == compile_permissions("docente", overrides)
+    permissions = mask_to_permissions(mask)
+    assert permissions.puede_ver_reportes and permissions.puede_gestionar_solicitudes
+    assert not permissions.puede_exportar_datos
+    assert user_permission_mask({"role": "docente", "permissions": overrides}) == mask
+    # sin overrides (o rol desconocido) queda la máscara del rol / la base
+    assert compile_permissions("gestor", None) == ROLE_PERMISSION_MASKS["gestor"]
+    assert compile_permissions("otro") == permission_mask("puede_ver_dashboard")
+
+
+def test_permiso_desconocido():
+    with pytest.raises(ValueError):
+        permission_mask("puede_volar")
+    with pytest.raises(ValueError):
+        permission_required("puede_volar")
+
+
+# ----------------- DECORADOR -----------------
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    auth = Blueprint("auth", __name__)
+    auth.add_url_rule("/login", "login_page", lambda: "login")
+    dashboard = Blueprint("dashboard", __name__)
+    dashboard.add_url_rule("/", "dashboard_home", lambda: "inicio")
+    app.register_blueprint(auth, url_prefix="/auth")
+    app.register_blueprint(dashboard, url_prefix="/dashboard")
+
+    @app.get("/usuarios")
+    @permission_required("puede_gestionar_usuarios")
+    def usuarios():
+        return jsonify({"ok": True})
+
+    @app.get("/reportes")
+    @permission_required("puede_ver_reportes", "puede_exportar_datos", any_of=True)
+    def reportes():
+        return jsonify({"ok": True})
+
+    @app.get("/login-como/<role>")
+    def login_como(role):
+        user = {"role": role, "permissions": {"puede_gestionar_usuarios": True}}
+        session.update(user_id=1, role=role)
+        store_session_permissions(user)
+        return jsonify({"modulo": session_can_access_module("usuarios")})
+
+    return app
+
+
+def _session(client, **values):
+    with client.session_transaction() as sess:
+        sess.update(values)
+
+
+def test_sin_sesion(app):
+    client = app.test_client()
+    assert client.get("/usuarios", headers={"Accept": "application/json"}).status_code == 401
+    response = client.get("/usuarios")
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/auth/login")
+
+
+def test_sin_permiso(app):
+    client = app.test_client()
+    _session(client, user_id=1, role="docente", **{SESSION_KEY: ROLE_PERMISSION_MASKS["docente"]})
+    response = client.get("/usuarios", headers={"Accept": "application/json"})
+    assert response.status_code == 403
+    assert response.get_json()["msg"] == "permiso denegado"
+    response = client.get("/usuarios", headers={"Accept": "text/html"})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/dashboard/")
+    # any_of: alcanza con uno de los dos
+    assert client.get("/reportes").status_code == 200
+
+
+def test_mascara_de_la_sesion_manda_sobre_el_rol(app):
+    client = app.test_client()
+    # el login guarda la máscara con los permisos concedidos al usuario
+    assert client.get("/login-como/docente").get_json() == {"modulo": True}
+    assert client.get("/usuarios").status_code == 200
+
+    _session(client, **{SESSION_KEY: 0})
+    assert client.get("/reportes").status_code == 302
+
+
+@pytest.mark.parametrize("role, status", [("administrador", 200), ("gestor", 302), ("desconocido", 302)])
+def test_sesion_anterior_sin_mascara_usa_el_rol(app, role, status):
+    client = app.test_client()
+    _session(client, user_id=1, role=role)
+    assert client.get("/usuarios").status_code == status
@@ -0,0 +1,188 @@
+# tests/unit/test_persistence.py
+"""
+Persistencia de la base en memoria: secuencias de ids, journal (reproducción,
+línea incompleta, compactación), write-behind y snapshot binario con vuelta
+a JSON cuando no sirve.
+"""
+
+import json
+import os
+
+import pytest
+
+from data_layer.database import binary_snapshot
+from data_layer.database.database import Database
+
+
+def _state(db):
+    return {name: sorted(getattr(db, name), key=lambda r: r["id"])
+            for name in ("users", "convocatorias", "solicitudes")}
+
+
+def _populate(db):
+    users = db.add_users({"username": f"u{i}", "email": f"u{i}@sgpi.test"} for i in range(5))
+    conv = db.add_convocatoria({"nombre": "Convocatoria 1", "estado": "registro"})
+    sols = db.add_solicitudes(
+        {"titulo": f"S{i}", "tipo": "patente", "user_id": users[0]["id"], "convocatoria_id": conv["id"]}
+        for i in range(4)
+    )
+    db.update_user(users[1]["id"], {"role": "gestor"})
+    db.update_solicitud(sols[0]["id"], {"estado": "enviada"})
+    db.delete_user(users[4]["id"], soft_delete=False)
+    db.delete_solicitud(sols[3]["id"])
+    return users, sols
+
+
+# ----------------- SECUENCIAS -----------------
+def test_ids_no_se_reutilizan(tmp_path):
+    db = Database(persist_to_disk=True, data_dir=str(tmp_path))
+    users, sols = _populate(db)
+    db.close()
+
+    reopened = Database(persist_to_disk=True, data_dir=str(tmp_path))
+    assert _state(reopened) == _state(db)
+    # el último id se borró: el siguiente no lo repite
+    assert reopened.add_user({"username": "nuevo", "email": "n@sgpi.test"})["id"] == users[-1]["id"] + 1
+    assert reopened.add_solicitud({"titulo": "otra", "tipo": "marca"})["id"] == sols[-1]["id"] + 1
+    reopened.close()
+
+
+# ----------------- JOURNAL -----------------
+def _journal_db(path):
+    return Database(persist_to_disk=True, data_dir=str(path), storage="journal", fsync="never")
+
+
+def test_journal_reproduce_el_estado(tmp_path):
+    db = _journal_db(tmp_path)
+    _populate(db)
+    expected = _state(db)
+    db.close()
+
+    lines = (tmp_path / "journal.log").read_text(encoding="utf-8").splitlines()
+    assert {json.loads(line)["op"] for line in lines} == {"put", "del"}
+    reopened = _journal_db(tmp_path)
+    assert _state(reopened) == expected
+    assert reopened.find_user_by_username("u1")["role"] == "gestor"
+    reopened.close()
+
+
+def test_journal_descarta_linea_incompleta(tmp_path):
+    db = _journal_db(tmp_path)
+    db.add_user({"username": "ana", "email": "ana@sgpi.test"})
+    db.close()
+    journal = tmp_path / "journal.log"
+    with open(journal, "a", encoding="utf-8") as fh:
+        fh.write('{"op": "put", "col": "users", "rec": {"id": 2, "userna')
+
+    reopened = _journal_db(tmp_path)
+    assert [u["username"] for u in reopened.users] == ["ana"]
+    # la basura se truncó: lo que se escribe después se puede leer
+    reopened.add_user({"username": "beto", "email": "beto@sgpi.test"})
+    reopened.close()
+    again = _journal_db(tmp_path)
+    assert sorted(u["username"] for u in again.users) == ["ana", "beto"]
+    again.close()
+
+
+def test_compactacion(tmp_path):
+    db = _journal_db(tmp_path)
+    _populate(db)
+    db.compact()
+    assert (tmp_path / "snapshot.json").exists()
+    assert not (tmp_path / "journal.log.1").exists()
+    assert not (tmp_path / "journal.log").exists()
+
+    # lo posterior a la compactación va al journal nuevo
+    db.update_user(1, {"full_name": "Después"})
+    expected = _state(db)
+    db.close()
+    assert len((tmp_path / "journal.log").read_text(encoding="utf-8").splitlines()) == 1
+
+    reopened = _journal_db(tmp_path)
+    assert _state(reopened) == expected
+    reopened.close()
+
+
+def test_compactacion_interrumpida(tmp_path):
+    # caída entre la rotación y el snapshot nuevo: queda journal.log.1
+    db = _journal_db(tmp_path)
+    _populate(db)
+    expected = _state(db)
+    db._journal._rotate()
+    db.add_convocatoria({"nombre": "Tras la rotación"})
+    expected["convocatorias"] = sorted(db.convocatorias, key=lambda r: r["id"])
+    db.close()
+
+    reopened = _journal_db(tmp_path)
+    assert _state(reopened) == expected
+    reopened.close()
+
+
+# ----------------- WRITE-BEHIND -----------------
+def test_write_behind_escribe_al_cerrar(tmp_path):
+    db = Database(persist_to_disk=True, data_dir=str(tmp_path), write_behind=True,
+                  flush_interval_ms=60000, flush_every=10 ** 6)
+    db.add_user({"username": "ana", "email": "ana@sgpi.test"})
+    db.close()
+    saved = json.loads((tmp_path / "users.json").read_text(encoding="utf-8"))
+    assert [u["username"] for u in saved] == ["ana"]
+
+
+# ----------------- SNAPSHOT BINARIO -----------------
+def _snapshot_db(path):
+    return Database(persist_to_disk=True, data_dir=str(path), use_binary_snapshot=True)
+
+
+def test_snapshot_binario_carga_perezosa(tmp_path):
+    db = _snapshot_db(tmp_path)
+    _populate(db)
+    expected = _state(db)
+    db.close()
+    assert binary_snapshot.is_fresh(tmp_path)
+
+    reopened = _snapshot_db(tmp_path)
+    assert reopened._pending == {"users", "convocatorias", "solicitudes"}
+    assert reopened.find_user_by_username("u1")["role"] == "gestor"
+    assert "users" not in reopened._pending and "solicitudes" in reopened._pending
+    assert _state(reopened) == expected
+    assert reopened.search("solicitudes", {"estado": "enviada"})[0]["titulo"] == "S0"
+    reopened.close()
+
+
+def test_snapshot_viejo_vuelve_a_json(tmp_path):
+    db = _snapshot_db(tmp_path)
+    _populate(db)
+    db.close()
+    # alguien editó un JSON después de generar el snapshot
+    users_file = tmp_path / "users.json"
+    users = json.loads(users_file.read_text(encoding="utf-8"))
+    users[0]["full_name"] = "Editado"
+    users_file.write_text(json.dumps(users), encoding="utf-8")
+    snap = tmp_path / binary_snapshot.FILE_NAME
+    earlier = users_file.stat().st_mtime - 10
+    os.utime(snap, (earlier, earlier))
+
+    reopened = _snapshot_db(tmp_path)
+    assert not reopened._pending
+    assert reopened.get_user_by_id(users[0]["id"])["full_name"] == "Editado"
+    reopened.close()
+    # al cerrar se regeneró
+    assert binary_snapshot.is_fresh(tmp_path)
+
+
+@pytest.mark.parametrize("content", [
+    b"NOTSGPI!" + b"\0" * 16,                 # otro formato
+    b"",                                      # vacío
+    binary_snapshot.MAGIC + b"\xff\0\0\0{",   # encabezado truncado
+])
+def test_snapshot_danado_vuelve_a_json(tmp_path, content):
+    db = _snapshot_db(tmp_path)
+    _populate(db)
+    expected = _state(db)
+    db.close()
+    snap = tmp_path / binary_snapshot.FILE_NAME
+    snap.write_bytes(content)
+
+    reopened = _snapshot_db(tmp_path)
+    assert _state(reopened) == expected
+    reopened.close()
@@ -0,0 +1,110 @@
+# tests/unit/test_render_cache.py
+"""
+Caché de HTML: se reutiliza por rol y versión, se invalida al cambiar la
+colección (listener o versión) y respeta sus límites.
+"""
+
+import threading
+import time
+
+from business_logic.utils.render_cache import RenderCache
+from data_layer.database.database import Database
+
+
+def _counter():
+    calls = []
+
+    def build(text="html"):
+        calls.append(text)
+        return f"<p>{text} {len(calls)}</p>"
+
+    return calls, build
+
+
+def test_reutiliza_por_rol():
+    cache = RenderCache()
+    calls, build = _counter()
+    first = cache.get_or_render("t", build, role="docente")
+    assert cache.get_or_render("t", build, role="docente") == first
+    cache.get_or_render("t", build, role="gestor")
+    cache.get_or_render("t", build, role="docente", key=2024)
+    assert len(calls) == 3
+    assert cache.stats()["hits"] == 1
+
+
+def test_cambio_en_la_base_invalida():
+    db = Database()
+    cache = RenderCache()
+    cache.attach(db)
+    calls, build = _counter()
+    cache.get_or_render("lista", build, collections=("convocatorias",))
+    cache.get_or_render("otra", build, collections=("users",))
+    assert cache.stats()["entries"] == 2
+
+    db.add_convocatoria({"nombre": "Nueva"})
+    # el listener borra solo lo que depende de la colección
+    assert cache.stats()["entries"] == 1
+    assert cache.get_or_render("lista", build, collections=("convocatorias",)).endswith("3</p>")
+    assert cache.get_or_render("otra", build, collections=("users",)).endswith("2</p>")
+    cache.detach()
+
+
+def test_version_en_la_clave_sin_listener():
+    # otro proceso cambia la base: no hay listener, pero cambia la versión
+    db = Database()
+    cache = RenderCache()
+    cache._db = db
+    calls, build = _counter()
+    cache.get_or_render("lista", build, collections=("convocatorias",))
+    db.add_convocatoria({"nombre": "Nueva"})
+    cache.get_or_render("lista", build, collections=("convocatorias",))
+    assert len(calls) == 2
+
+
+def test_no_guarda_si_la_base_cambio_durante_el_render():
+    db = Database()
+    cache = RenderCache()
+    cache.attach(db)
+    calls = []
+
+    def build():
+        calls.append(1)
+        if len(calls) == 1:
+            db.add_convocatoria({"nombre": "Concurrente"})
+        return "<p>x</p>"
+
+    cache.get_or_render("lista", build, collections=("convocatorias",))
+    cache.get_or_render("lista", build, collections=("convocatorias",))
+    assert len(calls) == 2
+
+
+def test_limites_lru():
+    cache = RenderCache(max_entries=3, max_bytes=100)
+    for i in range(5):
+        cache.get_or_render(f"t{i}", lambda: "x" * 10)
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 2
+    cache.get_or_render("grande", lambda: "x" * 101)
+    assert cache.stats()["entries"] == 3
+
+
+def test_una_sola_renderizacion_concurrente():
+    cache = RenderCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return "<p>dashboard</p>"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_render("dash", build)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == ["<p>dashboard</p>"] * 8
@@ -0,0 +1,76 @@
+# tests/unit/test_sqlite_database.py
+"""
+Pool de conexiones del motor sqlite: acotado aunque cada request llegue en
+un hilo nuevo, y las llamadas anidadas reusan la conexión del hilo.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from data_layer.database.sqlite_database import SQLiteDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = SQLiteDatabase(path=str(tmp_path / "sgpi.sqlite3"), pool_size=4)
+    yield database
+    database.close()
+
+
+def test_hilos_de_corta_vida_no_acumulan_conexiones(db):
+    db.add_user({"username": "ana", "email": "ana@sgpi.test"})
+    errors = []
+
+    def request(i):
+        try:
+            assert db.find_user_by_username("ana")["id"] == 1
+            db.add_solicitud({"titulo": f"S{i}", "tipo": "patente", "user_id": 1})
+        except Exception as e:
+            errors.append(e)
+
+    for start in range(0, 300, 20):
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(start, start + 20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert errors == []
+    assert len(db._connections) <= 4
+    assert len(db.solicitudes) == 300
+
+
+def test_pool_agotado(tmp_path):
+    db = SQLiteDatabase(path=str(tmp_path / "sgpi.sqlite3"), busy_timeout_ms=50, pool_size=1)
+    taken, release = threading.Event(), threading.Event()
+
+    def hold():
+        with db._conn():
+            taken.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    taken.wait()
+    with pytest.raises(sqlite3.OperationalError):
+        db.get_user_by_id(1)
+    release.set()
+    holder.join()
+    assert db.get_user_by_id(1) is None
+    db.close()
+
+
+def test_llamadas_anidadas_usan_la_misma_conexion(db):
+    with db._write() as conn:
+        conn.execute("INSERT INTO users(data) VALUES ('{\"username\": \"ana\"}')")
+        # dentro de la transacción se ve lo no confirmado y no toma otra conexión
+        assert db.find_user_by_username("ana")["id"] == 1
+        assert len(db._connections) == 1
+
+
+def test_se_puede_usar_despues_de_cerrar(db):
+    db.add_user({"username": "ana", "email": "ana@sgpi.test"})
+    db.close()
+    assert db._connections == []
+    assert db.find_user_by_username("ana")["id"] == 1
@@ -0,0 +1,143 @@
+# tests/unit/test_sqlite_parity.py
+"""
+Motor sqlite frente a la base en memoria: con los mismos datos y las mismas
+operaciones, las consultas deben devolver lo mismo.
+"""
+
+import random
+
+import pytest
+
+from data_layer.database.database import Database
+from data_layer.database.sqlite_database import SQLiteDatabase
+
+ESTADOS = ["borrador", "enviada", "aprobada", "rechazada"]
+PALABRAS = ["patente", "solar", "agua", "energía", "biodegradable", "sensor", "médico"]
+
+
+def _load(db):
+    rng = random.Random(11)
+    db.add_users(
+        {"username": f"user{i}", "email": f"user{i}@sgpi.test", "role": rng.choice(["docente", "gestor"])}
+        for i in range(20)
+    )
+    db.add_convocatorias(
+        {"nombre": f"Convocatoria {rng.choice(PALABRAS)} {i}", "tipo": "normal", "ano": 2024,
+         "estado": rng.choice(["registro", "finalizada"]), "fecha_inicio": f"2024-{i % 12 + 1:02d}-01"}
+        for i in range(10)
+    )
+    db.add_solicitudes(
+        {
+            "titulo": " ".join(rng.sample(PALABRAS, 3)),
+            "tipo": rng.choice(["patente", "marca"]),
+            "estado": rng.choice(ESTADOS),
+            "user_id": rng.randint(1, 20),
+            "convocatoria_id": rng.randint(1, 10),
+            "created_at": f"2024-01-{rng.randint(1, 28):02d}T00:00:00",
+        }
+        for i in range(150)
+    )
+    for i in range(1, 40, 3):
+        db.update_solicitud(i, {"estado": "observada", "titulo": f"revisada {PALABRAS[i % 7]}"})
+    for i in range(2, 40, 7):
+        db.delete_solicitud(i)
+    db.update_user(3, {"role": "administrador"})
+    db.delete_user(5, soft_delete=False)
+
+
+@pytest.fixture
+def engines(tmp_path):
+    memory = Database()
+    sqlite = SQLiteDatabase(path=str(tmp_path / "sgpi.sqlite3"))
+    _load(memory)
+    _load(sqlite)
+    yield memory, sqlite
+    sqlite.close()
+
+
+def _clean(records):
+    # las fechas que pone cada motor al guardar difieren en microsegundos
+    return [{k: v for k, v in r.items() if k not in ("created_at", "updated_at")} for r in records]
+
+
+def _ids(records):
+    return [r["id"] for r in records]
+
+
+def test_busquedas_por_clave(engines):
+    memory, sqlite = engines
+    assert _clean([memory.find_user_by_username("user3")]) == _clean([sqlite.find_user_by_username("user3")])
+    assert memory.get_user_by_id(5) is None and sqlite.get_user_by_id(5) is None
+    codigo = memory.get_solicitud_by_id(10)["codigo"]
+    assert sqlite.find_solicitud_by_codigo(codigo)["id"] == 10
+    assert memory.get_solicitud_by_id(2) is None and sqlite.get_solicitud_by_id(2) is None
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"estado": "observada"},
+    {"estado": "enviada", "tipo": "marca"},
+    {"user_id": 4},
+    {"created_at": {"$gte": "2024-01-10", "$lt": "2024-01-20"}},
+    {"convocatoria_id": {"$eq": 3}, "estado": "borrador"},
+])
+def test_search_e_iter_search(engines, query):
+    memory, sqlite = engines
+    expected = _clean(memory.search("solicitudes", query))
+    assert _clean(sqlite.search("solicitudes", query)) == expected
+    assert _clean(list(sqlite.iter_search("solicitudes", query, batch_size=7))) == expected
+    assert _clean(list(memory.iter_search("solicitudes", query))) == expected
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("query", [{}, {"user_id": 7}, {"estado": "aprobada"}, {"convocatoria_id": 2}])
+def test_search_page(engines, query, descending):
+    memory, sqlite = engines
+    for db in engines:
+        pages, after = [], None
+        while True:
+            page = db.search_page("solicitudes", query, order_by="created_at",
+                                  descending=descending, after=after, limit=9)
+            pages.append(_ids(page))
+            if len(page) < 9:
+                break
+            after = (page[-1]["created_at"], page[-1]["id"])
+        if db is memory:
+            expected = pages
+        else:
+            assert pages == expected
+
+
+def test_texto_libre(engines):
+    memory, sqlite = engines
+    for text in ("energia", "solar agua", "biodeg", "revisada", "inexistente"):
+        assert memory.text_match_ids("solicitudes", text) == sqlite.text_match_ids("solicitudes", text)
+        found = {r["id"] for r, _ in memory.text_search("solicitudes", text, limit=500)}
+        assert found == {r["id"] for r, _ in sqlite.text_search("solicitudes", text, limit=500)}
+
+
+def test_distinct_y_estadisticas(engines):
+    memory, sqlite = engines
+    assert memory.distinct("solicitudes", "estado") == sqlite.distinct("solicitudes", "estado")
+    stats = [{k: v for k, v in db.get_stats().items() if k != "last_updated"} for db in engines]
+    assert stats[0] == stats[1]
+
+
+def test_versiones(engines):
+    for db in engines:
+        before = db.collection_version("solicitudes")[0]
+        record = db.record_version("solicitudes", 10)[0]
+        db.update_solicitud(10, {"estado": "aprobada"})
+        assert db.collection_version("solicitudes")[0] != before
+        assert db.record_version("solicitudes", 10)[0] != record
+        assert db.record_version("solicitudes", 2) is None
+
+
+def test_update_condicional(engines):
+    for db in engines:
+        user = db.find_user_by_username("user7")
+        assert db.update_user(user["id"], {"password_hash": "h2"}, expected={"password_hash": "h0"}) is None
+        assert db.get_user_by_id(user["id"]).get("password_hash") is None
+        updated = db.update_user(user["id"], {"password_hash": "h1"}, expected={"password_hash": None})
+        assert updated["password_hash"] == "h1"
+        assert db.update_user(5, {"password_hash": "h1"}, expected={}) is None
@@ -0,0 +1,162 @@
+# tests/unit/test_static_assets.py
+"""
+Estáticos con hash: build sobre un static/ temporal, url_for apuntando al
+archivo del manifiesto y negociación de .br/.gz/WebP con caché inmutable
+solo para dist/.
+"""
+
+import gzip
+import io
+import json
+
+import pytest
+from flask import Flask, url_for
+
+from business_logic.utils.static_assets import IMMUTABLE, StaticAssets, init_static_assets
+from scripts import build_assets
+
+CSS = ("body { color: #333; }\n" * 200).encode("utf-8")
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    static = tmp_path / "static"
+    (static / "css").mkdir(parents=True)
+    (static / "css" / "app.css").write_bytes(CSS)
+    (static / "css" / "vacio.css").write_bytes(b"")
+    (static / "robots.txt").write_bytes(b"User-agent: *")      # no achica: sin .gz
+    (static / "fuente.woff2").write_bytes(b"\0" * 64)
+    monkeypatch.setattr(build_assets, "STATIC_DIR", static)
+    monkeypatch.setattr(build_assets, "DIST_DIR", static / "dist")
+    return static
+
+
+def _app(static):
+    app = Flask(__name__, static_folder=str(static))
+    init_static_assets(app)
+    return app
+
+
+# ----------------- BUILD -----------------
+def test_build_escribe_manifiesto_y_variantes(static_dir):
+    manifest = build_assets.build()
+    dist = static_dir / "dist"
+    assert json.loads((dist / "manifest.json").read_text(encoding="utf-8")) == manifest
+    assert set(manifest) == {"css/app.css", "robots.txt", "fuente.woff2"}
+
+    entry = manifest["css/app.css"]
+    assert entry["file"] == f"css/app.{build_assets._fingerprint(CSS)}.css"
+    assert (dist / entry["file"]).read_bytes() == CSS
+    assert gzip.decompress((dist / (entry["file"] + ".gz")).read_bytes()) == CSS
+    assert entry["encodings"][-1] == "gzip"
+    assert manifest["robots.txt"]["encodings"] == []
+    assert "encodings" not in manifest["fuente.woff2"]
+
+    # el nombre cambia con el contenido
+    (static_dir / "css" / "app.css").write_bytes(CSS + b"a{}")
+    assert build_assets.build()["css/app.css"]["file"] != entry["file"]
+
+
+def test_build_imagenes(static_dir):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 100), (200, 30, 30)).save(buffer, "PNG")
+    (static_dir / "images").mkdir()
+    (static_dir / "images" / "user.png").write_bytes(buffer.getvalue())
+
+    entry = build_assets.build()["images/user.png"]
+    dist = static_dir / "dist"
+    # user.png se muestra chico: se achica a IMAGE_MAX_WIDTH
+    with Image.open(dist / entry["file"]) as image:
+        assert image.size == (128, 32)
+    with Image.open(dist / entry["webp"]) as image:
+        assert image.format == "WEBP" and image.size == (128, 32)
+
+
+# ----------------- SERVIR -----------------
+def test_url_for_usa_el_archivo_con_hash(static_dir):
+    manifest = build_assets.build()
+    app = _app(static_dir)
+    with app.test_request_context():
+        assert url_for("static", filename="css/app.css") == "/static/dist/" + manifest["css/app.css"]["file"]
+        # fuera del manifiesto queda igual
+        assert url_for("static", filename="css/otro.css") == "/static/css/otro.css"
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("gzip", "gzip"),
+    ("gzip;q=0, identity", None),
+    (None, None),
+])
+def test_variante_precomprimida(static_dir, accept, encoding):
+    build_assets.build()
+    client = _app(static_dir).test_client()
+    with client.application.test_request_context():
+        url = url_for("static", filename="css/app.css")
+    headers = {"Accept-Encoding": accept} if accept else {}
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "text/css"
+    assert response.headers.get("Content-Encoding") == encoding
+    body = gzip.decompress(response.data) if encoding == "gzip" else response.data
+    assert body == CSS
+    assert "Accept-Encoding" in response.vary
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    response.close()
+
+
+def test_brotli_preferido(static_dir):
+    brotli = pytest.importorskip("brotli")
+    build_assets.build()
+    client = _app(static_dir).test_client()
+    with client.application.test_request_context():
+        url = url_for("static", filename="css/app.css")
+    response = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == CSS
+    response.close()
+
+
+def test_solo_dist_es_inmutable(static_dir):
+    build_assets.build()
+    client = _app(static_dir).test_client()
+    response = client.get("/static/css/app.css", headers={"Accept-Encoding": "gzip"})
+    assert response.data == CSS
+    assert "Content-Encoding" not in response.headers
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+    response.close()
+    assert client.get("/static/dist/css/app.00000000.css").status_code == 404
+
+
+def test_manifiesto_temporal_con_webp(tmp_path):
+    static = tmp_path / "static"
+    (static / "dist" / "images").mkdir(parents=True)
+    (static / "dist" / "images" / "logo.abc.png").write_bytes(b"png")
+    (static / "dist" / "images" / "logo.abc.webp").write_bytes(b"webp")
+    manifest = static / "dist" / "manifest.json"
+    manifest.write_text(json.dumps({"images/logo.png": {"file": "images/logo.abc.png",
+                                                        "webp": "images/logo.abc.webp"}}))
+    app = _app(static)
+    with app.test_request_context():
+        assert url_for("static", filename="images/logo.png") == "/static/dist/images/logo.abc.png"
+    client = app.test_client()
+
+    response = client.get("/static/dist/images/logo.abc.png", headers={"Accept": "image/webp,*/*"})
+    assert (response.mimetype, response.data) == ("image/webp", b"webp")
+    assert "Accept" in response.vary and "Accept-Encoding" not in response.vary
+    response.close()
+    response = client.get("/static/dist/images/logo.abc.png", headers={"Accept": "image/png"})
+    assert (response.mimetype, response.data) == ("image/png", b"png")
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    response.close()
+
+
+def test_sin_manifiesto(tmp_path):
+    assets = StaticAssets(tmp_path)
+    assert assets.manifest == {}
+    assert assets.url_filename("css/app.css") == "css/app.css"
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "manifest.json").write_text("{roto")
+    assets.load()
+    assert assets.manifest == {}
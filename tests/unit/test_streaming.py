@@ -0,0 +1,67 @@
+# tests/unit/test_streaming.py
+"""
+Exportaciones en streaming: el JSON por fragmentos se puede parsear, NDJSON
+trae un objeto por línea y el formato se elige con ?formato o Accept.
+"""
+
+import json
+
+import pytest
+from flask import Flask
+
+from business_logic.utils.streaming import (
+    NDJSON_MIMETYPE, json_array_chunks, ndjson_chunks, stream_records, wants_ndjson,
+)
+
+RECORDS = [{"id": i, "titulo": f"Solicitud ñ{i}", "fecha": None} for i in range(1, 8)]
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+@pytest.mark.parametrize("envelope", [None, {"ok": True, "total": 7}])
+def test_json_por_fragmentos(count, envelope):
+    chunks = list(json_array_chunks(iter(RECORDS[:count]), envelope=envelope, batch_size=3))
+    body = json.loads("".join(chunks))
+    assert body == {**(envelope or {}), "data": RECORDS[:count]}
+    # cabecera + una tanda por cada batch_size registros + cierre
+    assert len(chunks) == 2 + -(-count // 3)
+
+
+def test_json_con_transformacion_y_clave():
+    chunks = json_array_chunks(RECORDS, transform=lambda r: r["id"], key="ids")
+    assert json.loads("".join(chunks)) == {"ids": list(range(1, 8))}
+
+
+def test_ndjson_un_objeto_por_linea():
+    body = "".join(ndjson_chunks(iter(RECORDS), batch_size=2))
+    assert body.endswith("\n")
+    assert [json.loads(line) for line in body.splitlines()] == RECORDS
+    assert "".join(ndjson_chunks(iter(()))) == ""
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.mark.parametrize("url, accept, ndjson", [
+    ("/", None, False),
+    ("/", "application/json", False),
+    ("/", NDJSON_MIMETYPE, True),
+    ("/", f"application/json;q=0.5, {NDJSON_MIMETYPE}", True),
+    ("/", f"{NDJSON_MIMETYPE};q=0.5, application/json", False),
+    ("/?formato=ndjson", "application/json", True),
+    ("/?formato=json", NDJSON_MIMETYPE, True),
+])
+def test_negociacion(app, url, accept, ndjson):
+    headers = {"Accept": accept} if accept else {}
+    with app.test_request_context(url, headers=headers):
+        assert wants_ndjson() is ndjson
+        response = stream_records(iter(RECORDS), ok=True)
+        assert response.is_streamed
+        body = response.get_data(as_text=True)
+    if ndjson:
+        assert response.mimetype == NDJSON_MIMETYPE
+        assert [json.loads(line) for line in body.splitlines()] == RECORDS
+    else:
+        assert response.mimetype == "application/json"
+        assert json.loads(body) == {"ok": True, "data": RECORDS}
@@ -0,0 +1,54 @@
+# tests/unit/test_user_model.py
+"""
+Modelo User y sus dataclasses auxiliares: sin __dict__ por instancia y
+serialización equivalente a la de antes.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from data_layer.models.user import User, UserLoginHistory, UserPermissions, UserProfile, UserRole
+
+
+def _user():
+    return User(id=3, username="ana", email="ana@sgpi.test", password_hash="h",
+                role=UserRole.DOCENTE, full_name="Ana")
+
+
+@pytest.mark.parametrize("instance", [
+    _user(),
+    UserProfile(cedula="0912345678"),
+    UserPermissions(),
+    UserLoginHistory(id="x", user_id=3, login_date=datetime(2024, 1, 1)),
+])
+def test_sin_dict_por_instancia(instance):
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.atributo_nuevo = 1
+
+
+def test_perfil():
+    user = _user()
+    assert user.to_dict()["profile"] is None
+    user.update_profile(cedula="0912345678", especialidad="Química", telefono="ignorado", otro="x")
+    assert user.profile == UserProfile(cedula="0912345678", especialidad="Química")
+    assert user.to_dict()["profile"] == {"cedula": "0912345678", "especialidad": "Química"}
+
+
+def test_historial_de_login():
+    user = _user()
+    user.record_login(ip_address="10.0.0.1", success=False, failure_reason="password_incorrecto")
+    entry = user.login_history[-1]
+    assert isinstance(entry, UserLoginHistory)
+    data = entry.to_dict()
+    assert (data["user_id"], data["ip_address"], data["success"]) == (3, "10.0.0.1", False)
+    assert user.to_dict()["login_history_count"] == 1
+
+
+def test_permisos_como_dict():
+    permissions = _user().permissions
+    assert permissions.to_dict() == {
+        name: getattr(permissions, name) for name in UserPermissions.__dataclass_fields__
+    }
+    assert permissions.to_dict()["puede_gestionar_solicitudes"] is True
@@ -0,0 +1,60 @@
+# tests/unit/test_user_repository.py
+"""
+LRU de modelos User: un cambio hecho por otro proceso (otra conexión al
+mismo archivo sqlite, sin listeners en común) no debe dejar un modelo viejo.
+"""
+
+import pytest
+
+from data_layer.database.sqlite_database import SQLiteDatabase
+from data_layer.models.user import UserRole
+from data_layer.repositories.user_repository import UserModelCache, UserRepository
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Dos "workers": cada uno con su conexión y su caché"""
+    path = str(tmp_path / "sgpi.sqlite3")
+    first, second = SQLiteDatabase(path=path), SQLiteDatabase(path=path)
+    repo = UserRepository()
+    repo.db = first
+    repo.cache = UserModelCache()
+    first.add_listener(repo.cache.on_db_change)
+    yield repo, second
+    first.close()
+    second.close()
+
+
+def _add_user(db):
+    return db.add_user({
+        "username": "ana", "email": "ana@sgpi.test", "password_hash": "h1",
+        "role": "docente", "full_name": "Ana",
+    })
+
+
+def test_modelo_en_cache_se_reutiliza(workers):
+    repo, _ = workers
+    user = _add_user(repo.db)
+    model = repo.find_by_id(user["id"])
+    assert repo.find_by_id(user["id"]) is model
+    assert repo.find_by_username("ana") is model
+    assert repo.cache.stats()["hits"] == 2
+
+
+def test_cambio_de_otro_proceso(workers):
+    repo, other = workers
+    user = _add_user(repo.db)
+    assert repo.find_by_id(user["id"]).role == UserRole.DOCENTE
+
+    other.update_user(user["id"], {"role": "gestor", "password_hash": "h2"})
+    model = repo.find_by_username("ana")
+    assert model.role == UserRole.GESTOR
+    assert model.password_hash == "h2"
+    assert repo.find_by_id(user["id"]) is model
+
+    other.delete_user(user["id"])
+    assert not repo.find_by_id(user["id"]).is_active()
+
+    other.delete_user(user["id"], soft_delete=False)
+    assert repo.find_by_id(user["id"]) is None
+    assert repo.cache.stats()["size"] == 0